@@ -1,6 +1,31 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class AccountConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "account"
+
+    def ready(self):
+        from account.authentication import invalidate_cached_user
+        from account.models import TOTPAuth, User
+        from account.utils.totp_secrets import invalidate_cached_secret
+
+        # Authenticated users are cached, drop them when they change
+        post_save.connect(
+            invalidate_cached_user, sender=User, dispatch_uid="account.user_save"
+        )
+        post_delete.connect(
+            invalidate_cached_user, sender=User, dispatch_uid="account.user_delete"
+        )
+        # Verified TOTP secrets are cached in process, drop them when they change
+        post_save.connect(
+            invalidate_cached_secret,
+            sender=TOTPAuth,
+            dispatch_uid="account.totp_auth_save",
+        )
+        post_delete.connect(
+            invalidate_cached_secret,
+            sender=TOTPAuth,
+            dispatch_uid="account.totp_auth_delete",
+        )
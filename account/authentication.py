@@ -0,0 +1,105 @@
+import logging
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_ALIAS = getattr(settings, "AUTH_USER_CACHE_ALIAS", "default")
+# Seconds an authenticated user is served from the cache
+USER_CACHE_TIMEOUT = getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60)
+
+
+# Fields of a user kept in the cache, the others are loaded on first access
+USER_CACHE_FIELDS = ("id", "role")
+
+
+def user_cache_key(user_id):
+    return f"auth-user:{user_id}"
+
+
+def delete_cached_user(user_id):
+    try:
+        caches[USER_CACHE_ALIAS].delete(user_cache_key(user_id))
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+
+
+def invalidate_cached_user(sender, instance, using=None, **kwargs):
+    """`post_save`/`post_delete` receiver dropping the cached copy of a user on commit."""
+    user_id = instance.pk
+    transaction.on_commit(lambda: delete_cached_user(user_id), using=using)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication reusing the middleware's decoded claims and a cached user.
+
+    `CheckBlacklistedTokenMiddleware` already verifies and decodes the token, and
+    stashes the claims on the request, so they are not decoded again here. The
+    fields authentication needs (`USER_CACHE_FIELDS` and `is_active`) are cached
+    for `AUTH_USER_CACHE_TIMEOUT` seconds, and dropped once a save or delete of
+    the user commits. Users are rebuilt from them with the other fields
+    deferred, so the password hash is never cached.
+    """
+
+    def authenticate(self, request):
+        self.request = request
+        return super().authenticate(request)
+
+    def get_validated_token(self, raw_token):
+        claims = getattr(self.request, "jwt_claims", None)
+        if (
+            claims is None
+            or getattr(self.request, "jwt_token", None) != raw_token.decode()
+            or claims.get(api_settings.TOKEN_TYPE_CLAIM) != AccessToken.token_type
+        ):
+            return super().get_validated_token(raw_token)
+
+        # the same attributes `Token.__init__` sets after verifying the token
+        token = AccessToken.__new__(AccessToken)
+        token.token = raw_token
+        token.current_time = aware_utcnow()
+        token.payload = claims
+        return token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return super().get_user(validated_token)
+
+        cache = caches[USER_CACHE_ALIAS]
+        key = user_cache_key(user_id)
+        try:
+            cached = cache.get(key)
+        except Exception as e:
+            logger.error(f"CacheError: {str(e)}")
+            return super().get_user(validated_token)
+        if cached is not None:
+            user = self.build_user(cached)
+            if api_settings.USER_AUTHENTICATION_RULE(user):
+                return user
+
+        user = super().get_user(validated_token)
+        cached = {field: getattr(user, field) for field in USER_CACHE_FIELDS}
+        cached["is_active"] = user.is_active
+        try:
+            cache.set(key, cached, USER_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.error(f"CacheError: {str(e)}")
+        return user
+
+    def build_user(self, cached):
+        """Rebuild a user from its cached fields, the other fields are deferred."""
+        user = self.user_model.from_db(
+            DEFAULT_DB_ALIAS,
+            list(USER_CACHE_FIELDS),
+            [cached[field] for field in USER_CACHE_FIELDS],
+        )
+        user.is_active = cached["is_active"]
+        return user
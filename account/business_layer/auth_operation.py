@@ -1,5 +1,6 @@
+import logging
+from asgiref.sync import sync_to_async
 from django.db import transaction
-from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.exceptions import ValidationError
@@ -10,12 +11,17 @@ from rest_framework import status
 from rest_framework_simplejwt.exceptions import TokenError
 from crequest.middleware import CrequestMiddleware
 from account.models import User
-from account.models.token import Token
+from account.managers.token import TokenManager
 from base.send_email import EmailService
 from account.managers.totp import TOTPManager
 from account.managers.otp import OTPManager
 from usermgmt.managers.user import UserManager
 from base.utils.password_checker import check_password as validate_user_password
+from base.utils.password_hashing import PasswordHashingBusy, password_hasher
+
+logger = logging.getLogger(__name__)
+
+LOGIN_BUSY_ERROR = "Too many logins are in progress. Please try again shortly."
 
 
 class AuthOperations:
@@ -24,40 +30,64 @@ class AuthOperations:
     @staticmethod
     def login(data):
         """Authenticate user and return tokens."""
-        email = data.get("email")
-        username = data.get("username")
         password = data.get("password")
         request = CrequestMiddleware.get_request()
 
-        if username:
-            user = authenticate(username=username, password=password)
-        else:
-            try:
-                user_obj = User.objects.get(email=email)
-                user = authenticate(
-                    request=request, username=user_obj.username, password=password
-                )
-                if not user.is_active:
-                    return None, "Account is not active", 401
-
-                if not user.check_password(password):
-                    return None, "Invalid credentials", 401
-
-            except User.DoesNotExist:
+        user = AuthOperations.get_login_user(data)
+        try:
+            if user is None:
+                # hash anyway so unknown accounts take as long as wrong passwords
+                password_hasher.make_password(password)
+                return None, "Invalid credentials", 401
+            if not password_hasher.check_password(user, password):
+                return None, "Invalid credentials", 401
+        except PasswordHashingBusy:
+            return None, LOGIN_BUSY_ERROR, status.HTTP_503_SERVICE_UNAVAILABLE
+
+        if not user.is_active:
+            return None, "Account is not active", 401
+        return AuthOperations.issue_login_tokens(user, request)
+
+    @staticmethod
+    async def alogin(data, request):
+        """
+        Async `login`: the password hash is awaited on the hashing pool, so the
+        event loop keeps serving other requests meanwhile.
+        """
+        password = data.get("password")
+
+        user = await sync_to_async(AuthOperations.get_login_user)(data)
+        try:
+            if user is None:
+                await password_hasher.amake_password(password)
+                return None, "Invalid credentials", 401
+            if not await password_hasher.acheck_password(user, password):
                 return None, "Invalid credentials", 401
+        except PasswordHashingBusy:
+            return None, LOGIN_BUSY_ERROR, status.HTTP_503_SERVICE_UNAVAILABLE
 
-        if not user:
-            return None, "Invalid credentials", 401
+        if not user.is_active:
+            return None, "Account is not active", 401
+        return await sync_to_async(AuthOperations.issue_login_tokens)(user, request)
+
+    @staticmethod
+    def get_login_user(data):
+        """Get the user logging in by username or email, or None."""
+        if data.get("username"):
+            lookup = {"username": data.get("username")}
+        else:
+            lookup = {"email": data.get("email")}
+        return User.objects.filter(**lookup).select_related("totp_auth").first()
 
+    @staticmethod
+    def issue_login_tokens(user, request):
+        """Issue the tokens of an authenticated user, or ask for the 2FA step."""
         refresh = RefreshToken.for_user(user)
-        access_token = str(refresh.access_token)
+        access = refresh.access_token
+        access_token = str(access)
         refresh_token = str(refresh)
 
-        Token.objects.create(
-            user=user,
-            access_token=access_token,
-            refresh_token=refresh_token,
-        )
+        TokenManager.create_token(user, refresh, access)
 
         if (
             hasattr(user, "totp_auth")
@@ -79,7 +109,7 @@ class AuthOperations:
             )
 
         user.last_login = timezone.now()
-        user.save()
+        user.save(update_fields=["last_login"])
         return (
             {
                 "access_token": access_token,
@@ -127,11 +157,11 @@ class AuthOperations:
 
         try:
 
-            token = Token.objects.get(refresh_token=refresh_token)
+            token = TokenManager.get_by_refresh_token(refresh_token)
+            if token is None:
+                return None, "Invalid refresh token", 400
             user = token.user
 
-            print(user.totp_auth)
-
             if not hasattr(user, "totp_auth"):
                 return None, "2FA not enabled for this account", 400
 
@@ -140,11 +170,14 @@ class AuthOperations:
             if error:
                 return None, error, status_code
 
-            # If OTP verification successful, return access token
+            # If OTP verification successful, issue the access token
+            access_token = TokenManager.refresh_access_token(token, refresh_token)
+            if access_token is None:
+                return None, "Invalid refresh token", 400
 
             return (
                 {
-                    "access_token": token.access_token,
+                    "access_token": access_token,
                     "refresh_token": refresh_token,
                     "message": "2FA verification successful",
                 },
@@ -152,10 +185,8 @@ class AuthOperations:
                 200,
             )
 
-        except Token.DoesNotExist:
-            return None, "Invalid refresh token", 400
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("OTP verification failed")
             return None, "An error occurred during OTP verification", 500
 
     @staticmethod
@@ -164,9 +195,7 @@ class AuthOperations:
         try:
             refresh_token = RefreshToken(data.get("refresh_token"))
             refresh_token.blacklist()
-            Token.objects.filter(refresh_token=data.get("refresh_token")).update(
-                is_blacklisted=True
-            )
+            TokenManager.blacklist(data.get("refresh_token"))
 
             return {"message": "Successfully logged out"}, None, 200
         except TokenError:
@@ -231,7 +260,8 @@ class AuthOperations:
                         return None, error, status.HTTP_406_NOT_ACCEPTABLE
 
                     user.set_password(new_password)  # update new password
-                    user.save()
+                    # the request user may be rebuilt from cached fields
+                    user.save(update_fields=["password"])
                     return {"message": "Password successfully changed"}, None, 200
                 else:
                     # Verify old password
@@ -239,7 +269,8 @@ class AuthOperations:
                         return None, "Incorrect old password", 400
                     # Set new password
                     user.set_password(new_password)  # update new password
-                    user.save()
+                    # the request user may be rebuilt from cached fields
+                    user.save(update_fields=["password"])
                     return {"message": "Password successfully changed"}, None, 200
             return {"message": "No request object detected."}, None, 400
         except Exception as e:
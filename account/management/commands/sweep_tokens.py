@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand
+
+from account.managers.token import TokenManager
+
+
+class Command(BaseCommand):
+    help = "Deletes the token records of expired refresh tokens in bounded batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows deleted per batch (default: 1000)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches per sweep (default: until done)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and sweep every N seconds (default: sweep once)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = TokenManager.delete_expired(
+                batch_size=options["batch_size"],
+                max_batches=options["max_batches"],
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"Deleted {deleted} expired token records.")
+            )
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from account.models.token import AccessToken
+from account.utils.token_revocation import revoke_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads the blacklisted, unexpired access tokens into the token revocation store"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Tokens read per query (default: 2000)",
+        )
+
+    def handle(self, *args, **options):
+        tokens = AccessToken.objects.filter(
+            token__is_blacklisted=True, expires_at__gt=timezone.now()
+        ).values_list("jti", "expires_at")
+        revoked = 0
+        for jti, expires_at in tokens.iterator(chunk_size=options["chunk_size"]):
+            revoke_token(jti, expires_at.timestamp())
+            revoked += 1
+        self.stdout.write(self.style.SUCCESS(f"Revoked {revoked} unexpired tokens."))
@@ -1,44 +1,50 @@
-import random
+import secrets
 import datetime
+from django.conf import settings
 from django.utils import timezone
 from account.models import OTP
+from account.utils.otp_store import consume_otp, get_otp, store_otp
+
+# Also record every generated code (without the code itself) in the OTP table
+OTP_AUDIT = getattr(settings, "OTP_AUDIT", False)
 
 
 class OTPManager:
-    """Manager class for OTP operations including generation, validation and retrieval."""
+    """
+    Manager class for OTP operations including generation, validation and retrieval.
+
+    Pending codes live in the cache, one per user, and expire on their own. The
+    OTP table is only written to as an audit log when `OTP_AUDIT` is enabled.
+    """
 
     @staticmethod
     def generate_otp(user, purpose, expiry_minutes=10):
         """
-        Generate a new 6-digit OTP code for a user.
+        Generate a new 6-digit OTP code for a user, replacing any pending one.
 
         Args:
             user: User object to generate OTP for
+            purpose (str): What the code is for
             expiry_minutes (int): Minutes until OTP expires
 
         Returns:
             str: Generated OTP code
         """
-        # Delete any existing OTP for this user
-        OTP.objects.filter(user=user).delete()
-
-        # Generate random 6 digit code
-        code = "".join([str(random.randint(0, 9)) for _ in range(6)])
-
-        # Calculate expiry time
+        code = f"{secrets.randbelow(10**6):06d}"
         expires_at = timezone.now() + datetime.timedelta(minutes=expiry_minutes)
 
-        # Create and save new OTP
-        otp = OTP.objects.create(
-            user=user, code=code, expires_at=expires_at, purpose=purpose
-        )
+        store_otp(user.pk, code, purpose, expires_at.timestamp())
+        if OTP_AUDIT:
+            OTP.objects.create(
+                user=user, code="", expires_at=expires_at, purpose=purpose
+            )
 
         return code
 
     @staticmethod
     def validate_otp(user, code):
         """
-        Validate an OTP code for a user.
+        Validate an OTP code for a user. A valid code is used up.
 
         Args:
             user: User object to validate OTP for
@@ -47,21 +53,7 @@ class OTPManager:
         Returns:
             bool: True if OTP is valid, False otherwise
         """
-        try:
-            otp = OTP.objects.get(user=user, code=code)
-
-            # Check if OTP is still valid
-            if otp.is_valid():
-                # Delete OTP after successful validation
-                otp.delete()
-                return True
-
-            # Delete expired OTP
-            otp.delete()
-            return False
-
-        except OTP.DoesNotExist:
-            return False
+        return consume_otp(user.pk, code)
 
     @staticmethod
     def get_valid_otp(user):
@@ -72,16 +64,16 @@ class OTPManager:
             user: User object to get OTP for
 
         Returns:
-            OTP: Valid OTP object if exists, None otherwise
+            OTP: Unsaved OTP object if a code is pending, None otherwise
         """
-        try:
-            otp = OTP.objects.get(user=user)
-            if otp.is_valid():
-                return otp
-
-            # Delete expired OTP
-            otp.delete()
-            return None
-
-        except OTP.DoesNotExist:
+        entry = get_otp(user.pk)
+        if entry is None:
             return None
+        return OTP(
+            user=user,
+            code=entry["code"],
+            purpose=entry["purpose"],
+            expires_at=datetime.datetime.fromtimestamp(
+                entry["expires_at"], datetime.timezone.utc
+            ),
+        )
@@ -0,0 +1,135 @@
+import datetime
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+from account.models import AccessToken, Token
+from account.models.token import hash_token
+from account.utils.token_revocation import revoke_token
+from base.cache import bump_model_version
+
+
+def expiry(token):
+    """Return the `exp` claim of a token as an aware datetime."""
+    return datetime.datetime.fromtimestamp(token["exp"], tz=datetime.timezone.utc)
+
+
+class TokenManager:
+    """Manager class for issued token records: creation, lookup, revocation and expiry."""
+
+    @staticmethod
+    def create_token(user, refresh, access):
+        """
+        Record a refresh/access token pair issued to a user.
+
+        Args:
+            user: User object the tokens were issued to
+            refresh (RefreshToken): The refresh token
+            access (AccessToken): The access token issued with it
+
+        Returns:
+            Token: The created record
+        """
+        token = Token.objects.create(
+            user=user,
+            access_token=hash_token(access),
+            refresh_token=hash_token(refresh),
+            expires_at=expiry(refresh),
+        )
+        TokenManager.record_access_token(token, access)
+        return token
+
+    @staticmethod
+    def record_access_token(token, access):
+        """Keep the `jti` of an access token issued with `token`, to revoke it on logout."""
+        return AccessToken.objects.create(
+            token=token, jti=access["jti"], expires_at=expiry(access)
+        )
+
+    @staticmethod
+    def get_by_refresh_token(refresh_token):
+        """
+        Get the record of a refresh token.
+
+        Returns:
+            Token: The record, or None if the token is unknown or expired
+        """
+        return (
+            Token.objects.filter(
+                refresh_token=hash_token(refresh_token),
+                expires_at__gt=timezone.now(),
+            )
+            .select_related("user")
+            .first()
+        )
+
+    @staticmethod
+    def refresh_access_token(token, refresh_token):
+        """
+        Issue a new access token for a recorded refresh token.
+
+        Args:
+            token (Token): The record of `refresh_token`
+            refresh_token (str): The raw refresh token
+
+        Returns:
+            str: The new access token, or None if the refresh token is invalid
+        """
+        try:
+            access = RefreshToken(refresh_token).access_token
+        except TokenError:
+            return None
+        token.access_token = hash_token(access)
+        token.save(update_fields=["access_token", "updated"])
+        TokenManager.record_access_token(token, access)
+        return str(access)
+
+    @staticmethod
+    def blacklist(refresh_token):
+        """
+        Blacklist the records of a refresh token and revoke every access token
+        issued with it (at login and after each OTP step) until it expires.
+        """
+        tokens = Token.objects.filter(refresh_token=hash_token(refresh_token))
+        access_tokens = AccessToken.objects.filter(
+            token__in=tokens, expires_at__gt=timezone.now()
+        ).values_list("jti", "expires_at")
+        for jti, expires_at in access_tokens:
+            revoke_token(jti, expires_at.timestamp())
+        tokens.update(is_blacklisted=True)
+
+    @staticmethod
+    def delete_expired(batch_size=1000, max_batches=None):
+        """
+        Delete the records of expired refresh tokens in bounded batches.
+
+        Each batch is one `DELETE ... WHERE id IN (...)` of at most `batch_size`
+        rows, so locks are short and the sweep can run alongside logins. Rows are
+        deleted without loading them or sending per-row signals, the model's
+        cache version is bumped once per batch instead.
+
+        Args:
+            batch_size (int): Rows deleted per batch
+            max_batches (int, optional): Stop after this many batches
+
+        Returns:
+            int: Number of deleted records
+        """
+        deleted = 0
+        batches = 0
+        now = timezone.now()
+        while max_batches is None or batches < max_batches:
+            ids = list(
+                Token.objects.filter(expires_at__lte=now)
+                .order_by()
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            # no cascade with a raw delete, the access tokens go first
+            access_tokens = AccessToken.objects.filter(token_id__in=ids)
+            access_tokens._raw_delete(access_tokens.db)
+            queryset = Token.objects.filter(pk__in=ids)
+            deleted += queryset._raw_delete(queryset.db)
+            bump_model_version(Token)
+            batches += 1
+        return deleted
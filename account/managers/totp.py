@@ -1,8 +1,19 @@
 import pyotp
+import logging
 from django.db import transaction
 from rest_framework import status
 from django.conf import settings
 from account.models import TOTPAuth
+from account.utils.totp_secrets import (
+    cache_secret,
+    decode_secret,
+    get_cached_secret,
+    mark_token_used,
+    match_token,
+    secret_version,
+)
+
+logger = logging.getLogger(__name__)
 
 TOTP_ISSUER_NAME = getattr(settings, "TOTP_ISSUER_NAME", "drftotp")
 
@@ -47,8 +58,8 @@ class TOTPManager:
                         "verified": verified,
                     }
                     return data, error, status.HTTP_200_OK
-            except Exception as e:
-                print(e)
+            except Exception:
+                logger.exception(f"TOTP activation failed for user {user.pk}")
                 error = "TOTP activation failed."
                 return None, error, status.HTTP_400_BAD_REQUEST
         else:
@@ -59,6 +70,11 @@ class TOTPManager:
     def verify_totp(token, user):
         """Verify TOTP token for user authentication.
 
+        Verified secrets are served from an in-process cache, so logins of users
+        with TOTP enabled do not load `TOTPAuth`. Cached secrets are tagged with
+        a version kept in the shared cache, which changes when `TOTPAuth` does. Each code is accepted once, the
+        used (user, time step) pairs are kept in the cache until they expire.
+
         Args:
             token (str): The TOTP token to verify
             user (User): The user object to verify token against
@@ -68,32 +84,49 @@ class TOTPManager:
         """
         error = data = None
         try:
-            auth = TOTPAuth.objects.get(user=user)
+            # read before loading `TOTPAuth`, so a secret changed meanwhile is
+            # cached under a version that is already outdated
+            version = secret_version(user.pk)
+            key = get_cached_secret(user.pk, version)
+            step = match_token(key, token) if key is not None else None
+            auth = None
+            if step is None:
+                # not cached, or cached before the secret changed
+                auth = TOTPAuth.objects.get(user=user)
+
+                if not auth.otp_base32:
+                    error = "TOTP not enabled."
+                    return None, error, status.HTTP_400_BAD_REQUEST
+
+                key = decode_secret(auth.otp_base32)
+                step = match_token(key, token)
+
+            if step is None:
+                error = "Invalid token"
+                return None, error, status.HTTP_400_BAD_REQUEST
 
-            if not auth.otp_base32:
-                error = "TOTP not enabled."
+            if not mark_token_used(user.pk, step):
+                error = "Token already used"
                 return None, error, status.HTTP_400_BAD_REQUEST
 
-            totp = pyotp.TOTP(auth.otp_base32)
-            print(totp.now())
-            if totp.verify(token):
+            if auth is not None and not (auth.otp_verified and auth.otp_enabled):
                 auth.otp_verified = True
                 auth.otp_enabled = True
-                auth.save()
-                data = {
-                    "message": "TOTP verified successfully",
-                    "verified": auth.otp_enabled,
-                }
-                return data, error, status.HTTP_200_OK
+                auth.save(update_fields=["otp_verified", "otp_enabled", "updated_at"])
+            if auth is not None:
+                cache_secret(user.pk, key, version)
 
-            error = "Invalid token"
-            return None, error, status.HTTP_400_BAD_REQUEST
+            data = {
+                "message": "TOTP verified successfully",
+                "verified": True,
+            }
+            return data, error, status.HTTP_200_OK
 
         except TOTPAuth.DoesNotExist:
             error = "TOTP auth not found. Please generate TOTP first."
             return None, error, status.HTTP_400_BAD_REQUEST
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception(f"TOTP verification failed for user {user.pk}")
             error = "An error occurred while verifying TOTP."
             return None, error, status.HTTP_500_INTERNAL_SERVER_ERROR
 
@@ -117,8 +150,8 @@ class TOTPManager:
                 "otp_auth_url": auth.otp_auth_url,
             }
             return data, error, status.HTTP_200_OK
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception(f"TOTP status check failed for user {user.pk}")
             error = "An error occurred while checking TOTP status."
             return None, error, status.HTTP_500_INTERNAL_SERVER_ERROR
 
@@ -0,0 +1,70 @@
+import datetime
+import hashlib
+
+import jwt
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def hash_tokens(apps, schema_editor):
+    """Replace the stored tokens with their digests and fill the new columns."""
+    Token = apps.get_model("account", "Token")
+    for token in Token.objects.iterator(chunk_size=2000):
+        try:
+            access = jwt.decode(token.access_token, options={"verify_signature": False})
+        except jwt.InvalidTokenError:
+            access = {}
+        try:
+            refresh = jwt.decode(
+                token.refresh_token, options={"verify_signature": False}
+            )
+        except jwt.InvalidTokenError:
+            refresh = {}
+
+        token.access_jti = access.get("jti", "")
+        token.expires_at = (
+            datetime.datetime.fromtimestamp(refresh["exp"], tz=datetime.timezone.utc)
+            if "exp" in refresh
+            else timezone.now()
+        )
+        token.access_token = hashlib.sha256(token.access_token.encode()).hexdigest()
+        token.refresh_token = hashlib.sha256(token.refresh_token.encode()).hexdigest()
+        token.save(
+            update_fields=["access_token", "refresh_token", "access_jti", "expires_at"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0003_otp_created_by_token_created_by_totpauth_created_by"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="token",
+            name="access_jti",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="token",
+            name="expires_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(hash_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="token",
+            name="expires_at",
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="token",
+            name="access_token",
+            field=models.CharField(max_length=64, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="token",
+            name="refresh_token",
+            field=models.CharField(max_length=64, unique=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0004_token_hashes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="token",
+            name="access_jti",
+            field=models.CharField(
+                blank=True, db_index=True, default="", max_length=255
+            ),
+        ),
+    ]
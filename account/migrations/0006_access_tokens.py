@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:33
+
+import django.db.models.deletion
+import django.db.models.manager
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_access_jtis(apps, schema_editor):
+    """Keep the access token recorded on each token, until the refresh token expires."""
+    Token = apps.get_model("account", "Token")
+    AccessToken = apps.get_model("account", "AccessToken")
+    tokens = Token.objects.exclude(access_jti="").values_list(
+        "pk", "access_jti", "expires_at"
+    )
+    AccessToken.objects.bulk_create(
+        (
+            AccessToken(token_id=pk, jti=jti, expires_at=expires_at)
+            for pk, jti, expires_at in tokens.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0005_token_access_jti_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AccessToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated", models.DateTimeField(auto_now=True, null=True)),
+                ("jti", models.CharField(max_length=255, unique=True)),
+                ("expires_at", models.DateTimeField()),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "token",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="access_tokens",
+                        to="account.token",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created"],
+                "abstract": False,
+                "base_manager_name": "prefetch_manager",
+            },
+            managers=[
+                ("objects", django.db.models.manager.Manager()),
+                ("prefetch_manager", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.RunPython(copy_access_jtis, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="token",
+            name="access_jti",
+        ),
+    ]
@@ -1,6 +1,6 @@
 """"Import all models here for easy reference"""
 
 from account.models.users import User
-from account.models.token import Token
+from account.models.token import AccessToken, Token
 from account.models.totp import TOTPAuth
 from account.models.otp import OTP
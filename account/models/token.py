@@ -1,4 +1,5 @@
 import datetime
+import hashlib
 import auto_prefetch
 
 from django.db import models
@@ -7,14 +8,45 @@ from base.models import BaseModel
 from account.models import User
 
 
+def hash_token(token):
+    """Return the fixed-length digest a token is stored and looked up by."""
+    return hashlib.sha256(str(token).encode()).hexdigest()
+
+
 class Token(BaseModel):
-    """Tracking user access token and refresh token"""
+    """
+    Tracking user access token and refresh token
+
+    Tokens are stored as sha256 digests (`hash_token`), the raw tokens are only
+    known to the client. `access_token` is the last access token issued with the
+    refresh token, every one issued is kept in `access_tokens`.
+    """
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    access_token = models.CharField(max_length=255)
-    refresh_token = models.CharField(max_length=255)
+    access_token = models.CharField(max_length=64, unique=True)
+    refresh_token = models.CharField(max_length=64, unique=True)
+    # expiry of the refresh token, the row is useless afterwards
+    expires_at = models.DateTimeField(db_index=True)
 
     is_blacklisted = models.BooleanField(default=False)
 
     class Meta(auto_prefetch.Model.Meta):
         ordering = ["-updated"]
+
+
+class AccessToken(BaseModel):
+    """
+    Access token issued with a refresh token (at login, after the OTP step).
+
+    Every one of them is revoked when the refresh token is blacklisted, and
+    looked up by `jti` when revocations are checked without a shared cache.
+    """
+
+    token = models.ForeignKey(
+        Token, on_delete=models.CASCADE, related_name="access_tokens"
+    )
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField()
+
+    class Meta(auto_prefetch.Model.Meta):
+        ordering = ["-created"]
@@ -0,0 +1,39 @@
+import pytest
+from django.test import Client
+
+from base.tests.utils.utils import make_user
+
+
+@pytest.mark.django_db
+class TestAsyncLogin:
+    def test_login(self):
+        make_user(1)
+
+        response = Client().post(
+            "/api/v1/auth/login-async",
+            {"username": "user1", "password": "Str0ng!Passw0rd#"},
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        assert response.json()["refresh_token"]
+
+    def test_wrong_password(self):
+        make_user(1)
+
+        response = Client().post(
+            "/api/v1/auth/login-async",
+            {"username": "user1", "password": "wrong"},
+            content_type="application/json",
+        )
+
+        assert response.status_code == 401
+
+    def test_unknown_user(self):
+        response = Client().post(
+            "/api/v1/auth/login-async",
+            {"username": "nobody", "password": "wrong"},
+            content_type="application/json",
+        )
+
+        assert response.status_code == 401
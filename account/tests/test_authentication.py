@@ -0,0 +1,83 @@
+import pytest
+from django.core.cache import caches
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.authentication import CachedJWTAuthentication, user_cache_key
+from account.models import User
+from base.tests.utils.utils import make_user
+
+
+@pytest.fixture
+def user(db):
+    return make_user(1, role="DISPATCHER")
+
+
+def authenticate(user, token=None):
+    token = token or RefreshToken.for_user(user).access_token
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    authenticated, _ = CachedJWTAuthentication().authenticate(request)
+    return authenticated
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    def test_caches_only_authentication_fields(self, user):
+        authenticate(user)
+
+        assert caches["default"].get(user_cache_key(user.pk)) == {
+            "id": user.pk,
+            "role": "DISPATCHER",
+            "is_active": True,
+        }
+
+    def test_cached_user(self, user, django_assert_num_queries):
+        token = RefreshToken.for_user(user).access_token
+        authenticate(user, token)
+
+        with django_assert_num_queries(0):
+            cached = authenticate(user, token)
+            assert (cached.pk, cached.role) == (user.pk, "DISPATCHER")
+        # the other fields are loaded on first access
+        with django_assert_num_queries(1):
+            assert cached.username == user.username
+
+    def test_dropped_on_commit(self, user, django_capture_on_commit_callbacks):
+        authenticate(user)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.role = "ADMIN"
+            user.save()
+            assert caches["default"].get(user_cache_key(user.pk)) is not None
+
+        assert caches["default"].get(user_cache_key(user.pk)) is None
+        assert authenticate(user).role == "ADMIN"
+
+
+@pytest.mark.django_db
+class TestCachedUserWrites:
+    def test_authenticated_views_use_the_cached_authentication(self):
+        from account.views.auth import ChangeUserPasswordAPIView
+
+        assert ChangeUserPasswordAPIView.authentication_classes == [
+            CachedJWTAuthentication
+        ]
+
+    def test_password_change_keeps_the_other_fields(self, user):
+        token = RefreshToken.for_user(user).access_token
+        authenticate(user, token)
+        # changed without signals, the cached user still has the old role
+        User.objects.filter(pk=user.pk).update(role="ADMIN")
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = client.post(
+            "/api/v1/auth/change-user-password",
+            {"old_password": "Str0ng!Passw0rd#", "new_password": "N3w!Passw0rd#x"},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert user.role == "ADMIN"
+        assert user.check_password("N3w!Passw0rd#x")
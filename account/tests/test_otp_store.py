@@ -0,0 +1,44 @@
+import time
+import threading
+
+from account.utils import otp_store
+from account.utils.otp_store import consume_otp, get_otp, store_otp
+
+
+def expires_in(seconds=600):
+    return time.time() + seconds
+
+
+class TestConsumeOTP:
+    def test_matching_code_is_used_once(self):
+        store_otp(1, "123456", "login", expires_in())
+
+        assert consume_otp(1, "123456")
+        assert not consume_otp(1, "123456")
+
+    def test_wrong_code_keeps_pending_code(self):
+        store_otp(1, "123456", "login", expires_in())
+
+        assert not consume_otp(1, "654321")
+        assert get_otp(1)["code"] == "123456"
+
+    def test_code_generated_during_check_is_kept(self, monkeypatch):
+        store_otp(1, "123456", "login", expires_in())
+        compare_digest = otp_store.hmac.compare_digest
+        regenerate = threading.Thread(
+            target=store_otp, args=(1, "999999", "login", expires_in())
+        )
+
+        def compare_while_regenerating(a, b):
+            # a new code is requested while the old one is being checked
+            regenerate.start()
+            regenerate.join(timeout=0.2)
+            return compare_digest(a, b)
+
+        monkeypatch.setattr(
+            otp_store.hmac, "compare_digest", compare_while_regenerating
+        )
+        assert consume_otp(1, "123456")
+        regenerate.join()
+
+        assert get_otp(1)["code"] == "999999"
@@ -0,0 +1,19 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestLoginRateLimit:
+    def test_limits_attempts_per_account(self):
+        client = APIClient()
+        statuses = [
+            client.post(
+                "/api/v1/auth/login",
+                {"username": "victim", "password": f"guess{attempt}"},
+                format="json",
+            ).status_code
+            for attempt in range(11)
+        ]
+
+        assert 429 not in statuses[:10]
+        assert statuses[10] == 429
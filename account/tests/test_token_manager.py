@@ -0,0 +1,109 @@
+import datetime
+import pyotp
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.business_layer.auth_operation import AuthOperations
+from account.managers.token import TokenManager
+from account.models import AccessToken, Token, TOTPAuth
+from account.models.token import hash_token
+from account.utils.token_revocation import is_revoked_in_database
+from base.tests.utils.utils import make_user
+
+
+@pytest.fixture
+def user(db):
+    return make_user(1)
+
+
+def issue_token(user, expires_at=None):
+    refresh = RefreshToken.for_user(user)
+    token = TokenManager.create_token(user, refresh, refresh.access_token)
+    if expires_at is not None:
+        Token.objects.filter(pk=token.pk).update(expires_at=expires_at)
+    return refresh, token
+
+
+@pytest.mark.django_db
+class TestTokenDigests:
+    def test_tokens_are_stored_as_digests(self, user):
+        refresh, token = issue_token(user)
+
+        assert token.refresh_token == hash_token(refresh)
+        assert len(token.refresh_token) == 64
+        assert str(refresh) not in (token.refresh_token, token.access_token)
+
+    def test_lookup_by_raw_refresh_token(self, user):
+        refresh, token = issue_token(user)
+
+        assert TokenManager.get_by_refresh_token(str(refresh)) == token
+
+    def test_expired_refresh_token_is_not_found(self, user):
+        refresh, _ = issue_token(user, timezone.now() - datetime.timedelta(seconds=1))
+
+        assert TokenManager.get_by_refresh_token(str(refresh)) is None
+
+
+@pytest.mark.django_db
+class TestAccessTokens:
+    def test_logout_revokes_every_issued_access_token(self, user):
+        refresh, token = issue_token(user)
+        login_jti = token.access_tokens.get().jti
+        TokenManager.refresh_access_token(token, str(refresh))
+        TokenManager.refresh_access_token(token, str(refresh))
+
+        TokenManager.blacklist(str(refresh))
+
+        jtis = list(token.access_tokens.values_list("jti", flat=True))
+        assert len(jtis) == 3 and login_jti in jtis
+        assert all(is_revoked_in_database(jti) for jti in jtis)
+
+    def test_logout_after_the_otp_step_revokes_the_login_token(self, user):
+        secret = pyotp.random_base32()
+        TOTPAuth.objects.create(
+            user=user, otp_base32=secret, otp_enabled=True, otp_verified=True
+        )
+        refresh, token = issue_token(user)
+
+        _, error, _ = AuthOperations.validate_login_otp(
+            {"refresh_token": str(refresh), "otp": pyotp.TOTP(secret).now()}
+        )
+        TokenManager.blacklist(str(refresh))
+
+        assert error is None
+        assert AccessToken.objects.filter(token=token).count() == 2
+        assert all(
+            is_revoked_in_database(jti)
+            for jti in token.access_tokens.values_list("jti", flat=True)
+        )
+
+
+@pytest.mark.django_db
+class TestDeleteExpired:
+    def test_deletes_only_expired_tokens(self, user):
+        expired_at = timezone.now() - datetime.timedelta(days=1)
+        for _ in range(5):
+            issue_token(user, expired_at)
+        _, valid = issue_token(user)
+
+        assert TokenManager.delete_expired(batch_size=2) == 5
+        assert list(Token.objects.all()) == [valid]
+        assert list(AccessToken.objects.values_list("token", flat=True)) == [valid.pk]
+
+    def test_stops_after_max_batches(self, user):
+        expired_at = timezone.now() - datetime.timedelta(days=1)
+        for _ in range(5):
+            issue_token(user, expired_at)
+
+        assert TokenManager.delete_expired(batch_size=2, max_batches=2) == 4
+        assert Token.objects.count() == 1
+
+    def test_sweep_command(self, user, capsys):
+        issue_token(user, timezone.now() - datetime.timedelta(days=1))
+
+        call_command("sweep_tokens")
+
+        assert Token.objects.count() == 0
+        assert "Deleted 1 expired token records." in capsys.readouterr().out
@@ -0,0 +1,53 @@
+import pytest
+from django.core.cache import caches
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.managers.token import TokenManager
+from account.utils import token_revocation
+from account.utils.token_revocation import is_token_revoked
+from base.tests.utils.utils import make_user
+
+
+@pytest.fixture
+def issued_token(db):
+    user = make_user(1)
+    refresh = RefreshToken.for_user(user)
+    access = refresh.access_token
+    TokenManager.create_token(user, refresh, access)
+    return refresh, access
+
+
+@pytest.mark.django_db
+class TestTokenRevocationWithoutSharedCache:
+    def test_not_revoked(self, issued_token):
+        _, access = issued_token
+
+        assert not is_token_revoked(access["jti"], access["exp"])
+
+    def test_logout_applies_to_other_workers(self, issued_token, monkeypatch):
+        refresh, access = issued_token
+        TokenManager.blacklist(str(refresh))
+        # a worker that did not handle the logout, with its own local-memory cache
+        monkeypatch.setattr(token_revocation, "_local", token_revocation.TTLCache(10))
+        monkeypatch.setattr(
+            token_revocation, "revocation_filter", token_revocation.RevocationFilter()
+        )
+        caches["default"].clear()
+
+        assert is_token_revoked(access["jti"], access["exp"])
+
+
+class TestRevocationFilter:
+    def test_not_ready_filter_asks_the_store(self):
+        revocation_filter = token_revocation.RevocationFilter()
+
+        assert revocation_filter.might_contain("unknown-jti")
+
+    def test_ready_filter_answers_unknown_jtis(self):
+        revocation_filter = token_revocation.RevocationFilter()
+        revocation_filter.start()
+        revocation_filter.ready = True
+        revocation_filter.add("revoked-jti")
+
+        assert revocation_filter.might_contain("revoked-jti")
+        assert not revocation_filter.might_contain("unknown-jti")
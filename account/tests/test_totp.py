@@ -0,0 +1,109 @@
+import pyotp
+import pytest
+from django.core.cache import caches
+
+from account.managers.totp import TOTPManager
+from account.models import TOTPAuth
+from account.utils import totp_secrets
+from account.utils.totp_secrets import (
+    cache_secret,
+    decode_secret,
+    get_cached_secret,
+    match_token,
+    totp_code,
+)
+from base.tests.utils.utils import make_user
+
+
+@pytest.fixture(autouse=True)
+def clear_secrets():
+    totp_secrets._secrets.clear()
+    yield
+    totp_secrets._secrets.clear()
+
+
+class TestTOTPCodes:
+    def test_rfc6238_vector(self):
+        # RFC 6238 appendix B, SHA-1 secret at T = 59s, last 6 digits
+        assert totp_code(b"12345678901234567890", 59 // 30) == "287082"
+
+    def test_matches_pyotp(self):
+        secret = pyotp.random_base32()
+        token = pyotp.TOTP(secret).now()
+
+        assert match_token(decode_secret(secret), token) is not None
+        assert match_token(decode_secret(secret), "000000x") is None
+
+    def test_cached_secret_is_encrypted(self):
+        key = decode_secret(pyotp.random_base32())
+        cache_secret(1, key, "v1")
+
+        assert totp_secrets._secrets.get(1)[2] != key
+        assert get_cached_secret(1, "v1") == key
+
+    def test_cached_secret_of_another_version_is_ignored(self):
+        cache_secret(1, decode_secret(pyotp.random_base32()), "v1")
+
+        assert get_cached_secret(1, "v2") is None
+
+
+@pytest.fixture
+def totp_user(db):
+    user = make_user(1)
+    secret = pyotp.random_base32()
+    TOTPAuth.objects.create(user=user, otp_base32=secret)
+    return user, pyotp.TOTP(secret)
+
+
+@pytest.mark.django_db
+class TestVerifyTOTP:
+    def test_verifies_and_enables(self, totp_user):
+        user, totp = totp_user
+
+        data, error, status_code = TOTPManager.verify_totp(totp.now(), user)
+
+        assert (error, status_code) == (None, 200)
+        auth = TOTPAuth.objects.get(user=user)
+        assert auth.otp_enabled and auth.otp_verified
+
+    def test_rejects_replayed_code(self, totp_user):
+        user, totp = totp_user
+        token = totp.now()
+        TOTPManager.verify_totp(token, user)
+
+        _, error, status_code = TOTPManager.verify_totp(token, user)
+
+        assert (error, status_code) == ("Token already used", 400)
+
+    def test_cached_secret_skips_database(self, totp_user, django_assert_num_queries):
+        user, totp = totp_user
+        token = totp.now()
+        TOTPManager.verify_totp(token, user)
+        # forget the used code, the secret stays cached in process
+        step = match_token(decode_secret(totp.secret), token)
+        caches["default"].delete(f"totp-used:{user.pk}:{step}")
+
+        with django_assert_num_queries(0):
+            _, error, _ = TOTPManager.verify_totp(token, user)
+        assert error is None
+
+    def test_rejects_invalid_code(self, totp_user):
+        user, _ = totp_user
+
+        _, error, status_code = TOTPManager.verify_totp("000000", user)
+
+        assert status_code == 400
+
+    def test_disabling_invalidates_the_secret_in_other_workers(self, totp_user):
+        user, totp = totp_user
+        TOTPManager.verify_totp(totp.now(), user)
+        entry = totp_secrets._secrets.get(user.pk)
+
+        TOTPManager.disable_totp(True, user)
+        # another worker still holds the secret in process
+        totp_secrets._secrets.set(user.pk, entry)
+
+        _, error, status_code = TOTPManager.verify_totp(totp.now(), user)
+
+        assert status_code == 400
+        assert error == "TOTP auth not found. Please generate TOTP first."
@@ -5,6 +5,7 @@ from account.views import auth
 urlpatterns = [
     # auth urls
     path("login", auth.LoginAPIView.as_view(), name="login"),
+    path("login-async", auth.AsyncLoginAPIView.as_view(), name="login-async"),
     path("register", auth.LoginAPIView.as_view(), name="register"),
     path(
         "validate-login-otp", auth.OTPLoginAPIView.as_view(), name="validate-login-otp"
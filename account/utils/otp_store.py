@@ -0,0 +1,141 @@
+import time
+import hmac
+import logging
+import threading
+import orjson
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+OTP_CACHE_ALIAS = getattr(settings, "OTP_CACHE_ALIAS", "default")
+
+# Deletes the pending OTP of KEYS[1] only if its code is ARGV[1], in one step, so
+# a code generated meanwhile is never removed by the check of an older one.
+# Returns 1 when the code was used.
+CONSUME_SCRIPT = """
+local entry = redis.call('GET', KEYS[1])
+if not entry or cjson.decode(entry)['code'] ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+# Serializes the writes and checks of the in-process fallback store
+_lock = threading.Lock()
+_script = None
+
+
+def otp_key(user_id):
+    return f"otp:{user_id}"
+
+
+def get_store():
+    """Return the shared cache holding the pending OTP codes."""
+    return caches[OTP_CACHE_ALIAS]
+
+
+def get_redis():
+    """Return the redis client behind the store, or None without redis."""
+    if not hasattr(get_store(), "iter_keys"):
+        return None
+    from django_redis import get_redis_connection
+
+    return get_redis_connection(OTP_CACHE_ALIAS)
+
+
+def get_consume_script(client):
+    global _script
+    if _script is None:
+        _script = client.register_script(CONSUME_SCRIPT)
+    return _script
+
+
+def store_otp(user_id, code, purpose, expires_at):
+    """
+    Store `code` as the pending OTP of a user, replacing any previous one.
+
+    The entry expires with the code, so codes that are never used leave nothing
+    behind. With redis it is stored as JSON, so `consume_otp` can check it in a
+    script.
+
+    Args:
+        user_id: Id of the user the code is for.
+        code (str): The OTP code.
+        purpose (str): What the code was generated for.
+        expires_at (float): Unix timestamp at which the code expires.
+
+    Returns:
+        bool: False if the store could not be written.
+    """
+    ttl = int(expires_at - time.time())
+    if ttl <= 0:
+        return False
+    entry = {"code": str(code), "purpose": purpose, "expires_at": expires_at}
+    try:
+        client = get_redis()
+        if client is not None:
+            client.set(
+                get_store().make_key(otp_key(user_id)), orjson.dumps(entry), ex=ttl
+            )
+        else:
+            with _lock:
+                get_store().set(otp_key(user_id), entry, timeout=ttl)
+        return True
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+        return False
+
+
+def get_otp(user_id):
+    """
+    Return the pending OTP of a user.
+
+    Returns:
+        dict: code, purpose and expires_at, or None when there is none.
+    """
+    try:
+        client = get_redis()
+        if client is not None:
+            entry = client.get(get_store().make_key(otp_key(user_id)))
+            entry = orjson.loads(entry) if entry else None
+        else:
+            entry = get_store().get(otp_key(user_id))
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+        return None
+    if entry is None or entry["expires_at"] <= time.time():
+        return None
+    return entry
+
+
+def consume_otp(user_id, code):
+    """
+    Use the pending OTP of a user if it matches `code`.
+
+    A wrong code leaves the pending one in place. A matching one is deleted in
+    the same atomic step that compares it (a script with redis, under a lock in
+    process), so concurrent requests with the same code cannot both use it, and
+    a code generated during the check is never deleted with the old one.
+
+    Returns:
+        bool: True if the code was valid and is now used.
+    """
+    if not code:
+        return False
+    try:
+        client = get_redis()
+        if client is not None:
+            key = get_store().make_key(otp_key(user_id))
+            return bool(get_consume_script(client)(keys=[key], args=[str(code)]))
+
+        with _lock:
+            entry = get_otp(user_id)
+            if entry is None or not hmac.compare_digest(entry["code"], str(code)):
+                return False
+            get_store().delete(otp_key(user_id))
+            return True
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+        return False
@@ -0,0 +1,223 @@
+import os
+import time
+import logging
+import threading
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from base.utils.bloom import BloomFilter
+from base.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CACHE_ALIAS = getattr(settings, "TOKEN_REVOCATION_CACHE_ALIAS", "default")
+# Seconds a "not revoked" answer is trusted in process before asking the store again
+REVOCATION_LOCAL_TTL = getattr(settings, "TOKEN_REVOCATION_LOCAL_TTL", 5)
+REVOCATION_LOCAL_SIZE = getattr(settings, "TOKEN_REVOCATION_LOCAL_SIZE", 10000)
+# Per worker Bloom filter of revoked jtis, kept in sync through redis pub/sub
+REVOCATION_FILTER = getattr(settings, "TOKEN_REVOCATION_FILTER", True)
+REVOCATION_FILTER_CAPACITY = getattr(
+    settings, "TOKEN_REVOCATION_FILTER_CAPACITY", 100000
+)
+REVOCATION_FILTER_ERROR_RATE = getattr(
+    settings, "TOKEN_REVOCATION_FILTER_ERROR_RATE", 0.001
+)
+# Seconds between rebuilds, which drop expired jtis from the filter
+REVOCATION_FILTER_REBUILD_INTERVAL = getattr(
+    settings, "TOKEN_REVOCATION_FILTER_REBUILD_INTERVAL", 3600
+)
+REVOCATION_CHANNEL = getattr(settings, "TOKEN_REVOCATION_CHANNEL", "token-revocations")
+
+# jti -> True (revoked) / False (not revoked)
+_local = TTLCache(maxsize=REVOCATION_LOCAL_SIZE, ttl=REVOCATION_LOCAL_TTL)
+
+
+class RevocationFilter:
+    """
+    Bloom filter of the revoked jtis, one per worker process.
+
+    A jti missing from the filter is not revoked, which answers the common case
+    without any network call. Filter hits fall through to the store.
+
+    With redis, a daemon thread subscribes to `REVOCATION_CHANNEL` (published to
+    by `revoke_token`), then fills the filter by scanning the store, and rebuilds
+    it every `REVOCATION_FILTER_REBUILD_INTERVAL` seconds. The filter is only
+    trusted while that subscription is up, and never with a per-process store.
+    """
+
+    def __init__(self):
+        self.filter = self.new_filter()
+        self.ready = False
+        self.pid = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def new_filter():
+        return BloomFilter(REVOCATION_FILTER_CAPACITY, REVOCATION_FILTER_ERROR_RATE)
+
+    def add(self, jti):
+        if self.pid != os.getpid():
+            self.start()
+        self.filter.add(jti)
+
+    def might_contain(self, jti):
+        """
+        Return False when `jti` is certainly not revoked, True when the store must be asked.
+        """
+        if self.pid != os.getpid():
+            self.start()
+        if not self.ready:
+            return True
+        return jti in self.filter
+
+    def start(self):
+        """Start syncing the filter in this process (again after a fork)."""
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            self.filter = self.new_filter()
+            self.ready = False
+            store = get_store()
+            if hasattr(store, "iter_keys"):
+                threading.Thread(
+                    target=self.sync, name="token-revocation-filter", daemon=True
+                ).start()
+
+    def rebuild(self):
+        """Fill a new filter from the revocation store and swap it in."""
+        bloom = self.new_filter()
+        prefix = revocation_key("")
+        for key in get_store().iter_keys(f"{prefix}*"):
+            bloom.add(key[len(prefix) :])
+        self.filter = bloom
+
+    def sync(self):
+        from django_redis import get_redis_connection
+
+        while True:
+            try:
+                pubsub = get_redis_connection(REVOCATION_CACHE_ALIAS).pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(REVOCATION_CHANNEL)
+                # revocations published during the scan wait in the subscription
+                self.rebuild()
+                self.ready = True
+                rebuild_at = time.monotonic() + REVOCATION_FILTER_REBUILD_INTERVAL
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message:
+                        self.add(message["data"].decode())
+                    if time.monotonic() >= rebuild_at:
+                        self.rebuild()
+                        rebuild_at = (
+                            time.monotonic() + REVOCATION_FILTER_REBUILD_INTERVAL
+                        )
+            except Exception as e:
+                self.ready = False
+                logger.error(f"CacheError: {str(e)}")
+                time.sleep(5)
+
+
+revocation_filter = RevocationFilter()
+
+
+def revocation_key(jti):
+    return f"revoked-jti:{jti}"
+
+
+def get_store():
+    """Return the shared cache holding the revoked token ids."""
+    return caches[REVOCATION_CACHE_ALIAS]
+
+
+def is_store_shared():
+    """
+    Whether the revocation store is shared by every worker.
+
+    A local-memory (or dummy) cache only knows the logouts handled by its own
+    process, revocations are then checked in the database.
+    """
+    return not isinstance(get_store(), (LocMemCache, DummyCache))
+
+
+def is_revoked_in_database(jti):
+    """Check whether the access token with id `jti` belongs to a blacklisted refresh token."""
+    from account.models import AccessToken
+
+    return AccessToken.objects.filter(jti=jti, token__is_blacklisted=True).exists()
+
+
+def revoke_token(jti, expires_at):
+    """
+    Revoke the token with id `jti` until it expires.
+
+    Args:
+        jti (str): The token's `jti` claim.
+        expires_at (int): The token's `exp` claim (Unix timestamp); the entry
+            is dropped from the store once the token would be rejected anyway.
+    """
+    ttl = int(expires_at - time.time())
+    if ttl <= 0:
+        return
+    _local.set(jti, True, ttl)
+    revocation_filter.add(jti)
+    store = get_store()
+    try:
+        store.set(revocation_key(jti), 1, timeout=ttl)
+        if REVOCATION_FILTER and hasattr(store, "iter_keys"):
+            from django_redis import get_redis_connection
+
+            get_redis_connection(REVOCATION_CACHE_ALIAS).publish(
+                REVOCATION_CHANNEL, jti
+            )
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+
+
+def is_token_revoked(jti, expires_at=None):
+    """
+    Check whether the token with id `jti` was revoked.
+
+    Tokens missing from the worker's `RevocationFilter` are answered without any
+    lookup. Otherwise answers come from the in-process cache when possible.
+    Revocations are kept there until the token expires, and "not revoked" for
+    `REVOCATION_LOCAL_TTL` seconds, which bounds how long a logout on another
+    worker takes to apply when the filter is not in sync. Without a shared store
+    tokens not revoked in this process are checked in the database.
+
+    Args:
+        jti (str): The token's `jti` claim.
+        expires_at (int, optional): The token's `exp` claim.
+
+    Returns:
+        bool: True if the token was revoked.
+    """
+    if not jti:
+        return False
+    if not is_store_shared():
+        if _local.get(jti):
+            return True
+        revoked = is_revoked_in_database(jti)
+        if revoked and expires_at:
+            _local.set(jti, True, max(int(expires_at - time.time()), 1))
+        return revoked
+    if REVOCATION_FILTER and not revocation_filter.might_contain(jti):
+        return False
+    revoked = _local.get(jti)
+    if revoked is not None:
+        return revoked
+    try:
+        revoked = get_store().get(revocation_key(jti)) is not None
+    except Exception as e:
+        # an unavailable store must not lock every user out
+        logger.error(f"CacheError: {str(e)}")
+        return False
+    if revoked and expires_at:
+        _local.set(jti, True, max(int(expires_at - time.time()), 1))
+    else:
+        _local.set(jti, revoked)
+    return revoked
@@ -0,0 +1,152 @@
+import hmac
+import time
+import base64
+import struct
+import hashlib
+import logging
+import secrets
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from base.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+TOTP_CACHE_ALIAS = getattr(settings, "TOTP_CACHE_ALIAS", "default")
+# Seconds a decoded secret is kept in process, encrypted
+TOTP_SECRET_CACHE_TTL = getattr(settings, "TOTP_SECRET_CACHE_TTL", 30)
+TOTP_SECRET_CACHE_SIZE = getattr(settings, "TOTP_SECRET_CACHE_SIZE", 10000)
+# Time steps before/after the current one whose codes are accepted
+TOTP_VALID_WINDOW = getattr(settings, "TOTP_VALID_WINDOW", 0)
+# pyotp defaults, which the provisioning URIs advertise
+TOTP_INTERVAL = 30
+TOTP_DIGITS = 6
+
+# user id -> (secret version, nonce, encrypted key)
+_secrets = TTLCache(maxsize=TOTP_SECRET_CACHE_SIZE, ttl=TOTP_SECRET_CACHE_TTL)
+# process key the cached secrets are encrypted with, never leaves memory
+_key = secrets.token_bytes(32)
+
+
+def _keystream(nonce, length):
+    stream = b""
+    counter = 0
+    while len(stream) < length:
+        stream += hashlib.blake2b(
+            nonce + counter.to_bytes(4, "big"), key=_key, digest_size=64
+        ).digest()
+        counter += 1
+    return stream[:length]
+
+
+def _xor(data, stream):
+    return bytes(a ^ b for a, b in zip(data, stream))
+
+
+def decode_secret(otp_base32):
+    """Decode a base32 secret as stored on `TOTPAuth`, padding it if needed."""
+    otp_base32 = otp_base32.strip().upper()
+    return base64.b32decode(otp_base32 + "=" * (-len(otp_base32) % 8))
+
+
+def secret_version_key(user_id):
+    return f"totp-secret-version:{user_id}"
+
+
+def secret_version(user_id):
+    """
+    Return the current version of a user's secret, shared by all workers.
+
+    Secrets cached in process are only served while their version is current,
+    dropping the version in the shared cache invalidates them everywhere.
+
+    Returns:
+        str: The version, or None if the cache is unavailable.
+    """
+    try:
+        return caches[TOTP_CACHE_ALIAS].get_or_set(
+            secret_version_key(user_id),
+            lambda: secrets.token_hex(8),
+            TOTP_SECRET_CACHE_TTL,
+        )
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+        return None
+
+
+def cache_secret(user_id, key, version):
+    """Keep the decoded secret `key` of a user in process, encrypted."""
+    if version is None:
+        return
+    nonce = secrets.token_bytes(16)
+    _secrets.set(user_id, (version, nonce, _xor(key, _keystream(nonce, len(key)))))
+
+
+def get_cached_secret(user_id, version):
+    """Return the decoded secret of a user if it is cached at `version`, else None."""
+    entry = _secrets.get(user_id)
+    if entry is None or version is None or entry[0] != version:
+        return None
+    _, nonce, encrypted = entry
+    return _xor(encrypted, _keystream(nonce, len(encrypted)))
+
+
+def forget_secret(user_id):
+    """Drop the cached secret of a user, in this process and in the other workers."""
+    _secrets.delete(user_id)
+    try:
+        caches[TOTP_CACHE_ALIAS].delete(secret_version_key(user_id))
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+
+
+def invalidate_cached_secret(sender, instance, using=None, **kwargs):
+    """`post_save`/`post_delete` receiver dropping the cached secret of a `TOTPAuth`."""
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "otp_base32" not in update_fields:
+        return
+    user_id = instance.user_id
+    forget_secret(user_id)
+    # again on commit, in case a worker cached the old secret in the meantime
+    transaction.on_commit(lambda: forget_secret(user_id), using=using)
+
+
+def totp_code(key, counter):
+    """RFC 6238 code of `key` for time step `counter` (HMAC-SHA1)."""
+    digest = hmac.new(key, struct.pack(">Q", counter), hashlib.sha1).digest()
+    offset = digest[-1] & 0x0F
+    code = struct.unpack(">I", digest[offset : offset + 4])[0] & 0x7FFFFFFF
+    return f"{code % 10**TOTP_DIGITS:0{TOTP_DIGITS}d}"
+
+
+def match_token(key, token, for_time=None):
+    """
+    Find the time step whose code is `token`.
+
+    Returns:
+        int: The matching time step, or None if `token` is not valid now.
+    """
+    token = str(token or "").strip()
+    if len(token) != TOTP_DIGITS or not token.isdigit():
+        return None
+    current = int((time.time() if for_time is None else for_time) // TOTP_INTERVAL)
+    for step in range(current - TOTP_VALID_WINDOW, current + TOTP_VALID_WINDOW + 1):
+        if hmac.compare_digest(totp_code(key, step), token):
+            return step
+    return None
+
+
+def mark_token_used(user_id, step):
+    """
+    Record that a user's code for time step `step` was used.
+
+    Returns:
+        bool: False if it was already used, i.e. the code is being replayed.
+    """
+    ttl = TOTP_INTERVAL * (2 * TOTP_VALID_WINDOW + 2)
+    try:
+        return caches[TOTP_CACHE_ALIAS].add(f"totp-used:{user_id}:{step}", 1, ttl)
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+        return True
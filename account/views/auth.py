@@ -1,6 +1,9 @@
+import orjson
+from django.views import View
 from base.views import BaseAPIView
+from base.response_handler import ResponseHandler
 from account.serializers import auth
-from base.service import ServiceFactory
+from account.business_layer.auth_operation import AuthOperations
 from account.managers.auth import AuthenticationManager
 from base.permissions import AuthUserMixin, NonAuthUserMixin
 
@@ -8,6 +11,9 @@ from base.permissions import AuthUserMixin, NonAuthUserMixin
 class BaseAuthAPIView(NonAuthUserMixin, BaseAPIView):
     """Base view class for authentication-related API endpoints."""
 
+    manager = AuthenticationManager
+    dispatch_on = "url_name"
+
     serializer_classes = {
         "login": auth.LoginSerializer,
         "register": auth.RegistrationSerializer,
@@ -38,25 +44,6 @@ class BaseAuthAPIView(NonAuthUserMixin, BaseAPIView):
         "change-user-password": auth.ResetPasswordResponseSerializer,
     }
 
-    def get_service(self, *args, **kwargs):
-        """Return service instance for authentication operations."""
-        return ServiceFactory(
-            AuthenticationManager,
-            self.get_serializer_class(
-                request=kwargs.get("request"), method=kwargs.get("method")
-            ),
-        )
-
-    def get_serializer_class(self, *args, **kwargs):
-        """Get appropriate serializer class based on HTTP method."""
-        method = kwargs.get("method")
-        return self.serializer_classes.get(method, None)
-
-    def get_response_serializer_class(self, *args, **kwargs):
-        """Get appropriate response serializer class based on HTTP method."""
-        method = kwargs.get("method")
-        return self.serializer_response_classes.get(method, None)
-
 
 class LoginAPIView(BaseAuthAPIView):
     """Handle user login requests."""
@@ -80,6 +67,48 @@ class RegistrationAPIView(BaseAuthAPIView):
         )
 
 
+class AsyncLoginAPIView(View):
+    """
+    Handle user login requests asynchronously.
+
+    Same input and output as `LoginAPIView`, but the password hash is awaited on
+    the hashing pool, so under ASGI a login storm does not hold one worker per
+    pending hash.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # token based API like the DRF views, which are CSRF exempt too
+        view.csrf_exempt = True
+        return view
+
+    async def post(self, request):
+        """Process POST request for user login."""
+        try:
+            payload = orjson.loads(request.body or b"{}")
+        except orjson.JSONDecodeError:
+            payload = None
+        serializer = auth.LoginSerializer(data=payload)
+        if not serializer.is_valid():
+            return ResponseHandler.render(
+                ResponseHandler.error(serializer.errors, "Login failed")
+            )
+
+        data, error, status_code = await AuthOperations.alogin(
+            dict(serializer.validated_data), request
+        )
+        if error:
+            response = ResponseHandler.error(error, "Login failed", status_code)
+        else:
+            response = ResponseHandler.success(
+                data=data,
+                status_code=status_code,
+                serializer=auth.LoginResponseSerializer,
+            )
+        return ResponseHandler.render(response)
+
+
 class OTPLoginAPIView(BaseAuthAPIView):
     """Handle user login requests through totp."""
 
@@ -6,11 +6,15 @@ from ambulance_mgmt.serializers.ambulance import (
     AmbulanceDetailSerializer,
     AmbulancePartialUpdateSerializer,
 )
-from base.service import ServiceFactory
+from base.decorators.cache import cache_response
+from base.decorators.conditional import conditional_response
 from ambulance_mgmt.managers.ambulance import AmbulanceManager
 
 
 class BaseAmbulanceAPIView(BaseAPIView):
+    manager = AmbulanceManager
+    detail_serializer_class = AmbulanceDetailSerializer
+
     serializer_classes = {
         "get": None,
         "post": AmbulanceCreateSerializer,
@@ -27,42 +31,12 @@ class BaseAmbulanceAPIView(BaseAPIView):
         "delete": AmbulanceDetailSerializer,
     }
 
-    def get_service(self, *args, **kwargs):
-        request = kwargs.get("request")
-        return ServiceFactory(
-            AmbulanceManager, self.get_serializer_class(request=request)
-        )
-
-    def get_serializer_class(self, *args, **kwargs):
-        request = kwargs.get("request")
-        method_to_action = {
-            "GET": "get",
-            "POST": "post",
-            "PUT": "put",
-            "PATCH": "patch",
-            "DELETE": "delete",
-        }
-        action = method_to_action.get(request.method, "get")
-        return self.serializer_classes.get(action, None)
-
-    def get_response_serializer_class(self, *args, **kwargs):
-        request = kwargs.get("request")
-        instance_id = kwargs.get("id")
-        if request.method == "GET" and id:
-            return AmbulanceDetailSerializer
-
-        method_to_action = {
-            "GET": "get",
-            "POST": "post",
-            "PUT": "put",
-            "PATCH": "patch",
-            "DELETE": "delete",
-        }
-        action = method_to_action.get(request.method)
-        return self.serializer_response_classes.get(action, None)
-
 
 class AmbulanceAPIView(BaseAmbulanceAPIView):
+    @conditional_response(
+        depends_on=("ambulance_mgmt.Ambulance", "hospital_mgmt.Hospital")
+    )
+    @cache_response(depends_on=("ambulance_mgmt.Ambulance", "hospital_mgmt.Hospital"))
     def get(self, request, id=None):
         action = request.resolver_match.url_name
         return self.handle_request(
@@ -0,0 +1,4 @@
+# Loaded with Django so that shared tasks use this app
+from app.celery import celery_app
+
+__all__ = ("celery_app",)
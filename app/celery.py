@@ -0,0 +1,10 @@
+import os
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+
+celery_app = Celery("app")
+# every CELERY_* setting of the Django settings
+celery_app.config_from_object("django.conf:settings", namespace="CELERY")
+celery_app.autodiscover_tasks(["base"], related_name="send_email")
+celery_app.autodiscover_tasks()
@@ -1,28 +1,16 @@
 import jwt
-from django.http import JsonResponse
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import status
-from rest_framework.renderers import JSONRenderer
-from rest_framework_simplejwt.token_blacklist.models import (
-    BlacklistedToken,
-    OutstandingToken,
-)
 from django.conf import settings
 from base.response_handler import ResponseHandler
-from account.models.token import Token
-
-
-def is_token_blacklisted(token):
-    """Check if the access token is still valid."""
-    is_token_exist = Token.objects.filter(access_token=token).first()
-    if is_token_exist:
-        return is_token_exist.is_blacklisted
-    return None
+from account.utils.token_revocation import is_token_revoked
 
 
 class CheckBlacklistedTokenMiddleware:
     """
     Middleware to check if the provided JWT refresh token is blacklisted.
+
+    Revoked tokens are looked up by `jti` in the revocation store
+    (`account.utils.token_revocation`), without a database query.
     """
 
     def __init__(self, get_response):
@@ -42,8 +30,13 @@ class CheckBlacklistedTokenMiddleware:
                         token, settings.SECRET_KEY, algorithms=["HS256"]
                     )
 
-                    is_token_exist = is_token_blacklisted(token)
-                    if is_token_exist:
+                    # reused by `CachedJWTAuthentication` instead of decoding again
+                    request.jwt_claims = decoded_token
+                    request.jwt_token = token
+
+                    if is_token_revoked(
+                        decoded_token.get("jti"), decoded_token.get("exp")
+                    ):
                         response = ResponseHandler.error(
                             errors="This token has been invalidated due to a user logout. Please login again to get a new token.",
                             message="Token no longer valid",
@@ -77,11 +70,7 @@ class CheckBlacklistedTokenMiddleware:
                 )
 
             if response:
-                response.accepted_renderer = JSONRenderer()
-                response.accepted_media_type = "application/json"
-                response.renderer_context = {}
-                response.render()
-                return response
+                return ResponseHandler.render(response)
         # Proceed with the request if the token is not blacklisted
         response = self.get_response(request)
         return response
@@ -0,0 +1,103 @@
+import math
+import hashlib
+import orjson
+from django.conf import settings
+from rest_framework import status
+from base.response_handler import ResponseHandler
+from base.utils.rate_limiter import parse_rate, rate_limiter
+
+# URL name -> {"ip": rate, "account": rate}
+RATE_LIMITS = getattr(settings, "RATE_LIMITS", {})
+# Proxies in front of the app, the client IP is read from X-Forwarded-For then
+RATE_LIMIT_NUM_PROXIES = getattr(settings, "RATE_LIMIT_NUM_PROXIES", 0)
+# Request fields identifying the account a request is for, in order of preference
+ACCOUNT_FIELDS = ("username", "email", "refresh_token")
+
+
+def get_client_ip(request):
+    """Return the client IP, skipping `RATE_LIMIT_NUM_PROXIES` trusted proxies."""
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+    if RATE_LIMIT_NUM_PROXIES and forwarded:
+        addresses = [address.strip() for address in forwarded.split(",")]
+        return addresses[-min(RATE_LIMIT_NUM_PROXIES, len(addresses))]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def get_account(request):
+    """
+    Return the account a request is for: the submitted username, email or refresh
+    token, else the authenticated user id, or None.
+    """
+    data = None
+    if request.content_type == "application/json":
+        try:
+            data = orjson.loads(request.body or b"{}")
+        except orjson.JSONDecodeError:
+            data = None
+    elif request.method == "POST":
+        data = request.POST
+    if isinstance(data, dict) or hasattr(data, "get"):
+        for field in ACCOUNT_FIELDS:
+            value = data.get(field)
+            if value and isinstance(value, str):
+                return f"{field}:{value.strip().lower()}"
+
+    claims = getattr(request, "jwt_claims", None)
+    if claims and claims.get("user_id"):
+        return f"user:{claims['user_id']}"
+    return None
+
+
+class RateLimitMiddleware:
+    """
+    Rate limit sensitive endpoints (login, OTP, password reset) per IP and per account.
+
+    Runs in `process_view`, once the URL is resolved but before the view, so
+    refused requests cost no password hash, TOTP check or query. Limits are
+    token buckets configured per URL name in `RATE_LIMITS`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limits = {
+            url_name: {kind: parse_rate(rate) for kind, rate in rates.items()}
+            for url_name, rates in RATE_LIMITS.items()
+        }
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        url_name = getattr(request.resolver_match, "url_name", None)
+        limits = self.limits.get(url_name)
+        if not limits or request.method in ("GET", "HEAD", "OPTIONS"):
+            return None
+
+        identities = {"ip": get_client_ip(request)}
+        if "account" in limits:
+            identities["account"] = get_account(request)
+
+        buckets = []
+        for kind, (capacity, rate) in limits.items():
+            identity = identities.get(kind)
+            if not identity:
+                continue
+            digest = hashlib.sha1(identity.encode()).hexdigest()
+            buckets.append((f"ratelimit:{url_name}:{kind}:{digest}", capacity, rate))
+        if not buckets:
+            return None
+
+        allowed, retry_after = rate_limiter.consume(buckets)
+        if allowed:
+            return None
+
+        retry_after = max(math.ceil(retry_after), 1)
+        response = ResponseHandler.render(
+            ResponseHandler.error(
+                errors=f"Too many attempts. Please try again in {retry_after} seconds.",
+                message="Rate limit exceeded",
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+        )
+        response["Retry-After"] = str(retry_after)
+        return response
@@ -50,7 +50,7 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt.token_blacklist",
     "rest_framework_simplejwt",
     # custom app
-    "base",
+    "base.app.BaseConfig",
     "account",
     "usermgmt",
 ]
@@ -65,6 +65,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "app.middlewares.check_blacklisted_token.CheckBlacklistedTokenMiddleware",
+    "app.middlewares.rate_limit.RateLimitMiddleware",
 ]
 
 ROOT_URLCONF = "app.urls"
@@ -185,31 +186,185 @@ if os.getenv("LOCAL_REDIS"):
 else:
     REDIS = os.getenv("REDIS")
 
-CACHES = {
-    "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": REDIS,
-        "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
-            "CONNECTION_POOL_KWARGS": {
-                "max_connections": 100,
-                "retry_on_timeout": True,
+if REDIS:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS,
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "CONNECTION_POOL_KWARGS": {
+                    "max_connections": 100,
+                    "retry_on_timeout": True,
+                },
             },
-        },
+        }
     }
+else:
+    # Local-memory fallback when no redis is configured (per process)
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "ads-local",
+        }
+    }
+
+# GET responses cached by `base.decorators.cache.cache_response`
+RESPONSE_CACHE_TIMEOUT = 60
+
+# Single-flight rebuilds: invalidated entries are served stale for up to
+# CACHE_STALE_TIMEOUT seconds while one worker holds the rebuild lock.
+CACHE_STALE_TIMEOUT = 300
+CACHE_LOCK_TIMEOUT = 10
+CACHE_LOCK_WAIT = 2
+CACHE_METRICS_FLUSH_EVERY = 100
+
+# Paginated list totals are cached per model and filter, and invalidated on writes.
+# Estimated counts use table statistics for unfiltered lists on large tables.
+PAGINATION_COUNT_CACHE_TIMEOUT = 300
+PAGINATION_ESTIMATED_COUNT = os.getenv("PAGINATION_ESTIMATED_COUNT") == "true"
+PAGINATION_ESTIMATED_COUNT_THRESHOLD = 100000
+
+# Render list pages of plain read-only model serializers with generated row functions
+COMPILED_SERIALIZERS = True
+
+# Rows fetched and encoded per chunk by the streaming NDJSON/CSV exports
+EXPORT_CHUNK_SIZE = 2000
+
+# Operations accepted by one request to the batch endpoint
+BATCH_MAX_OPERATIONS = 20
+
+# Revoked JWT ids are kept in the cache until the token expires and fronted by an
+# in-process cache. "Not revoked" answers are trusted locally for
+# TOKEN_REVOCATION_LOCAL_TTL seconds. Without a shared cache (no REDIS) the
+# revocations are checked in the Token table.
+TOKEN_REVOCATION_CACHE_ALIAS = "default"
+TOKEN_REVOCATION_LOCAL_TTL = 5
+TOKEN_REVOCATION_LOCAL_SIZE = 10000
+# Per worker Bloom filter answering "not revoked" in memory. With redis it is
+# rebuilt from the store and kept in sync through pub/sub on TOKEN_REVOCATION_CHANNEL.
+TOKEN_REVOCATION_FILTER = True
+TOKEN_REVOCATION_FILTER_CAPACITY = 100000
+TOKEN_REVOCATION_FILTER_ERROR_RATE = 0.001
+TOKEN_REVOCATION_FILTER_REBUILD_INTERVAL = 3600
+TOKEN_REVOCATION_CHANNEL = "token-revocations"
+
+# Authenticated users (id, role, is_active) are cached per id, and dropped from the
+# cache once a save or delete commits
+AUTH_USER_CACHE_ALIAS = "default"
+AUTH_USER_CACHE_TIMEOUT = 60
+
+# Password hashes run on a bounded pool of PASSWORD_HASHING_WORKERS threads,
+# logins are refused with 503 once PASSWORD_HASHING_QUEUE_SIZE hashes are waiting
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)
+)
+PASSWORD_HASHING_QUEUE_SIZE = 64
+
+# Token bucket limits per URL name, by client IP and by account (username, email,
+# refresh token or authenticated user). Shared through redis, in process otherwise.
+RATE_LIMIT_CACHE_ALIAS = "default"
+RATE_LIMIT_NUM_PROXIES = int(os.getenv("RATE_LIMIT_NUM_PROXIES", 0))
+RATE_LIMITS = {
+    "login": {"ip": "30/min", "account": "10/10min"},
+    "login-async": {"ip": "30/min", "account": "10/10min"},
+    "validate-login-otp": {"ip": "30/min", "account": "5/5min"},
+    "verify-otp": {"ip": "30/min", "account": "5/5min"},
+    "forgot-password": {"ip": "10/min", "account": "3/15min"},
+    "reset-password": {"ip": "10/min", "account": "5/15min"},
+}
+
+# Pending OTP codes are kept in the cache until used or expired. OTP_AUDIT also
+# records each generated code (without the code) in the OTP table.
+OTP_CACHE_ALIAS = "default"
+OTP_AUDIT = os.getenv("OTP_AUDIT") == "true"
+
+# Verified TOTP secrets are kept in process (encrypted) for TOTP_SECRET_CACHE_TTL
+# seconds. Used codes are remembered in the cache so each one is accepted once.
+TOTP_CACHE_ALIAS = "default"
+TOTP_SECRET_CACHE_TTL = 30
+TOTP_SECRET_CACHE_SIZE = 10000
+TOTP_VALID_WINDOW = 0
+
+# Sorted SHA-1 hash file of breached passwords (Pwned Passwords format, or built
+# with `build_breached_passwords`), binary searched through mmap or loaded into a
+# Bloom filter. The check is skipped when no file is set.
+BREACHED_PASSWORDS_FILE = os.getenv("BREACHED_PASSWORDS_FILE")
+BREACHED_PASSWORDS_MODE = os.getenv("BREACHED_PASSWORDS_MODE", "mmap")
+BREACHED_PASSWORDS_ERROR_RATE = 0.001
+
+# Bulk user imports validate, hash and insert USER_IMPORT_BATCH_SIZE rows at a
+# time. `import_users` hashes across USER_IMPORT_HASH_PROCESSES processes, the
+# import endpoint in the request's process
+USER_IMPORT_BATCH_SIZE = 500
+USER_IMPORT_HASH_PROCESSES = int(
+    os.getenv("USER_IMPORT_HASH_PROCESSES", os.cpu_count() or 1)
+)
+
+# Emails are queued and sent by a background thread in batches of EMAIL_BATCH_SIZE
+# over one connection, kept open until idle for EMAIL_CONNECTION_IDLE_TIMEOUT seconds
+EMAIL_BATCH_SIZE = 50
+EMAIL_FLUSH_INTERVAL = 0.5
+EMAIL_CONNECTION_IDLE_TIMEOUT = 30
+
+# Outbox messages are sent by the relay (`relay_outbox --interval`, the
+# outbox-relay service) in batches of OUTBOX_BATCH_SIZE, failed ones retried with
+# exponential backoff. Without a broker they are also relayed in process on
+# commit (OUTBOX_RELAY_ON_COMMIT, set below).
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 10
+OUTBOX_RETRY_DELAY = 5
+OUTBOX_MAX_RETRY_DELAY = 3600
+
+# Celery. CELERY_BROKER_URL (e.g. redis://redis:6379/1, set by docker-compose)
+# enables the workers, without it tasks run eagerly in process (and tests use the
+# in-memory broker). Tasks are routed to priority queues by
+# base.utils.tasks.route_task, each queue needs a worker: `run_worker <queue>`
+# (the worker-* services of docker-compose).
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "memory://")
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "") == "true" or (
+    not os.getenv("CELERY_BROKER_URL")
+)
+CELERY_TASK_EAGER_PROPAGATES = False
+OUTBOX_RELAY_ON_COMMIT = CELERY_TASK_ALWAYS_EAGER
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_ROUTES = ("base.utils.tasks.route_task",)
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_TASK_RETRY_BACKOFF = 2
+CELERY_TASK_RETRY_BACKOFF_MAX = 300
+CELERY_TASK_MAX_RETRIES = 5
+# Worker options per queue: latency critical queues take one task at a time
+CELERY_QUEUE_WORKERS = {
+    "dispatch": {"concurrency": 8, "prefetch_multiplier": 1},
+    "otp": {"concurrency": 4, "prefetch_multiplier": 1},
+    "welcome": {"concurrency": 2, "prefetch_multiplier": 4},
+    "default": {"concurrency": 2, "prefetch_multiplier": 4},
 }
 
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 
+# Authentication of the views requiring a logged in user (`AuthUserMixin`)
+JWT_AUTHENTICATION_CLASS = "account.authentication.CachedJWTAuthentication"
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "account.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "base.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "base.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 TOTP_ISSUER_NAME = "ADS"  # Ambulance Dispatch System
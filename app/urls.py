@@ -18,8 +18,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from base.views import BatchAPIView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/auth/", include("account.urls")),
     path("api/v1/users/", include("usermgmt.urls")),
+    path("api/v1/batch", BatchAPIView.as_view(), name="batch"),
 ]
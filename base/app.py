@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class BaseConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "base"
+
+    def ready(self):
+        from base.cache import invalidate_model_cache
+
+        # registers the outbox handlers of the emails
+        import base.send_email  # noqa: F401
+
+        # Any write to a model invalidates the cached data derived from it
+        post_save.connect(invalidate_model_cache, dispatch_uid="base.invalidate_save")
+        post_delete.connect(
+            invalidate_model_cache, dispatch_uid="base.invalidate_delete"
+        )
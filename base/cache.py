@@ -0,0 +1,267 @@
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from collections import Counter
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = getattr(settings, "QUERY_CACHE_ALIAS", "default")
+# Seconds an expired or invalidated entry may still be served while it is rebuilt
+CACHE_STALE_TIMEOUT = getattr(settings, "CACHE_STALE_TIMEOUT", 300)
+# Seconds a rebuild lock is held at most, and waited for when nothing stale exists
+CACHE_LOCK_TIMEOUT = getattr(settings, "CACHE_LOCK_TIMEOUT", 10)
+CACHE_LOCK_WAIT = getattr(settings, "CACHE_LOCK_WAIT", 2)
+# Local metric events flushed to the shared cache every N events
+CACHE_METRICS_FLUSH_EVERY = getattr(settings, "CACHE_METRICS_FLUSH_EVERY", 100)
+
+CACHE_EVENTS = ("hit", "miss", "coalesced")
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the cache backend used for query and response caching."""
+    return caches[CACHE_ALIAS]
+
+
+def model_label(model):
+    """Return a stable label (e.g. `account.user`) for a model class, instance or label."""
+    if isinstance(model, str):
+        return model.lower()
+    return model._meta.label_lower
+
+
+def make_key(prefix, *parts):
+    """
+    Build a fixed-length cache key from arbitrary parts.
+
+    Args:
+        prefix (str): Readable namespace for the key (e.g. `count`).
+        *parts: Values identifying the cached item; they are hashed together.
+
+    Returns:
+        str: Cache key of the form `<prefix>:<sha1>`.
+    """
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def get_model_versions(models):
+    """
+    Get the current cache versions of several models in one cache round trip.
+
+    Args:
+        models (iterable): Model classes or `app_label.ModelName` labels.
+
+    Returns:
+        tuple: Versions in the order of `models`, or None if the cache backend is unavailable.
+    """
+    keys = [f"model-version:{model_label(model)}" for model in models]
+    cache = get_cache()
+    try:
+        versions = cache.get_many(keys)
+        missing = {key: int(time.time() * 1000) for key in keys if key not in versions}
+        if missing:
+            for key, version in missing.items():
+                # add() keeps a version another worker may have just seeded
+                cache.add(key, version, timeout=None)
+            versions.update(cache.get_many(list(missing)))
+        return tuple(versions[key] for key in keys)
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+        return None
+
+
+def get_model_last_modified(models):
+    """
+    Get the time of the latest write to any of `models`, as recorded by `bump_model_version`.
+
+    Args:
+        models (iterable): Model classes or `app_label.ModelName` labels.
+
+    Returns:
+        float: Unix timestamp, or None if a model has no recorded write or the cache
+               backend is unavailable.
+    """
+    keys = [f"model-modified:{model_label(model)}" for model in models]
+    try:
+        modified = get_cache().get_many(keys)
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+        return None
+    if len(modified) != len(keys):
+        return None
+    return max(modified.values())
+
+
+def bump_model_version(model):
+    """Invalidate every cached entry derived from `model` by bumping its version."""
+    label = model_label(model)
+    key = f"model-version:{label}"
+    cache = get_cache()
+    try:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The counter does not exist (never read or evicted), seed a fresh one.
+            cache.set(key, int(time.time() * 1000), timeout=None)
+        cache.set(f"model-modified:{label}", time.time(), timeout=None)
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+
+
+def bump_model_version_on_commit(model, using=None):
+    """
+    Bump the version of `model` once the current transaction commits (at once
+    outside a transaction).
+
+    Bumped before the commit, a read in between would cache the pre-commit rows
+    under the new version and serve them until the entry times out.
+    """
+    transaction.on_commit(lambda: bump_model_version(model), using=using)
+
+
+def invalidate_model_cache(sender, using=None, **kwargs):
+    """`post_save`/`post_delete` receiver bumping the version of the sender model on commit."""
+    bump_model_version_on_commit(sender, using)
+
+
+def record_cache_event(name, event):
+    """
+    Count a cache `event` (hit, miss, coalesced) for the cache called `name`.
+
+    Events are counted in process and added to shared counters in the cache every
+    `CACHE_METRICS_FLUSH_EVERY` events, so recording costs no round trip.
+    """
+    with _metrics_lock:
+        _metrics[(name, event)] += 1
+        if sum(_metrics.values()) < CACHE_METRICS_FLUSH_EVERY:
+            return
+        pending = dict(_metrics)
+        _metrics.clear()
+
+    cache = get_cache()
+    for (metric_name, metric_event), count in pending.items():
+        key = f"cache-metrics:{metric_name}:{metric_event}"
+        try:
+            if not cache.add(key, count, timeout=None):
+                cache.incr(key, count)
+        except Exception as e:
+            logger.error(f"CacheError: {str(e)}")
+
+
+def get_cache_metrics(names):
+    """
+    Return the shared metric counters of the given caches.
+
+    Returns:
+        dict: `{name: {event: count}}`, events not flushed yet are not included.
+    """
+    keys = {
+        f"cache-metrics:{name}:{event}": (name, event)
+        for name in names
+        for event in CACHE_EVENTS
+    }
+    counts = get_cache().get_many(list(keys))
+    metrics = {name: dict.fromkeys(CACHE_EVENTS, 0) for name in names}
+    for key, count in counts.items():
+        name, event = keys[key]
+        metrics[name][event] = count
+    return metrics
+
+
+def get_or_build(key, build, timeout, versions=None, name="default"):
+    """
+    Get a cached value, rebuilding it at most once across workers (single flight).
+
+    Entries remember the model `versions` they were built from. An entry is fresh
+    while it is younger than `timeout` and its versions are current. Otherwise
+    the first caller takes a per-key lock and rebuilds, and concurrent callers
+    are served the stale entry (stale-while-revalidate). With no stale entry to
+    serve, they wait up to `CACHE_LOCK_WAIT` seconds for the rebuild.
+
+    Args:
+        key (str): Cache key, without the versions.
+        build (callable): Computes the value, returning None when it must not be cached.
+        timeout (int): Seconds the value stays fresh.
+        versions (tuple, optional): Model versions the value is derived from.
+        name (str): Cache name used for the hit/miss/coalesced metrics.
+
+    Values built inside a transaction (e.g. an atomic batch) may include
+    uncommitted rows, they are built without reading or writing the cache.
+
+    Returns:
+        The cached or freshly built value.
+    """
+    return get_or_build_entry(key, build, timeout, versions, name)["value"]
+
+
+def get_or_build_entry(key, build, timeout, versions=None, name="default"):
+    """
+    `get_or_build`, returning the entry served instead of its value.
+
+    Returns:
+        dict: `value`, and the `versions` it was built from. These differ from
+              `versions` when a stale entry was served.
+    """
+    if connection.in_atomic_block:
+        return {"value": build(), "versions": versions}
+    cache = get_cache()
+    try:
+        entry = cache.get(key)
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+        return {"value": build(), "versions": versions}
+
+    if entry is not None and entry["versions"] == versions:
+        if entry["fresh_until"] > time.time():
+            record_cache_event(name, "hit")
+            return entry
+
+    lock_key = f"lock:{key}"
+    token = uuid.uuid4().hex
+    try:
+        locked = cache.add(lock_key, token, CACHE_LOCK_TIMEOUT)
+    except Exception as e:
+        logger.error(f"CacheError: {str(e)}")
+        locked = True
+
+    if not locked:
+        if entry is not None:
+            record_cache_event(name, "coalesced")
+            return entry
+        deadline = time.time() + CACHE_LOCK_WAIT
+        while time.time() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                record_cache_event(name, "coalesced")
+                return entry
+
+    record_cache_event(name, "miss")
+    try:
+        value = build()
+        entry = {
+            "value": value,
+            "versions": versions,
+            "fresh_until": time.time() + timeout,
+        }
+        if value is not None:
+            try:
+                cache.set(key, entry, timeout + CACHE_STALE_TIMEOUT)
+            except Exception as e:
+                logger.error(f"CacheError: {str(e)}")
+    finally:
+        try:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+        except Exception as e:
+            logger.error(f"CacheError: {str(e)}")
+    return entry
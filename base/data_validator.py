@@ -1,12 +1,13 @@
 class DataValidator:
     """
     Handles request data validation using the provided serializer.
+
+    Validation results are returned instead of stored on the instance, so one
+    validator can be shared by concurrent requests.
     """
 
     def __init__(self, serializer=None) -> None:
         self.serializer = serializer
-        self.valid_data = None
-        self.errors = None
 
     def validate(self, data, instance=None, partial=False):
         """
@@ -16,12 +17,13 @@ class DataValidator:
             data (dict): Request data to validate.
 
         Returns:
-            None: Sets `self.valid_data` if valid, otherwise sets `self.errors`.
+            tuple: (valid_data, errors) - The validated data, or the serializer errors.
+                   Both are None when there is no serializer.
         """
         if self.serializer:
             serializer = self.serializer(data=data, instance=instance, partial=partial)
 
             if serializer.is_valid():
-                self.valid_data = serializer.validated_data
-            else:
-                self.errors = serializer.errors
+                return serializer.validated_data, None
+            return None, serializer.errors
+        return None, None
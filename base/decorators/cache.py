@@ -0,0 +1,110 @@
+from functools import wraps
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+
+from base.cache import get_model_versions, get_or_build_entry, make_key
+
+RESPONSE_CACHE_TIMEOUT = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 60)
+
+
+def normalize_query_params(query_params):
+    """Return query parameters as a sorted tuple so their order does not change the key."""
+    return tuple(
+        sorted((key, tuple(sorted(values))) for key, values in query_params.lists())
+    )
+
+
+def response_cache_key(request, serializer, vary_on_user=False):
+    """
+    Build the cache key of a GET response.
+
+    The key covers the path, the normalized query parameters, the requesting role
+    (and user when `vary_on_user`) and the response serializer. Model versions are
+    kept in the entry so an invalidated response can still be served stale while
+    it is rebuilt.
+    """
+    user = request.user
+    role = getattr(user, "role", None) if user.is_authenticated else "anonymous"
+    return make_key(
+        "response",
+        request.path,
+        normalize_query_params(request.query_params),
+        role,
+        user.pk if vary_on_user else None,
+        f"{serializer.__module__}.{serializer.__qualname__}" if serializer else None,
+    )
+
+
+def get_response_dependencies(view, request, kwargs, depends_on=None):
+    """
+    Resolve the response serializer of a GET handler and the models its response depends on.
+
+    Returns:
+        tuple: (serializer, models) - `models` is `depends_on` when given, else the
+               response serializer's model, or None when neither is known.
+    """
+    serializer = view.get_response_serializer_class(
+        request=request,
+        id=kwargs.get("id"),
+        method=request.resolver_match.url_name,
+    )
+    models = depends_on
+    if models is None and hasattr(getattr(serializer, "Meta", None), "model"):
+        models = (serializer.Meta.model,)
+    return serializer, models
+
+
+def cache_response(timeout=RESPONSE_CACHE_TIMEOUT, depends_on=None, vary_on_user=False):
+    """
+    Cache successful responses of a `BaseAPIView` GET handler.
+
+    Cached hits skip the database and serialization entirely. Entries are
+    invalidated through the per-model version counters bumped on save/delete, and
+    rebuilt by a single worker while the others serve the stale response.
+
+    Args:
+        timeout (int): Seconds to keep a response.
+        depends_on (tuple): Models (or `app_label.ModelName` labels) whose writes
+            invalidate the response. Defaults to the response serializer's model.
+        vary_on_user (bool): Cache per user instead of per role, for responses that
+            contain the requesting user's own data.
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            serializer, models = get_response_dependencies(
+                self, request, kwargs, depends_on
+            )
+            versions = get_model_versions(models) if models else None
+            if versions is None:
+                return view_method(self, request, *args, **kwargs)
+
+            response = None
+
+            def build():
+                nonlocal response
+                response = view_method(self, request, *args, **kwargs)
+                if isinstance(response, Response) and response.status_code == 200:
+                    return response.data
+                return None
+
+            entry = get_or_build_entry(
+                response_cache_key(request, serializer, vary_on_user),
+                build,
+                timeout,
+                versions=versions,
+                name="response",
+            )
+            if response is not None:
+                return response
+            response = Response(entry["value"], status.HTTP_200_OK)
+            # served stale while another worker rebuilds, older than the current
+            # versions `conditional_response` validates against
+            response.stale = entry["versions"] != versions
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,126 @@
+import math
+import hashlib
+from functools import wraps
+from django.apps import apps
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from base.cache import get_model_last_modified, get_model_versions
+from base.decorators.cache import get_response_dependencies, response_cache_key
+
+
+def get_table_state(models):
+    """
+    Read `MAX(updated)` and the row count of each model in one aggregate query per model.
+
+    Used when the cache version counters are unavailable. The count catches deletes,
+    which do not move `MAX(updated)`.
+
+    Returns:
+        tuple: ((count, max_updated), ...) in the order of `models`, or None if a
+               model is not installed or has no `updated` column.
+    """
+    state = []
+    for model in models:
+        if isinstance(model, str):
+            try:
+                model = apps.get_model(model)
+            except (LookupError, ValueError):
+                return None
+        if not any(field.name == "updated" for field in model._meta.concrete_fields):
+            return None
+        aggregate = model._default_manager.aggregate(
+            count=Count("pk"), last_modified=Max("updated")
+        )
+        state.append((aggregate["count"], aggregate["last_modified"]))
+    return tuple(state)
+
+
+def get_validators(request, serializer, models, vary_on_user=False):
+    """
+    Compute the ETag and Last-Modified of a GET response without building it.
+
+    The ETag hashes the response cache key (path, query parameters, role or user,
+    serializer), the negotiated media type and the model versions, so any write to
+    a dependency changes it. Without the cache it falls back to `get_table_state`.
+
+    Returns:
+        tuple: (etag, last_modified) - quoted ETag or None, Unix timestamp or None.
+    """
+    versions = get_model_versions(models)
+    last_modified = None
+    if versions is None:
+        versions = get_table_state(models)
+        if versions is None:
+            return None, None
+        updated = [state[1] for state in versions if state[1] is not None]
+        if updated:
+            last_modified = max(updated).timestamp()
+    else:
+        last_modified = get_model_last_modified(models)
+
+    key = response_cache_key(request, serializer, vary_on_user)
+    digest = hashlib.sha1(
+        repr((key, request.accepted_media_type, versions)).encode()
+    ).hexdigest()
+    if last_modified is not None:
+        # HTTP dates have a one second resolution, round up so a write is never hidden
+        last_modified = math.ceil(last_modified)
+    return quote_etag(digest), last_modified
+
+
+def conditional_response(depends_on=None, vary_on_user=False):
+    """
+    Answer conditional GETs of a `BaseAPIView` handler with 304 Not Modified.
+
+    `If-None-Match` and `If-Modified-Since` are checked against validators computed
+    from the model version counters before the handler runs, so a 304 costs no
+    query and no serialization. Successful responses get `ETag` and
+    `Last-Modified` headers, except stale ones served by `cache_response` while
+    they are rebuilt. Apply it above `cache_response`.
+
+    Args:
+        depends_on (tuple): Models (or `app_label.ModelName` labels) whose writes
+            change the response. Defaults to the response serializer's model.
+        vary_on_user (bool): Validate per user instead of per role.
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            serializer, models = get_response_dependencies(
+                self, request, kwargs, depends_on
+            )
+            if not models:
+                return view_method(self, request, *args, **kwargs)
+
+            etag, last_modified = get_validators(
+                request, serializer, models, vary_on_user
+            )
+            if etag is None:
+                return view_method(self, request, *args, **kwargs)
+
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if not_modified is not None:
+                response = not_modified
+            else:
+                response = view_method(self, request, *args, **kwargs)
+                if not isinstance(response, Response) or response.status_code != 200:
+                    return response
+                if getattr(response, "stale", False):
+                    # the validators describe the current versions, not this body
+                    patch_vary_headers(response, ("Authorization",))
+                    return response
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+            patch_vary_headers(response, ("Authorization",))
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,92 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from account.models import User
+
+
+class Command(BaseCommand):
+    help = "Benchmarks conditional GETs answered with 304 against full 200 responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            type=str,
+            default="/api/v1/users/?page_size=100",
+            help="GET endpoint to benchmark",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=200,
+            help="Number of requests per path (default: 200)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Number of temporary users to create, rolled back afterwards",
+        )
+
+    @override_settings(ALLOWED_HOSTS=["*"])
+    def handle(self, *args, **options):
+        url = options["url"]
+        iterations = options["iterations"]
+
+        with transaction.atomic():
+            user = User.objects.create(
+                username="benchmark-conditional",
+                email="benchmark-conditional@example.com",
+                phone_number="+0000000000",
+                role="ADMIN",
+            )
+            if options["seed"]:
+                User.objects.bulk_create(
+                    User(
+                        username=f"benchmark{index}",
+                        email=f"benchmark{index}@example.com",
+                        phone_number=f"+000{index}",
+                    )
+                    for index in range(options["seed"])
+                )
+
+            client = APIClient()
+            client.force_authenticate(user)
+            response = client.get(url)
+            etag = response.get("ETag")
+            if response.status_code != 200 or not etag:
+                raise CommandError(
+                    f"{url} returned {response.status_code} without an ETag."
+                )
+
+            full_time = self.measure(lambda: client.get(url), 200, iterations)
+            with CaptureQueriesContext(connection) as queries:
+                not_modified_time = self.measure(
+                    lambda: client.get(url, HTTP_IF_NONE_MATCH=etag), 304, iterations
+                )
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{url}: {len(response.content)} bytes, {iterations} requests"
+        )
+        self.stdout.write(f"  200: {full_time * 1000 / iterations:.3f} ms/request")
+        self.stdout.write(
+            f"  304: {not_modified_time * 1000 / iterations:.3f} ms/request, "
+            f"{len(queries) / iterations:.1f} queries/request"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Speedup: {full_time / not_modified_time:.2f}x")
+        )
+
+    @staticmethod
+    def measure(get, status_code, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            response = get()
+            if response.status_code != status_code:
+                raise CommandError(
+                    f"Expected {status_code}, got {response.status_code}."
+                )
+        return time.perf_counter() - start
@@ -0,0 +1,80 @@
+import time
+from django.core.mail import send_mail
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from base.utils.email_dispatcher import EmailDispatcher, build_message
+from base.utils.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks sending emails one connection per message against the batching "
+        "email dispatcher, against a local SMTP sink"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=500,
+            help="Number of emails sent per path (default: 500)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Messages per batch of the dispatcher (default: 50)",
+        )
+
+    def handle(self, *args, **options):
+        count = options["messages"]
+        with SMTPSink(keep_messages=False) as sink, override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST=sink.host,
+            EMAIL_PORT=sink.port,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+        ):
+            started_at = time.perf_counter()
+            for index in range(count):
+                send_mail(
+                    f"Benchmark {index}",
+                    "Benchmark message",
+                    None,
+                    [f"user{index}@example.com"],
+                )
+            per_message = time.perf_counter() - started_at
+            connections = sink.connection_count
+
+            dispatcher = EmailDispatcher(
+                batch_size=options["batch_size"], flush_interval=0.05
+            )
+            started_at = time.perf_counter()
+            for index in range(count):
+                dispatcher.enqueue(
+                    build_message(
+                        f"user{index}@example.com",
+                        f"Benchmark {index}",
+                        "Benchmark message",
+                    )
+                )
+            dispatcher.flush()
+            batched = time.perf_counter() - started_at
+            dispatcher.close()
+            metrics = dispatcher.metrics()
+
+        self.stdout.write(
+            f"send_mail per message: {count / per_message:8.0f} msg/s "
+            f"({connections} connections)"
+        )
+        self.stdout.write(
+            f"batched dispatcher:    {count / batched:8.0f} msg/s "
+            f"({metrics['connections']} connections, {metrics['batches']} batches)"
+        )
+        self.stdout.write(f"dispatcher metrics: {metrics}")
+        self.stdout.write(
+            self.style.SUCCESS(f"{per_message / batched:.2f}x faster when batched")
+        )
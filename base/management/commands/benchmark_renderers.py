@@ -0,0 +1,87 @@
+import json
+import time
+import uuid
+import datetime
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from base.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the orjson renderer against DRF's JSONRenderer on paginated payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=100, help="Results per page (default: 100)"
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=500,
+            help="Number of pages to render per renderer (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        iterations = options["iterations"]
+        payload = self.build_payload(rows)
+
+        stdlib_output = JSONRenderer().render(payload)
+        orjson_output = ORJSONRenderer().render(payload)
+        if json.loads(stdlib_output) != json.loads(orjson_output):
+            raise CommandError("orjson output differs from the JSONRenderer output.")
+
+        stdlib_time = self.measure(JSONRenderer(), payload, iterations)
+        orjson_time = self.measure(ORJSONRenderer(), payload, iterations)
+
+        self.stdout.write(
+            f"Paginated payload: {rows} rows, {len(stdlib_output)} bytes, {iterations} renders"
+        )
+        self.stdout.write(f"  json:   {stdlib_time * 1000 / iterations:.3f} ms/page")
+        self.stdout.write(f"  orjson: {orjson_time * 1000 / iterations:.3f} ms/page")
+        self.stdout.write(
+            self.style.SUCCESS(f"Speedup: {stdlib_time / orjson_time:.2f}x")
+        )
+
+    @staticmethod
+    def measure(renderer, payload, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            renderer.render(payload)
+        return time.perf_counter() - start
+
+    @staticmethod
+    def build_payload(rows):
+        """Build a payload shaped like `CustomPagination.get_paginated_response`."""
+        now = timezone.now()
+        results = [
+            {
+                "id": index,
+                "uuid": uuid.uuid4(),
+                "ambulance_registration_number": f"REG-{index:06d}",
+                "latitude": 6.5244 + index / 1000,
+                "longitude": 3.3792 - index / 1000,
+                "status": "AVAILABLE",
+                "ambulance_type": "ALS",
+                "hospital": index % 17,
+                "fuel_cost": Decimal("1234.50"),
+                "created": now - datetime.timedelta(days=index),
+                "updated": (now - datetime.timedelta(minutes=index)).isoformat(),
+            }
+            for index in range(rows)
+        ]
+        return {
+            "pagination": {
+                "current_page": 1,
+                "next_page": "http://localhost:8000/api/v1/ambulances/?page=2",
+                "previous_page": None,
+                "total_items": rows * 50,
+                "total_pages": 50,
+                "page_size": rows,
+                "pages": [1, 2, "...", 49, 50],
+            },
+            "results": results,
+        }
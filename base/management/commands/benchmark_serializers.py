@@ -0,0 +1,100 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from account.models import User
+from base.utils.compiled_serializer import get_compiled_serializer
+
+
+class Command(BaseCommand):
+    help = "Benchmarks a compiled list serializer against the DRF serializer path"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--serializer",
+            type=str,
+            default="usermgmt.serializers.user.UserListSerializer",
+            help="Dotted path of the serializer to benchmark",
+        )
+        parser.add_argument(
+            "--rows", type=int, default=100, help="Rows per page (default: 100)"
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=200,
+            help="Number of pages to render per path (default: 200)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Number of temporary users to create, rolled back afterwards",
+        )
+
+    def handle(self, *args, **options):
+        serializer = import_string(options["serializer"])
+        rows = options["rows"]
+        iterations = options["iterations"]
+
+        compiled = get_compiled_serializer(serializer)
+        if compiled is None:
+            raise CommandError(f"{serializer.__name__} cannot be compiled.")
+
+        model = serializer.Meta.model
+        with transaction.atomic():
+            if options["seed"]:
+                if model is not User:
+                    raise CommandError("--seed is only supported for User serializers.")
+                self.seed_users(options["seed"])
+
+            queryset = model.objects.all()
+            drf_data = serializer(queryset[:rows], many=True).data
+            compiled_data = compiled.serialize(compiled.values(queryset)[:rows])
+            if [dict(item) for item in drf_data] != compiled_data:
+                raise CommandError("Compiled output differs from the DRF output.")
+
+            drf_time = self.measure(
+                lambda: serializer(queryset[:rows], many=True).data, iterations
+            )
+            compiled_time = self.measure(
+                lambda: compiled.serialize(compiled.values(queryset)[:rows]),
+                iterations,
+            )
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{serializer.__name__}: {len(compiled_data)} rows x {iterations} pages"
+        )
+        self.stdout.write(f"  drf:      {drf_time * 1000 / iterations:.3f} ms/page")
+        self.stdout.write(
+            f"  compiled: {compiled_time * 1000 / iterations:.3f} ms/page"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Speedup: {drf_time / compiled_time:.2f}x")
+        )
+
+    @staticmethod
+    def measure(render, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            render()
+        return time.perf_counter() - start
+
+    @staticmethod
+    def seed_users(count):
+        User.objects.bulk_create(
+            User(
+                username=f"benchmark{index}",
+                email=f"benchmark{index}@example.com",
+                phone_number=f"+000{index}",
+                first_name="Benchmark",
+                last_name=f"User{index}",
+                address="Benchmark address " * 20,
+                emergency_first_name="Emergency",
+                emergency_last_name="Contact",
+                emergency_phone_number=f"+999{index}",
+            )
+            for index in range(count)
+        )
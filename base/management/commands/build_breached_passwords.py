@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from base.utils.breached_passwords import password_hash
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds the sorted SHA-1 file read by the breached-password check "
+        "(BREACHED_PASSWORDS_FILE) from plain text password lists"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "sources", nargs="+", help="Password lists, one password per line"
+        )
+        parser.add_argument("--output", required=True, help="File to write")
+
+    def handle(self, *args, **options):
+        hashes = set()
+        for source in options["sources"]:
+            with open(source, encoding="utf-8", errors="ignore") as file:
+                for line in file:
+                    password = line.rstrip("\r\n")
+                    if password:
+                        hashes.add(password_hash(password))
+
+        with open(options["output"], "w") as file:
+            for digest in sorted(hashes):
+                file.write(f"{digest}\n")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {len(hashes)} hashes to {options['output']}.")
+        )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from base.cache import get_cache_metrics
+
+
+class Command(BaseCommand):
+    help = "Shows hit/miss/coalesced counters of the shared query and response caches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names",
+            nargs="*",
+            default=["response", "count"],
+            help="Cache names to show (default: response count)",
+        )
+
+    def handle(self, *args, **options):
+        for name, events in get_cache_metrics(options["names"]).items():
+            total = sum(events.values())
+            served = events["hit"] + events["coalesced"]
+            ratio = served / total * 100 if total else 0
+            self.stdout.write(
+                f"{name}: hit={events['hit']} miss={events['miss']} "
+                f"coalesced={events['coalesced']} served_from_cache={ratio:.1f}%"
+            )
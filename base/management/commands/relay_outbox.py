@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand
+
+from base.utils.outbox import OUTBOX_BATCH_SIZE, relay_outbox
+
+
+class Command(BaseCommand):
+    help = "Sends the committed outbox messages (emails, domain events) in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=OUTBOX_BATCH_SIZE,
+            help=f"Messages sent per transaction (default: {OUTBOX_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep running and poll every N seconds once drained (default: drain once)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = relay_outbox(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed >= batch_size:
+                # more may be waiting, send the next batch right away
+                continue
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent {total_sent} outbox messages, {total_failed} failed."
+            )
+        )
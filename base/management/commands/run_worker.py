@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.celery import celery_app
+from base.utils.tasks import PRIORITY_QUEUES
+
+# Worker options per queue, see CELERY_QUEUE_WORKERS
+QUEUE_WORKERS = getattr(settings, "CELERY_QUEUE_WORKERS", {})
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a Celery worker for one priority queue, with that queue's concurrency "
+        "and prefetch settings (CELERY_QUEUE_WORKERS)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("queue", choices=PRIORITY_QUEUES)
+        parser.add_argument(
+            "--concurrency", type=int, default=None, help="Overrides the setting"
+        )
+        parser.add_argument("--loglevel", default="INFO")
+
+    def handle(self, *args, **options):
+        queue = options["queue"]
+        worker = QUEUE_WORKERS.get(queue, {})
+        concurrency = options["concurrency"] or worker.get("concurrency", 1)
+        celery_app.worker_main(
+            [
+                "worker",
+                "--queues",
+                queue,
+                "--hostname",
+                f"{queue}@%h",
+                "--concurrency",
+                str(concurrency),
+                "--prefetch-multiplier",
+                str(worker.get("prefetch_multiplier", 1)),
+                "--loglevel",
+                options["loglevel"],
+            ]
+        )
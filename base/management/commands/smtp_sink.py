@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand
+
+from base.utils.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a local SMTP server accepting and counting every message, to point "
+        "EMAIL_HOST/EMAIL_PORT at in development and load tests"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=1025)
+
+    def handle(self, *args, **options):
+        with SMTPSink(options["host"], options["port"], keep_messages=False) as sink:
+            self.stdout.write(f"SMTP sink listening on {sink.host}:{sink.port}")
+            try:
+                while True:
+                    time.sleep(10)
+                    self.stdout.write(
+                        f"{sink.message_count} messages over "
+                        f"{sink.connection_count} connections"
+                    )
+            except KeyboardInterrupt:
+                pass
@@ -5,10 +5,12 @@ from string import Template
 # Define the default template
 API_VIEW_TEMPLATE = """from base.views import BaseAPIView
 from ${module}.serializers.${resource_lower} import ${resource}CreateSerializer, ${resource}ListSerializer, ${resource}UpdateSerializer, ${resource}DetailSerializer, ${resource}PartialUpdateSerializer
-from base.service import ServiceFactory
 from ${module}.managers.${resource_lower} import ${resource}Manager
 
 class Base${resource}APIView(BaseAPIView):
+    manager = ${resource}Manager
+    detail_serializer_class = ${resource}DetailSerializer
+
     serializer_classes = {
         'get': None,
         'post': ${resource}CreateSerializer,
@@ -24,38 +26,6 @@ class Base${resource}APIView(BaseAPIView):
         'patch': ${resource}DetailSerializer,
         'delete': ${resource}DetailSerializer
     }
-    
-    def get_service(self, *args, **kwargs):
-        request = kwargs.get('request')
-        return ServiceFactory(${resource}Manager, self.get_serializer_class(request=request))
-    
-    def get_serializer_class(self, *args, **kwargs):
-        request = kwargs.get('request')
-        method_to_action = {
-            'GET': 'get',
-            'POST': 'post',
-            'PUT': 'put',
-            'PATCH': 'patch',
-            'DELETE': 'delete'
-        }
-        action = method_to_action.get(request.method, 'get')
-        return self.serializer_classes.get(action, None)
-    
-    def get_response_serializer_class(self, *args, **kwargs):
-        request = kwargs.get('request')
-        instance_id = kwargs.get('id')
-        if request.method == 'GET' and id:
-            return ${resource}DetailSerializer
-        
-        method_to_action = {
-            'GET': 'get',
-            'POST': 'post',
-            'PUT': 'put',
-            'PATCH': 'patch',
-            'DELETE': 'delete'
-        }
-        action = method_to_action.get(request.method)
-        return self.serializer_response_classes.get(action, None)
 
 class ${resource}APIView(Base${resource}APIView):
     def get(self, request, id=None):
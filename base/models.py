@@ -1,5 +1,6 @@
 import auto_prefetch
 from django.db import models
+from django.utils import timezone
 
 
 class BaseModel(auto_prefetch.Model):
@@ -17,3 +18,30 @@ class BaseModel(auto_prefetch.Model):
 
     class Meta(auto_prefetch.Model.Meta):
         abstract = True
+
+
+class OutboxMessage(BaseModel):
+    """
+    Message written in the same transaction as the change it is about, and sent
+    by the outbox relay once that transaction committed.
+
+    Attributes:
+        topic (str): What the message is, selects the relay handler sending it
+        payload (dict): JSON arguments of the handler
+        attempts (int): Failed sends so far
+        available_at (datetime): The message is not sent before this time
+        last_error (str): Error of the last failed send
+    """
+
+    topic = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True, blank=True)
+
+    class Meta(auto_prefetch.Model.Meta):
+        ordering = ["id"]
+        indexes = [models.Index(fields=["available_at"], name="outbox_available_idx")]
+
+    def __str__(self):
+        return f"{self.topic} #{self.pk}"
@@ -1,11 +1,99 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 
+from base.cache import get_model_versions, get_or_build, make_key, model_label
+from base.utils.compiled_serializer import CompiledSerializer
+
+COUNT_CACHE_TIMEOUT = getattr(settings, "PAGINATION_COUNT_CACHE_TIMEOUT", 300)
+ESTIMATED_COUNT = getattr(settings, "PAGINATION_ESTIMATED_COUNT", False)
+ESTIMATED_COUNT_THRESHOLD = getattr(
+    settings, "PAGINATION_ESTIMATED_COUNT_THRESHOLD", 100000
+)
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that avoids running `COUNT(*)` on every list request.
+
+    Totals are cached per model and normalized filter (the compiled SQL and its
+    params) and invalidated through the model version bumped on save/delete.
+    A single worker recounts an invalidated total while the others use the stale one.
+    When `PAGINATION_ESTIMATED_COUNT` is enabled, unfiltered querysets on large
+    tables report the planner's row estimate instead of an exact count.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return super().count
+
+        estimate = self.estimated_count(queryset)
+        if estimate is not None:
+            return estimate
+
+        versions = get_model_versions((queryset.model,))
+        if versions is None:
+            return queryset.count()
+
+        try:
+            sql, params = queryset.order_by().query.sql_with_params()
+        except Exception:
+            # e.g. EmptyResultSet, nothing worth caching
+            return queryset.count()
+
+        key = make_key("count", model_label(queryset.model), queryset.db, sql, params)
+        return get_or_build(
+            key, queryset.count, COUNT_CACHE_TIMEOUT, versions=versions, name="count"
+        )
+
+    @staticmethod
+    def estimated_count(queryset):
+        """
+        Return the table statistics row estimate for an unfiltered queryset.
+
+        Returns:
+            int: Estimated row count, or None when estimates are disabled, the
+                 queryset is filtered, the backend keeps no statistics, or the
+                 table is small enough for an exact count.
+        """
+        if not ESTIMATED_COUNT or queryset.query.has_filters():
+            return None
+        if queryset.query.distinct or queryset.query.is_sliced:
+            return None
+
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+        if connection.vendor == "postgresql":
+            sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+            params = [connection.ops.quote_name(table)]
+        elif connection.vendor == "mysql":
+            sql = (
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s"
+            )
+            params = [table]
+        else:
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+
+        if not row or row[0] is None or row[0] < ESTIMATED_COUNT_THRESHOLD:
+            return None
+        return int(row[0])
+
 
 class CustomPagination(PageNumberPagination):
     """
     Custom pagination class to modify the response structure and behavior.
     """
 
+    django_paginator_class = CachedCountPaginator
     page_size = 10  # Default items per page
     page_size_query_param = "page_size"  # Allow the client to set the page size
     max_page_size = 100  # Limit the maximum page size
@@ -58,12 +146,15 @@ class CustomPagination(PageNumberPagination):
         Customizes the paginated response structure.
 
         Args:
-            data (list): Serialized data for the current page.
+            data (list): Instances (or value tuples for a compiled serializer) of the current page.
+            serializer: Serializer class or `CompiledSerializer` rendering `data`.
 
         Returns:
             Response: Customized paginated response.
         """
-        if serializer:
+        if isinstance(serializer, CompiledSerializer):
+            serialized_data = serializer.serialize(data)
+        elif serializer:
             serialized_data = serializer(
                 data, context={"request": request}, many=True
             ).data
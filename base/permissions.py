@@ -1,11 +1,18 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework.permissions import IsAuthenticated
+
+# JWT authentication of the authenticated views, by dotted path
+JWT_AUTHENTICATION_CLASS = getattr(
+    settings,
+    "JWT_AUTHENTICATION_CLASS",
+    "rest_framework_simplejwt.authentication.JWTAuthentication",
+)
 
 
 class AuthUserMixin:
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [import_string(JWT_AUTHENTICATION_CLASS)]
 
 
 class NonAuthUserMixin:
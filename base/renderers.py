@@ -0,0 +1,50 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib renderer
+    orjson = None
+
+
+# Types orjson does not encode natively (Decimal, lazy strings, querysets...) are
+# handed to DRF's encoder so the output matches the default renderer.
+_default = JSONEncoder().default
+
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Datetimes, dates, times and UUIDs are encoded natively (UTC as `Z`, like DRF),
+    other types go through DRF's `JSONEncoder`. Indented output (e.g. the browsable
+    API) and environments without orjson use the stdlib `JSONRenderer`.
+    """
+
+    # Non string keys (e.g. the item indexes of ListField errors) are encoded as
+    # strings, as the stdlib encoder does
+    options = 0 if orjson is None else orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if orjson is None or indent is not None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=self.options)
+
+        # Keep the output a strict javascript subset, as the stdlib renderer does
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b"\\u2028").replace(
+                PARAGRAPH_SEPARATOR, b"\\u2029"
+            )
+        return ret
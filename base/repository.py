@@ -2,6 +2,7 @@ from django.db.models import ManyToManyField, ForeignKey, OneToOneField
 from django.core.exceptions import FieldDoesNotExist
 from django.db import transaction
 
+from base.cache import bump_model_version_on_commit
 from base.decorators.repository import handle_repository_exceptions
 
 
@@ -136,6 +137,15 @@ class Repository:
                 break
         return error
 
+    def validate_fields(self, fields):
+        """Check that every name in `fields` exists on the model.
+
+        Keyword arguments:
+        fields -- iterable of field names
+        Return error: the error message of the first unknown field, None if all exist
+        """
+        return self.__validate_data_keys(dict.fromkeys(fields))
+
     @handle_repository_exceptions
     def create(self, *args, **kwargs):
         data = kwargs.get("data")
@@ -182,6 +192,8 @@ class Repository:
                 .filter(id=id)
                 .update(**data)
             )
+            # queryset.update() bypasses save signals, invalidate cached data here
+            bump_model_version_on_commit(self.model, using="default")
             instance, _ = Repository(self.model).get_by_id_or_filter_condition(id=id)
             if instance:
                 self.__set_many_to_many_relationship(self.m2m_data, instance)
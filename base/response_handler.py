@@ -1,8 +1,21 @@
+from django.conf import settings
 from django.db.models.query import QuerySet
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
 from rest_framework import status
 
 from base.paginator_handler import CustomPagination
+from base.renderers import ORJSONRenderer
+from base.utils.projection import project_queryset
+from base.utils.compiled_serializer import get_compiled_serializer
+from base.utils.export import (
+    EXPORT_FORMATS,
+    csv_chunks,
+    ndjson_chunks,
+    serialize_rows,
+)
+
+EXPORT_CHUNK_SIZE = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
 
 
 class ResponseHandler:
@@ -25,10 +38,17 @@ class ResponseHandler:
         """
         response_data = None
         if isinstance(data, QuerySet):
+            compiled = get_compiled_serializer(serializer)
+            if compiled:
+                # render value tuples with the generated row function
+                data = compiled.values(data)
+            else:
+                # only fetch the columns the response serializer renders
+                data = project_queryset(data, serializer)
             paginator = CustomPagination()
             paginated_queryset = paginator.paginate_queryset(data, request, view=view)
             response_data = paginator.get_paginated_response(
-                paginated_queryset, serializer, request
+                paginated_queryset, compiled or serializer, request
             )
 
         if not isinstance(data, QuerySet) and serializer:
@@ -57,3 +77,58 @@ class ResponseHandler:
             "errors": errors,
         }
         return Response(response, status_code)
+
+    @staticmethod
+    def render(response):
+        """
+        Render a response built outside of a DRF view (e.g. in a middleware).
+
+        :param response: Response returned by `success` or `error`.
+        :return: The rendered response.
+        """
+        response.accepted_renderer = ORJSONRenderer()
+        response.accepted_media_type = "application/json"
+        response.renderer_context = {}
+        response.render()
+        return response
+
+    @staticmethod
+    def stream(
+        data,
+        serializer,
+        export_format="ndjson",
+        filename="export",
+        request=None,
+        chunk_size=EXPORT_CHUNK_SIZE,
+    ):
+        """
+        Return a streaming export of a queryset.
+
+        Rows are fetched with `queryset.iterator(chunk_size=...)` and encoded chunk by
+        chunk, so memory stays flat regardless of the table size.
+
+        :param data: QuerySet to export.
+        :param serializer: Serializer class rendering each row.
+        :param export_format: `ndjson` or `csv`.
+        :param filename: Attachment name, without extension.
+        :param chunk_size: Rows fetched and encoded per chunk.
+        :return: StreamingHttpResponse object.
+        """
+        rows = serialize_rows(data, serializer, chunk_size, {"request": request})
+        if export_format == "csv":
+            fieldnames = [
+                name
+                for name, field in serializer().fields.items()
+                if not field.write_only
+            ]
+            content = csv_chunks(rows, fieldnames, chunk_size)
+        else:
+            content = ndjson_chunks(rows, chunk_size)
+
+        response = StreamingHttpResponse(
+            content, content_type=EXPORT_FORMATS[export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{export_format}"'
+        )
+        return response
@@ -1,6 +1,21 @@
-from django.core.mail import send_mail
-from django.conf import settings
-from celery import shared_task
+import logging
+
+from base.utils.email_dispatcher import build_message, email_dispatcher
+from base.utils.outbox import outbox_handler
+from base.utils.tasks import (
+    QUEUE_DEFAULT,
+    QUEUE_OTP,
+    QUEUE_WELCOME,
+    enqueue,
+    priority_task,
+    retry_countdown,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EmailDeliveryError(Exception):
+    """Raised by the email tasks when the mail server did not take a message, so they are retried."""
 
 
 class EmailService:
@@ -9,7 +24,7 @@ class EmailService:
     @staticmethod
     def send_email(to_email, subject, message, html_message=None):
         """
-        Send an email to a user.
+        Queue an email to a user, sent with the next batch of the email dispatcher.
 
         Args:
             to_email (str): Recipient email address
@@ -18,20 +33,13 @@ class EmailService:
             html_message (str, optional): HTML formatted message content
 
         Returns:
-            bool: True if email was sent successfully, False otherwise
+            bool: True if email was queued successfully, False otherwise
         """
         try:
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[to_email],
-                html_message=html_message,
-                fail_silently=False,
-            )
+            email_dispatcher.send_mail(to_email, subject, message, html_message)
             return True
         except Exception as e:
-            # Log the error here if needed
+            logger.error(f"EmailError: {str(e)}")
             return False
 
     @staticmethod
@@ -60,13 +68,43 @@ class EmailService:
         The Team
         """
 
-        return EmailService.send_email(user.email, subject, message)
+        return EmailService.queue_otp_email(user.email, subject, message)
 
     @staticmethod
-    @shared_task
+    def queue_otp_email(to_email, subject, message):
+        """
+        Queue a one time code email on the OTP queue.
+
+        Returns:
+            bool: True if the email was queued (sent, when eager), False otherwise
+        """
+        try:
+            enqueue(EmailService.send_otp_email, to_email, subject, message)
+            return True
+        except Exception as e:
+            logger.error(f"EmailError: {str(e)}")
+            return False
+
+    @staticmethod
+    def deliver(to_email, subject, message, html_message=None):
+        """
+        Send an email now, over the email dispatcher's shared connection.
+
+        Raises:
+            EmailDeliveryError: When the mail server did not take it.
+        """
+        sent = email_dispatcher.send_messages(
+            [build_message(to_email, subject, message, html_message)]
+        )
+        if not sent:
+            raise EmailDeliveryError(f"Email to {to_email} was not sent")
+        return True
+
+    @staticmethod
+    @priority_task(QUEUE_DEFAULT, autoretry_for=(EmailDeliveryError, OSError))
     def send_email_async(to_email, subject, message, html_message=None):
         """
-        Celery task to send email asynchronously.
+        Celery task to send email asynchronously, retried with backoff on failure.
 
         Args:
             to_email (str): Recipient email address
@@ -75,21 +113,21 @@ class EmailService:
             html_message (str, optional): HTML formatted message content
 
         Returns:
-            bool: True if email was sent successfully, False otherwise
+            bool: True if email was sent successfully
         """
-        try:
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[to_email],
-                html_message=html_message,
-                fail_silently=False,
-            )
-            return True
-        except Exception as e:
-            # Log the error here if needed
-            return False
+        return EmailService.deliver(to_email, subject, message, html_message)
+
+    @staticmethod
+    @priority_task(QUEUE_OTP, autoretry_for=(EmailDeliveryError, OSError))
+    def send_otp_email(to_email, subject, message):
+        """
+        Celery task sending a one time code (OTP, 2FA, password reset), on the
+        OTP queue so other emails never delay it.
+
+        Returns:
+            bool: True if email was sent successfully
+        """
+        return EmailService.deliver(to_email, subject, message)
 
     @staticmethod
     def send_2fa_code(user, code):
@@ -115,18 +153,15 @@ class EmailService:
         The Team
         """
 
-        return EmailService.send_email_async(user.email, subject, message)
+        return EmailService.queue_otp_email(user.email, subject, message)
 
     @staticmethod
-    def send_registration_success(user):
+    def registration_success_message(user):
         """
-        Send registration success email.
-
-        Args:
-            user: User object containing email and username
+        Build the registration success email of a user.
 
         Returns:
-            bool: True if email was sent successfully, False otherwise
+            tuple: (subject, message)
         """
         subject = "Welcome to Our Platform!"
         message = f"""
@@ -146,5 +181,80 @@ class EmailService:
         Best regards,
         The Team
         """
+        return subject, message
+
+    @staticmethod
+    def send_registration_success(user):
+        """
+        Send registration success email.
+
+        Args:
+            user: User object containing email and username
+
+        Returns:
+            bool: True if email was sent successfully, False otherwise
+        """
+        try:
+            enqueue(EmailService.send_registration_emails, [user.pk])
+            return True
+        except Exception as e:
+            logger.error(f"EmailError: {str(e)}")
+            return False
+
+    @staticmethod
+    @priority_task(QUEUE_WELCOME, bind=True)
+    def send_registration_emails(task, user_ids):
+        """
+        Celery task sending the registration success email of many users at once,
+        in batches over one connection. Only the users of the batches that failed
+        are retried.
+
+        Args:
+            user_ids (list): Ids of the users, loaded with one query
+
+        Returns:
+            int: Number of emails sent
+        """
+        from django.contrib.auth import get_user_model
+
+        users = list(
+            get_user_model()
+            .objects.filter(id__in=user_ids)
+            .only("email", "first_name", "username")
+        )
+        sent = 0
+        failed_ids = []
+        batch_size = email_dispatcher.batch_size
+        for start in range(0, len(users), batch_size):
+            batch = users[start : start + batch_size]
+            messages = [
+                build_message(
+                    user.email, *EmailService.registration_success_message(user)
+                )
+                for user in batch
+            ]
+            batch_sent = email_dispatcher.send_messages(messages)
+            sent += batch_sent
+            if batch_sent < len(batch):
+                failed_ids += [user.pk for user in batch]
+        if failed_ids:
+            error = EmailDeliveryError(f"{len(failed_ids)} emails were not sent")
+            if task.request.is_eager:
+                # not retried inside the request, the outbox keeps the message
+                raise error
+            # raises `exc` once the retries are exhausted
+            task.retry(
+                args=(failed_ids,),
+                countdown=retry_countdown(task.request.retries),
+                exc=error,
+            )
+        return sent
+
 
-        return EmailService.send_email_async(user.email, subject, message)
+@outbox_handler("email.registration")
+def relay_registration_emails(payload):
+    """
+    Outbox handler of the registration emails of newly created users. Run
+    eagerly, emails that were not sent fail the message, which is retried.
+    """
+    enqueue(EmailService.send_registration_emails, payload["user_ids"])
@@ -0,0 +1,28 @@
+from django.conf import settings
+from rest_framework import serializers
+
+BATCH_MAX_OPERATIONS = getattr(settings, "BATCH_MAX_OPERATIONS", 20)
+BATCH_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=BATCH_METHODS)
+    path = serializers.RegexField(r"^/", max_length=2000)
+    body = serializers.JSONField(required=False, default=dict)
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict) and isinstance(data.get("method"), str):
+            data = {**data, "method": data["method"].upper()}
+        return super().to_internal_value(data)
+
+
+class BatchSerializer(serializers.Serializer):
+    atomic = serializers.BooleanField(required=False, default=False)
+    operations = BatchOperationSerializer(many=True, allow_empty=False)
+
+    def validate_operations(self, operations):
+        if len(operations) > BATCH_MAX_OPERATIONS:
+            raise serializers.ValidationError(
+                f"A batch accepts at most {BATCH_MAX_OPERATIONS} operations."
+            )
+        return operations
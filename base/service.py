@@ -1,5 +1,12 @@
+from django.db.models.query import QuerySet
 from rest_framework import status
 from base import data_validator, response_handler
+from base.utils.projection import project_queryset
+from base.utils.sparse_fields import (
+    get_sparse_serializer,
+    parse_sparse_fields,
+    strip_sparse_fields,
+)
 from crequest.middleware import CrequestMiddleware
 
 
@@ -26,10 +33,10 @@ class CRUDService(data_validator.DataValidator):
         """
         current_request = CrequestMiddleware.get_request()
         data = kwargs.get("data")
-        self.validate(data)
-        if self.errors:
-            return None, self.errors, 400
-        kwargs["data"] = self.valid_data
+        valid_data, errors = self.validate(data)
+        if errors:
+            return None, errors, 400
+        kwargs["data"] = valid_data
         kwargs["request"] = current_request
         return self.manager.post(*args, **kwargs)
 
@@ -54,10 +61,10 @@ class CRUDService(data_validator.DataValidator):
         if error:
             return None, error, status.HTTP_404_NOT_FOUND
 
-        self.validate(data, instance, partial=False)
-        if self.errors:
-            return None, self.errors, 400
-        kwargs["data"] = self.valid_data
+        valid_data, errors = self.validate(data, instance, partial=False)
+        if errors:
+            return None, errors, 400
+        kwargs["data"] = valid_data
         kwargs["id"] = instance_id
         kwargs["request"] = current_request
         return self.manager.put(*args, **kwargs)
@@ -83,12 +90,12 @@ class CRUDService(data_validator.DataValidator):
         if error:
             return None, error, status.HTTP_404_NOT_FOUND
 
-        self.validate(data, instance, partial=True)
+        valid_data, errors = self.validate(data, instance, partial=True)
 
-        if self.errors:
-            return None, self.errors, 400
+        if errors:
+            return None, errors, 400
 
-        kwargs["data"] = self.valid_data
+        kwargs["data"] = valid_data
         kwargs["id"] = instance_id
         kwargs["request"] = current_request
         return self.manager.patch(*args, **kwargs)
@@ -120,20 +127,67 @@ class CRUDService(data_validator.DataValidator):
             id  (int, optional): query for a specific resource
             filter_param (dict, optional): Filters for the listing query.
             query_param (dict, optional): Query parameters for the listing query.
+                `fields`/`exclude` select a subset of the response fields.
+            response_serializer (Serializer, optional): Serializer used for the response,
+                trimmed and used to project the queryset when a subset is selected.
 
         Returns:
             tuple: (QuerySet, error, status_code) - The created instance or validation errors.
                                                     Any error return by serializer is 400
         """
-        instance_id = kwargs.get("id")
+        return self.__list(self.manager.get, *args, **kwargs)
+
+    def export(self, *args, **kwargs):
+        """
+        List resources for a streaming export.
+
+        Accepts the same arguments and filters as `get`, but reads through the
+        manager's `export` so the queryset can be iterated in chunks.
+
+        Returns:
+            tuple: (QuerySet, error, status_code) - The queryset to stream or validation errors.
+        """
+        return self.__list(self.manager.export, *args, **kwargs)
+
+    def __list(self, manager_method, *args, **kwargs):
         query_params = kwargs.get("query_params")
+        response_serializer = kwargs.pop("response_serializer", None)
         current_request = CrequestMiddleware.get_request()
+
+        fields, exclude = parse_sparse_fields(query_params)
+        if fields or exclude:
+            serializer, unknown = get_sparse_serializer(
+                response_serializer, fields, exclude
+            )
+            if unknown:
+                return None, self.sparse_fields_error(unknown), 400
+            if serializer is None and response_serializer is not None:
+                return (
+                    None,
+                    "The fields and exclude parameters leave no field to return.",
+                    400,
+                )
+            response_serializer = serializer
+            query_params = kwargs["query_params"] = strip_sparse_fields(query_params)
+
         if query_params:
-            self.validate(query_params)
-            if self.errors:
-                return None, self.errors, 400
+            _, errors = self.validate(query_params)
+            if errors:
+                return None, errors, 400
         kwargs["request"] = current_request
-        return self.manager.get(*args, **kwargs)
+        data, error, status_code = manager_method(*args, **kwargs)
+        if isinstance(data, QuerySet) and (fields or exclude):
+            data = project_queryset(data, response_serializer)
+        return data, error, status_code
+
+    def sparse_fields_error(self, unknown):
+        """Build the error for requested fields the response does not render."""
+        repository = getattr(self.manager, "repository", None)
+        if repository:
+            error = repository.validate_fields(unknown)
+            if error:
+                return error
+        return f"{unknown[0]} field is not available on this resource."
 
 
 class ServiceFactory(CRUDService, response_handler.ResponseHandler):
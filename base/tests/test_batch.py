@@ -0,0 +1,97 @@
+import pytest
+from django.conf import settings
+from django.urls import reverse
+from rest_framework.throttling import BaseThrottle
+
+from usermgmt.views.user import UserAPIView
+
+BATCH_URL = "/api/v1/batch"
+
+
+class DenyThrottle(BaseThrottle):
+    def allow_request(self, request, view):
+        return False
+
+
+def batch(client, *operations, atomic=False):
+    return client.post(
+        BATCH_URL,
+        {
+            "atomic": atomic,
+            "operations": [{"method": m, "path": p, **b} for m, p, b in operations],
+        },
+        format="json",
+    )
+
+
+@pytest.mark.django_db
+class TestBatchAPIView:
+    def test_runs_operations(self, admin_client):
+        response = batch(admin_client, ("GET", "/api/v1/users/", {}))
+
+        assert response.status_code == 200
+        result = response.json()["results"][0]
+        assert result["status"] == 200
+        assert result["body"]["pagination"]["total_items"] == 1
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/v1/auth/login",
+            "/api/v1/auth/verify-otp",
+            "/api/v1/auth/forgot-password",
+            "/api/v1/auth/reset-password",
+        ],
+    )
+    def test_rejects_auth_endpoints(self, admin_client, path):
+        response = batch(
+            admin_client,
+            ("POST", path, {"body": {"username": "user0", "password": "guess"}}),
+        )
+
+        assert response.json()["results"][0]["status"] == 400
+
+    @pytest.mark.parametrize("url_name", sorted(settings.RATE_LIMITS))
+    def test_rejects_rate_limited_endpoints(self, admin_client, url_name):
+        # the rate limits are only applied to the endpoints' own URLs
+        response = batch(admin_client, ("POST", reverse(url_name), {"body": {}}))
+
+        assert response.json()["results"][0]["status"] == 400
+
+    def test_failing_operation_keeps_the_other_results(self, admin_client, monkeypatch):
+        def fail(view, request, id=None):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(UserAPIView, "get", fail)
+
+        response = batch(
+            admin_client,
+            ("GET", "/api/v1/users/", {}),
+            ("POST", "/api/v1/users/", {"body": {}}),
+        )
+
+        assert response.status_code == 200
+        assert [result["status"] for result in response.json()["results"]] == [
+            500,
+            400,
+        ]
+
+    def test_failing_operation_rolls_back_an_atomic_batch(
+        self, admin_client, monkeypatch
+    ):
+        def fail(view, request, id=None):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(UserAPIView, "get", fail)
+
+        response = batch(admin_client, ("GET", "/api/v1/users/", {}), atomic=True)
+
+        assert response.status_code == 400
+        assert response.json()["committed"] is False
+
+    def test_runs_operation_throttles(self, admin_client, monkeypatch):
+        monkeypatch.setattr(UserAPIView, "throttle_classes", [DenyThrottle])
+
+        response = batch(admin_client, ("GET", "/api/v1/users/", {}))
+
+        assert response.json()["results"][0]["status"] == 429
@@ -0,0 +1,24 @@
+from base.utils.bloom import BloomFilter
+
+
+class TestBloomFilter:
+    def test_added_items_are_found(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.001)
+        items = [f"jti-{index}" for index in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+        assert bloom.count == 1000
+
+    def test_false_positive_rate_stays_near_error_rate(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for index in range(1000):
+            bloom.add(f"jti-{index}")
+
+        false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+
+        assert false_positives < 10000 * 0.01 * 3
+
+    def test_empty_filter_contains_nothing(self):
+        assert "jti" not in BloomFilter(capacity=10)
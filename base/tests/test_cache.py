@@ -0,0 +1,93 @@
+import time
+import threading
+import pytest
+from django.core.cache import cache
+
+from account.models import User
+from base import cache as base_cache
+from base.cache import (
+    get_cache_metrics,
+    get_model_versions,
+    get_or_build,
+    get_or_build_entry,
+)
+from base.tests.utils.utils import make_user
+
+
+@pytest.mark.django_db
+class TestModelVersions:
+    def test_version_bumped_on_commit(self, django_capture_on_commit_callbacks):
+        before = get_model_versions([User])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            make_user(1)
+            # readers still see the committed rows, keep their version
+            assert get_model_versions([User]) == before
+
+        assert get_model_versions([User]) != before
+
+
+class TestGetOrBuild:
+    def test_fresh_entry_is_served(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            return len(builds)
+
+        assert get_or_build("key", build, 60, versions=(1,)) == 1
+        assert get_or_build("key", build, 60, versions=(1,)) == 1
+        assert len(builds) == 1
+
+    def test_rebuilt_when_versions_change(self):
+        get_or_build("key", lambda: "old", 60, versions=(1,))
+
+        assert get_or_build("key", lambda: "new", 60, versions=(2,)) == "new"
+
+    def test_stale_entry_is_served_while_another_worker_rebuilds(self, monkeypatch):
+        get_or_build("key", lambda: "old", 60, versions=(1,))
+        monkeypatch.setattr(cache, "add", lambda *args, **kwargs: False)
+
+        entry = get_or_build_entry("key", lambda: "new", 60, versions=(2,))
+
+        assert entry["value"] == "old"
+        assert entry["versions"] == (1,)
+
+    def test_concurrent_misses_build_once(self):
+        started = threading.Event()
+        builds = []
+
+        def build():
+            builds.append(1)
+            started.set()
+            time.sleep(0.2)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(get_or_build("key", build, 60))
+            )
+            for _ in range(4)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == ["value"] * 4
+        assert len(builds) == 1
+
+    def test_none_is_not_cached(self):
+        assert get_or_build("key", lambda: None, 60) is None
+        assert get_or_build("key", lambda: "value", 60) == "value"
+
+    def test_events_are_counted(self, monkeypatch):
+        monkeypatch.setattr(base_cache, "CACHE_METRICS_FLUSH_EVERY", 1)
+        get_or_build("key", lambda: "value", 60, name="test")
+        get_or_build("key", lambda: "value", 60, name="test")
+
+        metrics = get_cache_metrics(["test"])["test"]
+        assert (metrics["miss"], metrics["hit"]) == (1, 1)
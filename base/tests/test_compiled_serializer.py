@@ -0,0 +1,70 @@
+import pytest
+from rest_framework import serializers
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.managers.token import TokenManager
+from account.models import Token, User
+from base.tests.utils.utils import make_user
+from base.utils.compiled_serializer import get_compiled_serializer
+from usermgmt.serializers.user import UserListSerializer
+
+
+class TokenSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Token
+        fields = ["id", "user", "expires_at", "is_blacklisted"]
+
+
+class UpperNameSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ["id", "username"]
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data["username"] = data["username"].upper()
+        return data
+
+
+class NameSerializer(serializers.ModelSerializer):
+    name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ["id", "name"]
+
+    def get_name(self, user):
+        return user.username
+
+
+@pytest.mark.django_db
+class TestCompiledSerializer:
+    def test_same_output_as_drf(self):
+        make_user(1)
+        make_user(2, address="Somewhere")
+        compiled = get_compiled_serializer(UserListSerializer)
+        queryset = User.objects.order_by("id")
+
+        assert compiled.serialize(compiled.values(queryset)) == list(
+            UserListSerializer(queryset, many=True).data
+        )
+
+    def test_related_field_reads_the_foreign_key(self):
+        user = make_user(1)
+        refresh = RefreshToken.for_user(user)
+        TokenManager.create_token(user, refresh, refresh.access_token)
+        compiled = get_compiled_serializer(TokenSerializer)
+
+        assert "user_id" in compiled.columns
+        assert compiled.serialize(compiled.values(Token.objects.all())) == list(
+            TokenSerializer(Token.objects.all(), many=True).data
+        )
+
+    def test_custom_representations_are_not_compiled(self):
+        assert get_compiled_serializer(UpperNameSerializer) is None
+        assert get_compiled_serializer(NameSerializer) is None
+
+    def test_compiled_once_per_class(self):
+        assert get_compiled_serializer(UserListSerializer) is get_compiled_serializer(
+            UserListSerializer
+        )
@@ -0,0 +1,70 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from account.serializers import auth
+from account.views.auth import BaseAuthAPIView, LoginAPIView
+from base.views import BaseAPIView
+from usermgmt.serializers.user import (
+    AddUserSerializer,
+    UserDetailSerializer,
+    UserListSerializer,
+)
+from usermgmt.views.user import UserAPIView
+
+
+def view_for(view_class, request):
+    view = view_class()
+    view.request = request
+    return view
+
+
+class TestDispatchTable:
+    def test_resolved_once_per_view_class(self):
+        assert UserAPIView.dispatch_table is not BaseAPIView.dispatch_table
+        post = UserAPIView.dispatch_table["post"]
+
+        assert post.serializer is AddUserSerializer
+        assert post.service.serializer is AddUserSerializer
+
+    def test_services_are_shared_between_requests(self):
+        factory = APIRequestFactory()
+        first = view_for(UserAPIView, factory.post("/"))
+        second = view_for(UserAPIView, factory.post("/"))
+
+        assert first.get_service() is second.get_service()
+
+    def test_head_uses_the_get_entry(self):
+        view = view_for(UserAPIView, APIRequestFactory().head("/"))
+
+        assert view.get_response_serializer_class(request=view.request) is (
+            UserListSerializer
+        )
+
+    def test_detail_serializer(self):
+        request = APIRequestFactory().get("/")
+        view = view_for(UserAPIView, request)
+
+        assert (
+            view.get_response_serializer_class(request=request, id=1)
+            is UserDetailSerializer
+        )
+
+    def test_keyed_by_url_name(self):
+        request = APIRequestFactory().post("/")
+        view = view_for(LoginAPIView, request)
+
+        assert view.get_serializer_class(request=request, method="login") is (
+            auth.LoginSerializer
+        )
+        assert BaseAuthAPIView.dispatch_table["login"].response_serializer is (
+            auth.LoginResponseSerializer
+        )
+
+    def test_view_without_manager(self):
+        class NoManagerAPIView(BaseAPIView):
+            pass
+
+        view = view_for(NoManagerAPIView, APIRequestFactory().get("/"))
+
+        with pytest.raises(NotImplementedError):
+            view.get_service()
@@ -0,0 +1,86 @@
+import time
+import pytest
+
+from base.send_email import EmailService
+from base.tests.utils.utils import make_user
+from base.utils import email_dispatcher as dispatcher_module
+from base.utils.email_dispatcher import EmailDispatcher, build_message
+
+
+def messages(count):
+    return [
+        build_message(f"user{index}@example.com", "Subject", "Body")
+        for index in range(count)
+    ]
+
+
+class TestEmailDispatcher:
+    def test_sends_batches_over_one_connection(self, mailoutbox):
+        dispatcher = EmailDispatcher(batch_size=2)
+
+        assert dispatcher.send_messages(messages(5)) == 5
+
+        metrics = dispatcher.metrics()
+        assert len(mailoutbox) == 5
+        assert metrics["batches"] == 3
+        assert metrics["connections"] == 1
+
+    def test_reconnects_once_when_the_connection_dropped(self, mailoutbox):
+        dispatcher = EmailDispatcher()
+        dispatcher.send_messages(messages(1))
+
+        def dropped(messages):
+            raise OSError("Connection unexpectedly closed")
+
+        dispatcher._connection.send_messages = dropped
+
+        assert dispatcher.send_messages(messages(1)) == 1
+        assert dispatcher.metrics()["connections"] == 2
+
+    def test_failed_batch_is_counted(self, monkeypatch):
+        class Unreachable:
+            def open(self):
+                raise OSError("Connection refused")
+
+        monkeypatch.setattr(
+            dispatcher_module, "get_connection", lambda **kwargs: Unreachable()
+        )
+        dispatcher = EmailDispatcher()
+
+        assert dispatcher.send_messages(messages(3)) == 0
+        assert dispatcher.metrics()["failed"] == 3
+
+    def test_queued_emails_are_sent_after_the_flush_interval(self, mailoutbox):
+        dispatcher = EmailDispatcher(batch_size=10, flush_interval=0.05)
+        for index in range(3):
+            dispatcher.send_mail(f"user{index}@example.com", "Subject", "Body")
+
+        deadline = time.monotonic() + 5
+        while len(mailoutbox) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert len(mailoutbox) == 3
+        assert dispatcher.metrics()["batches"] == 1
+
+    def test_flush_sends_queued_emails(self, mailoutbox):
+        dispatcher = EmailDispatcher(batch_size=10, flush_interval=60)
+        dispatcher.send_mail("user1@example.com", "Subject", "Body", "<p>Body</p>")
+
+        assert dispatcher.flush() == 1
+        assert mailoutbox[0].alternatives[0][1] == "text/html"
+
+
+@pytest.mark.django_db
+class TestRegistrationEmails:
+    def test_sends_one_email_per_user(self, mailoutbox, monkeypatch):
+        monkeypatch.setattr(dispatcher_module.email_dispatcher, "batch_size", 2)
+        users = [make_user(index) for index in range(3)]
+
+        sent = EmailService.send_registration_emails.apply(
+            args=([user.pk for user in users],)
+        ).get()
+
+        assert sent == 3
+        assert sorted(message.to[0] for message in mailoutbox) == sorted(
+            user.email for user in users
+        )
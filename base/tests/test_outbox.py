@@ -0,0 +1,57 @@
+import pytest
+from django.core import mail
+
+from base.models import OutboxMessage
+from base.tests.utils.utils import make_user
+from base.utils import outbox
+from base.utils.email_dispatcher import email_dispatcher
+from base.utils.outbox import outbox_handler, publish, relay_outbox
+
+
+@pytest.fixture
+def failing_handler():
+    @outbox_handler("test.failing")
+    def handler(payload):
+        raise OSError("connection refused")
+
+    yield
+    outbox._handlers.pop("test.failing")
+
+
+@pytest.mark.django_db
+class TestRelayOutbox:
+    def test_sends_and_deletes(self):
+        user = make_user(1)
+        publish("email.registration", {"user_ids": [user.pk]})
+
+        assert relay_outbox() == (1, 0)
+        assert not OutboxMessage.objects.exists()
+        assert [message.to for message in mail.outbox] == [[user.email]]
+
+    def test_keeps_failed_message(self, failing_handler):
+        publish("test.failing", {})
+
+        assert relay_outbox() == (0, 1)
+        message = OutboxMessage.objects.get()
+        assert message.attempts == 1
+        assert "connection refused" in message.last_error
+
+    def test_keeps_message_of_failed_eager_task(self, monkeypatch):
+        user = make_user(1)
+        publish("email.registration", {"user_ids": [user.pk]})
+        # the mail server takes no message, the eager task fails without retrying
+        monkeypatch.setattr(email_dispatcher, "send_messages", lambda messages: 0)
+
+        assert relay_outbox() == (0, 1)
+        assert OutboxMessage.objects.get().attempts == 1
+
+    def test_relays_on_commit(self, monkeypatch, django_capture_on_commit_callbacks):
+        monkeypatch.setattr(outbox, "OUTBOX_RELAY_ON_COMMIT", True)
+        user = make_user(1)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            publish("email.registration", {"user_ids": [user.pk]})
+            assert not mail.outbox
+
+        assert not OutboxMessage.objects.exists()
+        assert len(mail.outbox) == 1
@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from account.models import User
+from base.paginator_handler import CachedCountPaginator, CustomPagination
+from base.tests.utils.utils import make_user
+
+
+def count(queryset):
+    with CaptureQueriesContext(connection) as queries:
+        total = CachedCountPaginator(queryset, 10).count
+    return total, len(queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCachedCountPaginator:
+    def test_total_is_cached(self):
+        make_user(1)
+        make_user(2)
+
+        assert count(User.objects.all()) == (2, 1)
+        assert count(User.objects.all()) == (2, 0)
+
+    def test_total_is_recounted_after_a_write(self):
+        make_user(1)
+        count(User.objects.all())
+
+        make_user(2)
+
+        assert count(User.objects.all()) == (2, 1)
+
+    def test_filters_are_counted_apart(self):
+        make_user(1)
+        make_user(2, is_mfa_enabled=True)
+
+        assert count(User.objects.all())[0] == 2
+        assert count(User.objects.filter(is_mfa_enabled=True))[0] == 1
+
+    def test_lists_are_counted_without_cache(self):
+        assert CachedCountPaginator([1, 2, 3], 2).count == 3
+
+
+class TestCustomPagination:
+    @pytest.mark.parametrize(
+        "current_page, total_pages, pages",
+        [
+            (1, 3, [1, 2, 3]),
+            (1, 20, [1, 2, 3, "...", 19, 20]),
+            (10, 20, [1, 2, "...", 8, 9, 10, 11, 12, "...", 19, 20]),
+        ],
+    )
+    def test_page_range(self, current_page, total_pages, pages):
+        assert (
+            CustomPagination().calculate_page_range(current_page, total_pages) == pages
+        )
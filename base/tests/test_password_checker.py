@@ -0,0 +1,83 @@
+import random
+import string
+import pytest
+from django.core.management import call_command
+
+from base.constants.password import COMMON_PASSWORDS
+from base.utils.aho_corasick import AhoCorasick
+from base.utils.breached_passwords import BreachedPasswords, password_hash
+from base.utils.password_checker import check_password
+
+
+class TestAhoCorasick:
+    def test_finds_patterns(self):
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+
+        assert automaton.search("ushers") == "she"
+        assert "ahis" in automaton
+        assert "xyz" not in automaton
+
+    def test_matches_substring_scan(self):
+        automaton = AhoCorasick(COMMON_PASSWORDS)
+        chars = string.ascii_lowercase + string.digits
+        rng = random.Random(0)
+        texts = ["".join(rng.choices(chars, k=12)) for _ in range(2000)]
+        texts += [f"x{pattern}y" for pattern in COMMON_PASSWORDS[:50]]
+
+        for text in texts:
+            expected = any(pattern in text for pattern in COMMON_PASSWORDS)
+            assert (text in automaton) == expected, text
+
+
+class TestCheckPassword:
+    def test_valid(self):
+        assert check_password("Kx9#mQv2!zRt") == (True, [])
+
+    def test_common_pattern(self):
+        valid, errors = check_password("Kx9#Password!zRt")
+
+        assert not valid
+        assert errors == ["Password contains common patterns that are not allowed"]
+
+
+@pytest.fixture
+def breached_file(tmp_path):
+    source = tmp_path / "passwords.txt"
+    source.write_text("Kx9#mQv2!zRt\nTr0ub4dor&3xx\n")
+    output = tmp_path / "breached.txt"
+    call_command("build_breached_passwords", str(source), output=str(output))
+    return output
+
+
+class TestBreachedPasswords:
+    def test_file_is_sorted_hashes(self, breached_file):
+        lines = breached_file.read_text().split()
+
+        assert lines == sorted(
+            [password_hash("Kx9#mQv2!zRt"), password_hash("Tr0ub4dor&3xx")]
+        )
+
+    @pytest.mark.parametrize("mode", ["mmap", "bloom"])
+    def test_lookup(self, breached_file, mode):
+        breached = BreachedPasswords(str(breached_file), mode)
+
+        assert "Kx9#mQv2!zRt" in breached
+        assert "Tr0ub4dor&3xx" in breached
+        assert "Zq7$wLp4@nVb" not in breached
+
+    def test_disabled_without_file(self):
+        assert "Kx9#mQv2!zRt" not in BreachedPasswords(None)
+
+    def test_rejected_by_check_password(self, breached_file, monkeypatch):
+        from base.utils import password_checker
+
+        monkeypatch.setattr(
+            password_checker,
+            "breached_passwords",
+            BreachedPasswords(str(breached_file)),
+        )
+
+        assert check_password("Kx9#mQv2!zRt") == (
+            False,
+            ["Password has appeared in a data breach and is not allowed"],
+        )
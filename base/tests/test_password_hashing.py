@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import pytest
+from django.contrib.auth.hashers import check_password
+
+from base.utils.password_hashing import PasswordHasherPool, PasswordHashingBusy
+
+
+class TestPasswordHasherPool:
+    def test_make_password(self):
+        pool = PasswordHasherPool(workers=2, queue_size=4)
+
+        encoded = pool.make_password("Str0ng!Passw0rd#")
+
+        assert check_password("Str0ng!Passw0rd#", encoded)
+        assert pool.metrics()["completed"] == 1
+
+    def test_async_make_password(self):
+        pool = PasswordHasherPool(workers=2, queue_size=4)
+
+        encoded = asyncio.run(pool.amake_password("Str0ng!Passw0rd#"))
+
+        assert check_password("Str0ng!Passw0rd#", encoded)
+
+    def test_refuses_hashes_beyond_the_queue(self):
+        pool = PasswordHasherPool(workers=1, queue_size=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        running = pool.submit(block)
+        started.wait(5)
+        queued = pool.submit(lambda: None)
+        try:
+            with pytest.raises(PasswordHashingBusy):
+                pool.submit(lambda: None)
+        finally:
+            release.set()
+        running.result(5)
+        queued.result(5)
+
+        metrics = pool.metrics()
+        assert metrics["rejected"] == 1
+        assert metrics["max_queued"] == 1
+        assert metrics["queued"] == 0
+        assert metrics["completed"] == 2
@@ -0,0 +1,66 @@
+from rest_framework import serializers
+
+from account.models import Token, User
+from base.utils.projection import get_serializer_projection, project_queryset
+from usermgmt.serializers.user import UserListSerializer
+
+
+class TokenUserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ["id", "username"]
+
+
+class TokenSerializer(serializers.ModelSerializer):
+    user = TokenUserSerializer()
+
+    class Meta:
+        model = Token
+        fields = ["id", "expires_at", "user"]
+
+
+class NameSerializer(serializers.ModelSerializer):
+    name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ["id", "name"]
+
+    def get_name(self, user):
+        return user.username
+
+
+class TestSerializerProjection:
+    def test_columns_of_the_rendered_fields(self):
+        only_fields, select_related = get_serializer_projection(UserListSerializer)
+
+        assert set(only_fields) == set(UserListSerializer.Meta.fields)
+        assert select_related == ()
+
+    def test_nested_serializer_is_selected(self):
+        only_fields, select_related = get_serializer_projection(TokenSerializer)
+
+        assert select_related == ("user",)
+        assert {"user__id", "user__username", "expires_at"} <= set(only_fields)
+
+    def test_method_fields_are_not_projected(self):
+        assert get_serializer_projection(NameSerializer) is None
+
+
+class TestProjectQueryset:
+    def test_unrendered_columns_are_deferred(self):
+        queryset = project_queryset(User.objects.all(), UserListSerializer)
+
+        assert queryset.query.deferred_loading[1] is False
+        assert "address" not in queryset.query.deferred_loading[0]
+        assert "username" in queryset.query.deferred_loading[0]
+
+    def test_existing_projection_is_kept(self):
+        queryset = User.objects.only("id")
+
+        assert project_queryset(queryset, UserListSerializer) is queryset
+
+    def test_other_models_are_not_projected(self):
+        queryset = Token.objects.all()
+
+        assert project_queryset(queryset, UserListSerializer) is queryset
@@ -0,0 +1,28 @@
+import pytest
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from base.renderers import ORJSONRenderer
+
+
+class TagsSerializer(serializers.Serializer):
+    tags = serializers.ListField(child=serializers.IntegerField())
+
+
+class TestORJSONRenderer:
+    def test_renders_list_field_errors(self):
+        serializer = TagsSerializer(data={"tags": [1, "a"]})
+        assert not serializer.is_valid()
+        # the errors of a ListField are keyed by item index
+        assert 1 in serializer.errors["tags"]
+
+        rendered = ORJSONRenderer().render(serializer.errors)
+
+        assert rendered == JSONRenderer().render(serializer.errors)
+
+    @pytest.mark.parametrize(
+        "data",
+        [{"a": 1, "b": [1, 2]}, {1: "one", 2: {3: "three"}}, {"text": " "}],
+    )
+    def test_matches_drf_renderer(self, data):
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
@@ -0,0 +1,40 @@
+import pytest
+from kombu.exceptions import OperationalError
+
+from base.send_email import EmailService
+from base.tests.utils.utils import make_user
+from base.utils.email_dispatcher import email_dispatcher
+
+
+@pytest.mark.django_db
+class TestOTPEmails:
+    def test_sent(self, mailoutbox):
+        user = make_user(1)
+
+        assert EmailService.send_2fa_code(user, "123456")
+        assert "123456" in mailoutbox[0].body
+
+    def test_broker_down(self, monkeypatch):
+        def unreachable(*args, **kwargs):
+            raise OperationalError("Error 111 connecting to redis:6379")
+
+        monkeypatch.setattr(EmailService.send_otp_email, "delay", unreachable)
+
+        assert not EmailService.send_password_reset_email(make_user(1), "123456")
+
+    def test_failed_eager_task_is_not_retried(self, monkeypatch):
+        attempts = []
+
+        def refused(messages):
+            attempts.append(messages)
+            return 0
+
+        monkeypatch.setattr(email_dispatcher, "send_messages", refused)
+
+        assert not EmailService.send_2fa_code(make_user(1), "123456")
+        assert len(attempts) == 1
+
+    def test_registration_email_failure(self, monkeypatch):
+        monkeypatch.setattr(email_dispatcher, "send_messages", lambda messages: 0)
+
+        assert not EmailService.send_registration_success(make_user(1))
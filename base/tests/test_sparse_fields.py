@@ -0,0 +1,73 @@
+import pytest
+from django.http import QueryDict
+
+from base.utils.sparse_fields import (
+    get_sparse_serializer,
+    parse_sparse_fields,
+    strip_sparse_fields,
+)
+from usermgmt.serializers.user import UserListSerializer
+
+USERS_URL = "/api/v1/users/"
+
+
+class TestSparseFields:
+    def test_parse(self):
+        query_params = QueryDict("fields=id,email&fields=role&exclude= id ")
+
+        assert parse_sparse_fields(query_params) == (("email", "id", "role"), ("id",))
+
+    def test_strip(self):
+        query_params = QueryDict("fields=id&exclude=email&page=2")
+
+        assert dict(strip_sparse_fields(query_params)) == {"page": ["2"]}
+
+    def test_trimmed_serializer_is_reused(self):
+        trimmed, unknown = get_sparse_serializer(
+            UserListSerializer, ("email", "id"), ()
+        )
+
+        assert unknown == ()
+        assert set(trimmed().fields) == {"email", "id"}
+        assert get_sparse_serializer(UserListSerializer, ("email", "id"), ()) == (
+            trimmed,
+            (),
+        )
+
+    def test_exclude(self):
+        trimmed, _ = get_sparse_serializer(UserListSerializer, (), ("created",))
+
+        assert set(trimmed().fields) == set(UserListSerializer.Meta.fields) - {
+            "created"
+        }
+
+    def test_unknown_fields(self):
+        assert get_sparse_serializer(UserListSerializer, ("password",), ()) == (
+            None,
+            ("password",),
+        )
+
+    def test_no_field_left(self):
+        assert get_sparse_serializer(UserListSerializer, ("id",), ("id",)) == (
+            None,
+            (),
+        )
+
+
+@pytest.mark.django_db
+class TestSparseFieldsEndpoint:
+    def test_only_requested_fields_are_rendered(self, admin_client):
+        response = admin_client.get(USERS_URL, {"fields": "id,email"})
+
+        assert response.status_code == 200
+        assert [set(row) for row in response.json()["results"]] == [{"id", "email"}]
+
+    def test_unknown_field_is_rejected(self, admin_client):
+        response = admin_client.get(USERS_URL, {"fields": "id,nickname"})
+
+        assert response.status_code == 400
+
+    def test_empty_field_set_is_rejected(self, admin_client):
+        response = admin_client.get(USERS_URL, {"fields": "id", "exclude": "id"})
+
+        assert response.status_code == 400
@@ -0,0 +1,35 @@
+import pytest
+from django.core.management import call_command
+
+from base.management.commands import run_worker
+from base.send_email import EmailService
+from base.utils.tasks import route_task
+
+
+class TestRouteTask:
+    @pytest.mark.parametrize(
+        "name, queue",
+        [
+            (EmailService.send_otp_email.name, "otp"),
+            (EmailService.send_registration_emails.name, "welcome"),
+            (EmailService.send_email_async.name, "default"),
+            ("ambulance_mgmt.tasks.notify_crew", "dispatch"),
+        ],
+    )
+    def test_routes_to_priority_queue(self, name, queue):
+        assert route_task(name, (), {}, {}) == {"queue": queue}
+
+    def test_unknown_task_uses_default_queue(self):
+        assert route_task("other.task", (), {}, {}) is None
+
+
+class TestRunWorker:
+    def test_consumes_one_queue(self, monkeypatch):
+        argv = []
+        monkeypatch.setattr(run_worker.celery_app, "worker_main", argv.extend)
+
+        call_command("run_worker", "otp")
+
+        assert argv[argv.index("--queues") + 1] == "otp"
+        assert argv[argv.index("--concurrency") + 1] == "4"
+        assert argv[argv.index("--prefetch-multiplier") + 1] == "1"
@@ -0,0 +1,116 @@
+import threading
+import pytest
+from django.db import IntegrityError, connection
+
+from account.models import User
+from base.tests.utils.utils import make_user
+from base.utils import unique_values
+from base.utils.unique_values import create_with_unique_value, next_unique_values
+
+
+@pytest.mark.django_db
+class TestNextUniqueValues:
+    def test_bare_prefix_first(self):
+        assert next_unique_values(
+            User.objects.all(), "username", "jdoe", 2, bare=True
+        ) == [
+            "jdoe",
+            "jdoe1",
+        ]
+
+    def test_numeric_order(self):
+        for index, username in enumerate(("jdoe", "jdoe2", "jdoe9", "jdoe10", "jdoex")):
+            make_user(index, username=username)
+
+        assert next_unique_values(User.objects.all(), "username", "jdoe", 2) == [
+            "jdoe11",
+            "jdoe12",
+        ]
+
+    def test_padded(self):
+        make_user(1, username="AMB009")
+
+        assert next_unique_values(
+            User.objects.all(), "username", "AMB", 1, width=3
+        ) == ["AMB010"]
+
+
+@pytest.mark.django_db
+class TestCreateWithUniqueValue:
+    def test_retries_with_next_suffix(self, monkeypatch):
+        picked = []
+        next_unique_value = unique_values.next_unique_value
+
+        def race(*args, **kwargs):
+            value = next_unique_value(*args, **kwargs)
+            if not picked:
+                # another request inserts the same value before this one does
+                make_user(99, username=value)
+            picked.append(value)
+            return value
+
+        monkeypatch.setattr(unique_values, "next_unique_value", race)
+        user = create_with_unique_value(
+            User.objects.all(),
+            "username",
+            "jdoe",
+            lambda username: make_user(1, username=username),
+            bare=True,
+        )
+
+        assert picked == ["jdoe", "jdoe1"]
+        assert user.username == "jdoe1"
+
+    def test_other_conflicts_are_raised(self):
+        make_user(1, username="other")
+
+        with pytest.raises(IntegrityError):
+            create_with_unique_value(
+                User.objects.all(),
+                "username",
+                "jdoe",
+                # same email and phone number as the existing user
+                lambda username: make_user(1, username=username),
+                bare=True,
+            )
+        assert not User.objects.filter(username__startswith="jdoe").exists()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentCreates:
+    def test_concurrent_creates_get_distinct_values(self, settings):
+        # fast hashes, every conflict hashes the password again
+        settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+        count = 8
+        barrier = threading.Barrier(count)
+        created = []
+        errors = []
+
+        def create(index):
+            try:
+                barrier.wait(5)
+                user = create_with_unique_value(
+                    User.objects.all(),
+                    "username",
+                    "jdoe",
+                    lambda username: make_user(index, username=username),
+                    bare=True,
+                    attempts=count,
+                )
+                created.append(user.username)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=create, args=(index,)) for index in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        assert errors == []
+        assert len(set(created)) == count
+        assert set(User.objects.values_list("username", flat=True)) == set(created)
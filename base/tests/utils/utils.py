@@ -46,3 +46,21 @@ def manager_operator(db):
         return instance, error, status_code  # Return the created instance
 
     return _season
+
+
+def make_user(index, **fields):
+    """Create a user with unique username, email and phone number derived from `index`."""
+    from account.models import User
+
+    data = {
+        "username": f"user{index}",
+        "first_name": "Test",
+        "last_name": f"User{index}",
+        "email": f"user{index}@example.com",
+        "phone_number": f"0800000{index:04d}",
+        "emergency_first_name": "Next",
+        "emergency_last_name": "Kin",
+        "emergency_phone_number": "08099999999",
+        **fields,
+    }
+    return User.objects.create_user(password="Str0ng!Passw0rd#", **data)
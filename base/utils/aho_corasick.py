@@ -0,0 +1,68 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton finding which of many patterns occur in a text.
+
+    Built once from the patterns, then each search reads the text a single time,
+    whatever the number of patterns, instead of one substring scan per pattern.
+    """
+
+    def __init__(self, patterns):
+        # state -> {char: next state}, failure link and longest pattern ending there
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._link()
+
+    def _add(self, pattern):
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+            state = next_state
+        self.output[state] = pattern
+
+    def _link(self):
+        # breadth first, so the failure state of a node is linked before it
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[next_state] = self.goto[fail].get(char, 0)
+                if self.output[next_state] is None:
+                    # a pattern ending in the failure state also ends here
+                    self.output[next_state] = self.output[self.fail[next_state]]
+
+    def search(self, text):
+        """
+        Return the first pattern found in `text`, or None.
+
+        The pattern returned is the longest one ending where the first match ends.
+        """
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] is not None:
+                return output[state]
+        return None
+
+    def __contains__(self, text):
+        """Whether any pattern occurs in `text`."""
+        return self.search(text) is not None
@@ -0,0 +1,40 @@
+import math
+import hashlib
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter of strings.
+
+    Answers "definitely not added" or "maybe added", with a false positive rate of
+    about `error_rate` while it holds at most `capacity` items. Items cannot be
+    removed, rebuild the filter to drop them.
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first + index * second) % self.size for index in range(self.hash_count)
+        )
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
@@ -0,0 +1,120 @@
+import os
+import mmap
+import hashlib
+import logging
+import threading
+from django.conf import settings
+
+from base.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+# Sorted file of upper case SHA-1 hashes, one per line, optionally followed by
+# `:count` (the Pwned Passwords format). Disabled when unset.
+BREACHED_PASSWORDS_FILE = getattr(settings, "BREACHED_PASSWORDS_FILE", None)
+# "mmap" binary searches the file in place, "bloom" loads it into a Bloom filter
+BREACHED_PASSWORDS_MODE = getattr(settings, "BREACHED_PASSWORDS_MODE", "mmap")
+BREACHED_PASSWORDS_ERROR_RATE = getattr(
+    settings, "BREACHED_PASSWORDS_ERROR_RATE", 0.001
+)
+
+HASH_LENGTH = 40
+
+
+def password_hash(password):
+    return hashlib.sha1(password.encode()).hexdigest().upper()
+
+
+class SortedHashFile:
+    """
+    Memory-mapped sorted hash file, looked up by binary search.
+
+    The file is never read into memory: a lookup touches about log2(lines) pages,
+    which the OS caches and shares between worker processes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.size = os.fstat(file.fileno()).st_size
+            self.map = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                if self.size
+                else b""
+            )
+
+    def _line_at(self, position):
+        # hash of the line containing `position`, and where the next line starts
+        start = self.map.rfind(b"\n", 0, position) + 1
+        end = self.map.find(b"\n", position)
+        if end == -1:
+            end = self.size
+        return self.map[start : start + HASH_LENGTH], end + 1
+
+    def __contains__(self, digest):
+        digest = digest.encode()
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            line, next_line = self._line_at(middle)
+            if line == digest:
+                return True
+            if line < digest:
+                low = next_line
+            else:
+                high = self.map.rfind(b"\n", 0, middle) + 1
+        return False
+
+    def __iter__(self):
+        position = 0
+        while position < self.size:
+            line, position = self._line_at(position)
+            if line.strip():
+                yield line.decode()
+
+
+class BreachedPasswords:
+    """
+    Lookup of passwords in the external breached-password list.
+
+    Opened on first use, once per process. Passwords are looked up by SHA-1, so
+    the list can be a Pwned Passwords download or one built with
+    `build_breached_passwords`.
+    """
+
+    def __init__(self, path=BREACHED_PASSWORDS_FILE, mode=BREACHED_PASSWORDS_MODE):
+        self.path = path
+        self.mode = mode
+        self._hashes = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        hashes = SortedHashFile(self.path)
+        if self.mode != "bloom":
+            return hashes
+        # every line holds at least a hash and a newline
+        bloom = BloomFilter(
+            hashes.size // (HASH_LENGTH + 1), BREACHED_PASSWORDS_ERROR_RATE
+        )
+        for digest in hashes:
+            bloom.add(digest)
+        return bloom
+
+    def get_hashes(self):
+        if self._hashes is None:
+            with self._lock:
+                if self._hashes is None:
+                    self._hashes = self.load()
+        return self._hashes
+
+    def __contains__(self, password):
+        if not self.path:
+            return False
+        try:
+            return password_hash(password) in self.get_hashes()
+        except OSError as e:
+            logger.error(f"BreachedPasswordsError: {str(e)}")
+            return False
+
+
+breached_passwords = BreachedPasswords()
@@ -0,0 +1,163 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+COMPILED_SERIALIZERS = getattr(settings, "COMPILED_SERIALIZERS", True)
+
+# Field classes whose to_representation is safe to call on the raw column value.
+# Exact classes only, subclasses may override to_representation.
+SUPPORTED_FIELDS = (
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.SlugField,
+    serializers.URLField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.FloatField,
+    serializers.BooleanField,
+    serializers.DecimalField,
+    serializers.DateTimeField,
+    serializers.DateField,
+    serializers.TimeField,
+    serializers.UUIDField,
+    serializers.ReadOnlyField,
+)
+
+# Model columns whose database value already equals the serializer output of the
+# matching serializer field, the conversion call can be skipped.
+IDENTITY_COLUMNS = {
+    serializers.CharField: ("CharField", "TextField", "EmailField", "SlugField"),
+    serializers.EmailField: ("CharField", "EmailField"),
+    serializers.IntegerField: (
+        "AutoField",
+        "BigAutoField",
+        "SmallAutoField",
+        "IntegerField",
+        "BigIntegerField",
+        "SmallIntegerField",
+        "PositiveIntegerField",
+        "PositiveBigIntegerField",
+        "PositiveSmallIntegerField",
+    ),
+}
+
+# serializer class -> CompiledSerializer or None when it cannot be compiled
+_compiled = {}
+MAX_CACHED_SERIALIZERS = 1024
+
+
+class CompiledSerializer:
+    """
+    Generated row serializer for a read-only `ModelSerializer`.
+
+    Reads `values_list()` tuples instead of model instances and renders them with a
+    function generated for the serializer class, producing the same output as
+    `serializer(instances, many=True).data` without building model instances or
+    dispatching through every field per row.
+    """
+
+    def __init__(self, serializer, columns, serialize_row):
+        self.serializer = serializer
+        self.columns = columns
+        self.serialize_row = serialize_row
+
+    def values(self, queryset):
+        """Return `queryset` as the value tuples the row function reads."""
+        return queryset.values_list(*self.columns)
+
+    def serialize(self, rows):
+        """Render value tuples to a list of dicts."""
+        serialize_row = self.serialize_row
+        return [serialize_row(row) for row in rows]
+
+
+def _column_for(model, field):
+    """
+    Return (column, identity) for a serializer field, or None if it is not a column.
+
+    `column` is the `values_list()` name to read and `identity` tells whether the
+    value can be emitted without calling the field's `to_representation`.
+    """
+    if "." in field.source or field.source == "*":
+        return None
+    try:
+        model_field = model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        return None
+
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if not (model_field.many_to_one or model_field.one_to_one):
+            return None
+        if not model_field.concrete or field.pk_field is not None:
+            return None
+        # pk only optimization: the representation is the raw foreign key value
+        return model_field.attname, True
+
+    if type(field) not in SUPPORTED_FIELDS or model_field.is_relation:
+        return None
+    if not model_field.concrete:
+        return None
+    identity = model_field.get_internal_type() in IDENTITY_COLUMNS.get(type(field), ())
+    return model_field.attname, identity
+
+
+def _compile(serializer):
+    meta = getattr(serializer, "Meta", None)
+    if meta is None or not issubclass(serializer, serializers.ModelSerializer):
+        return None
+    # custom representations must go through DRF
+    if serializer.to_representation is not serializers.Serializer.to_representation:
+        return None
+
+    model = meta.model
+    instance = serializer()
+    columns = []
+    namespace = {}
+    items = []
+    for field in instance._readable_fields:
+        resolved = _column_for(model, field)
+        if resolved is None:
+            return None
+        column, identity = resolved
+        index = len(columns)
+        columns.append(column)
+        if identity:
+            items.append(f"{field.field_name!r}: row[{index}]")
+        else:
+            converter = f"convert_{index}"
+            namespace[converter] = field.to_representation
+            items.append(
+                f"{field.field_name!r}: None if row[{index}] is None "
+                f"else {converter}(row[{index}])"
+            )
+
+    source = "def serialize_row(row):\n    return {" + ", ".join(items) + "}\n"
+    code = compile(source, f"<compiled {serializer.__qualname__}>", "exec")
+    exec(code, namespace)
+    return CompiledSerializer(serializer, tuple(columns), namespace["serialize_row"])
+
+
+def get_compiled_serializer(serializer):
+    """
+    Return the compiled form of `serializer`, built once per serializer class.
+
+    Only serializers whose readable fields all map to plain model columns through
+    the field classes in `SUPPORTED_FIELDS` (or pk-only related fields) compile;
+    nested serializers, method fields, dotted sources and overridden
+    `to_representation` fall back to DRF.
+
+    Args:
+        serializer: Response serializer class.
+
+    Returns:
+        CompiledSerializer: The compiled serializer, or None if it cannot be compiled.
+    """
+    if not COMPILED_SERIALIZERS or serializer is None:
+        return None
+    if serializer in _compiled:
+        return _compiled[serializer]
+
+    compiled = _compile(serializer)
+    if len(_compiled) < MAX_CACHED_SERIALIZERS:
+        _compiled[serializer] = compiled
+    return compiled
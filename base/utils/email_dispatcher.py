@@ -0,0 +1,203 @@
+import os
+import time
+import atexit
+import logging
+import threading
+from collections import deque
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+logger = logging.getLogger(__name__)
+
+# Messages sent over one connection at a time
+EMAIL_BATCH_SIZE = getattr(settings, "EMAIL_BATCH_SIZE", 50)
+# Seconds a queued message waits at most for its batch to fill up
+EMAIL_FLUSH_INTERVAL = getattr(settings, "EMAIL_FLUSH_INTERVAL", 0.5)
+# Seconds an idle connection is kept open before it is closed
+EMAIL_CONNECTION_IDLE_TIMEOUT = getattr(settings, "EMAIL_CONNECTION_IDLE_TIMEOUT", 30)
+
+
+def build_message(to_email, subject, message, html_message=None):
+    """Build the email `send_mail` would send, from `DEFAULT_FROM_EMAIL`."""
+    email = EmailMultiAlternatives(
+        subject, message, settings.DEFAULT_FROM_EMAIL, [to_email]
+    )
+    if html_message:
+        email.attach_alternative(html_message, "text/html")
+    return email
+
+
+class EmailDispatcher:
+    """
+    Batches outgoing emails over a persistent connection.
+
+    Queued messages are sent by a background thread, in batches of at most
+    `batch_size` through one `send_messages` call, as soon as a batch is full or
+    `flush_interval` seconds after the first message of the batch was queued.
+    The connection stays open between batches and is closed after
+    `idle_timeout` idle seconds, so a burst of emails costs one SMTP handshake
+    instead of one per message. A batch that fails is retried once on a new
+    connection.
+
+    One thread per process, started on first use (again after a fork).
+    """
+
+    def __init__(
+        self,
+        batch_size=EMAIL_BATCH_SIZE,
+        flush_interval=EMAIL_FLUSH_INTERVAL,
+        idle_timeout=EMAIL_CONNECTION_IDLE_TIMEOUT,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.idle_timeout = idle_timeout
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._connection = None
+        self._last_sent = 0.0
+        self._pid = None
+        self._metrics = {
+            "queued": 0,
+            "sent": 0,
+            "failed": 0,
+            "batches": 0,
+            "connections": 0,
+            "send_seconds": 0.0,
+        }
+
+    def _start(self):
+        with self._condition:
+            if self._pid == os.getpid():
+                return
+            # the parent's connection and queue belong to the parent
+            self._pid = os.getpid()
+            self._queue.clear()
+            self._connection = None
+            threading.Thread(
+                target=self._run, name="email-dispatcher", daemon=True
+            ).start()
+
+    def enqueue(self, message):
+        """Queue an `EmailMessage` for the next batch."""
+        if self._pid != os.getpid():
+            self._start()
+        with self._condition:
+            self._queue.append((time.monotonic(), message))
+            self._metrics["queued"] += 1
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify()
+
+    def send_mail(self, to_email, subject, message, html_message=None):
+        """Queue an email built like `send_mail` would build it."""
+        self.enqueue(build_message(to_email, subject, message, html_message))
+
+    def send_messages(self, messages):
+        """
+        Send `messages` now, in batches over the shared connection.
+
+        Returns:
+            int: Number of messages sent.
+        """
+        sent = 0
+        for start in range(0, len(messages), self.batch_size):
+            sent += self._send_batch(messages[start : start + self.batch_size])
+        return sent
+
+    def _take_batch(self):
+        with self._condition:
+            while True:
+                if self._queue:
+                    wait = self._queue[0][0] + self.flush_interval - time.monotonic()
+                    if len(self._queue) >= self.batch_size or wait <= 0:
+                        count = min(len(self._queue), self.batch_size)
+                        return [self._queue.popleft()[1] for _ in range(count)]
+                else:
+                    wait = self.idle_timeout
+                if not self._condition.wait(wait) and not self._queue:
+                    self._close_idle()
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            try:
+                self._send_batch(batch)
+            except Exception as e:
+                logger.error(f"EmailError: {str(e)}")
+
+    def flush(self):
+        """Send every queued message now."""
+        with self._condition:
+            messages = [message for _, message in self._queue]
+            self._queue.clear()
+        return self.send_messages(messages)
+
+    def close(self):
+        """Close the shared connection, the next batch opens a new one."""
+        with self._send_lock:
+            self._close()
+
+    def _get_connection(self):
+        if self._connection is None:
+            self._connection = get_connection(fail_silently=False)
+            self._connection.open()
+            self._metrics["connections"] += 1
+        return self._connection
+
+    def _close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def _close_idle(self):
+        with self._send_lock:
+            if time.monotonic() - self._last_sent >= self.idle_timeout:
+                self._close()
+
+    def _send_batch(self, messages):
+        if not messages:
+            return 0
+        with self._send_lock:
+            started_at = time.perf_counter()
+            sent = 0
+            for attempt in range(2):
+                try:
+                    sent = self._get_connection().send_messages(messages) or 0
+                    break
+                except Exception as e:
+                    # the server may have dropped the idle connection, reconnect once
+                    self._close()
+                    if attempt:
+                        logger.error(f"EmailError: {str(e)}")
+            self._last_sent = time.monotonic()
+            self._metrics["batches"] += 1
+            self._metrics["sent"] += sent
+            self._metrics["failed"] += len(messages) - sent
+            self._metrics["send_seconds"] += time.perf_counter() - started_at
+            return sent
+
+    def metrics(self):
+        """
+        Return the dispatcher metrics of this process.
+
+        Returns:
+            dict: Counters (queued, sent, failed, batches, connections opened), the
+                  messages still queued, average batch size and send throughput.
+        """
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics["pending"] = len(self._queue)
+        send_seconds = metrics.pop("send_seconds")
+        metrics["avg_batch_size"] = metrics["sent"] / (metrics["batches"] or 1)
+        metrics["messages_per_second"] = (
+            metrics["sent"] / send_seconds if send_seconds else 0.0
+        )
+        return metrics
+
+
+email_dispatcher = EmailDispatcher()
+# send what is still queued when the process exits
+atexit.register(lambda: email_dispatcher.flush())
@@ -0,0 +1,61 @@
+import csv
+from itertools import islice
+
+from base.renderers import ORJSONRenderer
+from base.utils.projection import project_queryset
+from base.utils.compiled_serializer import get_compiled_serializer
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class _Echo:
+    """File-like object handing back what the csv writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def serialize_rows(queryset, serializer, chunk_size, context=None):
+    """
+    Lazily serialize a queryset, fetching `chunk_size` rows per database round trip.
+
+    Compiled serializers read value tuples, other serializers render one instance
+    at a time through a single serializer instance.
+
+    Returns:
+        iterator: Serialized rows as dicts.
+    """
+    compiled = get_compiled_serializer(serializer)
+    if compiled:
+        rows = compiled.values(queryset).iterator(chunk_size=chunk_size)
+        return map(compiled.serialize_row, rows)
+
+    queryset = project_queryset(queryset, serializer)
+    instance = serializer(context=context or {})
+    return map(instance.to_representation, queryset.iterator(chunk_size=chunk_size))
+
+
+def ndjson_chunks(rows, chunk_size):
+    """Encode rows as newline delimited JSON, one bytestring per `chunk_size` rows."""
+    renderer = ORJSONRenderer()
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield b"".join(renderer.render(row) + b"\n" for row in chunk)
+
+
+def csv_chunks(rows, fieldnames, chunk_size):
+    """Encode rows as CSV with a header line, one string per `chunk_size` rows."""
+    writer = csv.DictWriter(_Echo(), fieldnames=fieldnames, extrasaction="ignore")
+    yield writer.writeheader()
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield "".join(writer.writerow(row) for row in chunk)
@@ -0,0 +1,117 @@
+import random
+import logging
+import datetime
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Messages sent per relay transaction
+OUTBOX_BATCH_SIZE = getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+# Failed sends before a message is left in the table for inspection
+OUTBOX_MAX_ATTEMPTS = getattr(settings, "OUTBOX_MAX_ATTEMPTS", 10)
+# Seconds before the first retry, doubled on each further failure
+OUTBOX_RETRY_DELAY = getattr(settings, "OUTBOX_RETRY_DELAY", 5)
+OUTBOX_MAX_RETRY_DELAY = getattr(settings, "OUTBOX_MAX_RETRY_DELAY", 3600)
+# Relay in process once the publishing transaction commits, when no relay runs
+OUTBOX_RELAY_ON_COMMIT = getattr(settings, "OUTBOX_RELAY_ON_COMMIT", False)
+
+# topic -> callable(payload)
+_handlers = {}
+
+
+def outbox_handler(topic):
+    """Register the decorated function as the relay handler of `topic` messages."""
+
+    def register(function):
+        _handlers[topic] = function
+        return function
+
+    return register
+
+
+def publish(topic, payload):
+    """
+    Write a message to the outbox, in the caller's transaction.
+
+    The message is only sent by the relay once that transaction committed, and
+    not at all if it rolled back. Costs one insert; `bulk_create` sends no
+    `post_save`, so no cache version is bumped either. With
+    `OUTBOX_RELAY_ON_COMMIT` the relay runs in process right after the commit.
+
+    Args:
+        topic (str): Registered with `outbox_handler`.
+        payload (dict): JSON arguments of the handler.
+    """
+    from base.models import OutboxMessage
+
+    OutboxMessage.objects.bulk_create([OutboxMessage(topic=topic, payload=payload)])
+    if OUTBOX_RELAY_ON_COMMIT:
+        transaction.on_commit(relay_committed)
+
+
+def relay_committed():
+    """`on_commit` relay of `publish`, the committed request must not fail with it."""
+    try:
+        relay_outbox()
+    except Exception as e:
+        logger.error(f"OutboxError: {str(e)}")
+
+
+def retry_delay(attempts):
+    """Seconds before retrying a message that failed `attempts` times, with jitter."""
+    delay = min(OUTBOX_RETRY_DELAY * 2 ** (attempts - 1), OUTBOX_MAX_RETRY_DELAY)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def relay_outbox(batch_size=OUTBOX_BATCH_SIZE):
+    """
+    Send one batch of due outbox messages through their handlers.
+
+    Rows are locked with `SKIP LOCKED` where the database supports it, so several
+    relays can run at once without sending a message twice. A message is only
+    deleted once its handler returned, a handler that raises keeps it for a
+    retry with exponential backoff until `OUTBOX_MAX_ATTEMPTS`. Handlers must
+    raise when the message was not handed over (see `base.utils.tasks.enqueue`).
+
+    Returns:
+        tuple: (sent, failed) message counts.
+    """
+    from base.models import OutboxMessage
+
+    sent = []
+    failed = []
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(
+                available_at__lte=timezone.now(),
+                attempts__lt=OUTBOX_MAX_ATTEMPTS,
+            )
+            .order_by("id")[:batch_size]
+        )
+        for message in messages:
+            handler = _handlers.get(message.topic)
+            try:
+                if handler is None:
+                    raise LookupError(f"No outbox handler for {message.topic}")
+                handler(message.payload)
+                sent.append(message.pk)
+            except Exception as e:
+                logger.error(f"OutboxError: {message} {str(e)}")
+                message.attempts += 1
+                message.last_error = str(e)
+                message.available_at = timezone.now() + datetime.timedelta(
+                    seconds=retry_delay(message.attempts)
+                )
+                failed.append(message)
+
+        if sent:
+            queryset = OutboxMessage.objects.filter(pk__in=sent)
+            queryset._raw_delete(queryset.db)
+        if failed:
+            OutboxMessage.objects.bulk_update(
+                failed, ["attempts", "last_error", "available_at"]
+            )
+    return len(sent), len(failed)
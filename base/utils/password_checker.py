@@ -1,5 +1,10 @@
 from rest_framework import serializers
 from base.constants.password import COMMON_PASSWORDS
+from base.utils.aho_corasick import AhoCorasick
+from base.utils.breached_passwords import breached_passwords
+
+# One pass over the password finds any of the common patterns
+common_patterns = AhoCorasick(COMMON_PASSWORDS)
 
 
 def check_password(value):
@@ -28,9 +33,12 @@ def check_password(value):
         errors.append("Password must contain at least one special character")
         data = False
     # Check for common patterns
-
-    if any(pattern in value.lower() for pattern in COMMON_PASSWORDS):
+    if value.lower() in common_patterns:
         errors.append("Password contains common patterns that are not allowed")
         data = False
+    # Check the breached-password list, if one is configured
+    elif value in breached_passwords:
+        errors.append("Password has appeared in a data breach and is not allowed")
+        data = False
 
     return data, errors
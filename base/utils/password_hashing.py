@@ -0,0 +1,133 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import hashers
+
+logger = logging.getLogger(__name__)
+
+# Hashes computed at the same time, hashlib releases the GIL while hashing
+PASSWORD_HASHING_WORKERS = getattr(
+    settings, "PASSWORD_HASHING_WORKERS", os.cpu_count() or 1
+)
+# Hashes allowed to wait for a worker before new ones are refused
+PASSWORD_HASHING_QUEUE_SIZE = getattr(settings, "PASSWORD_HASHING_QUEUE_SIZE", 64)
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when more hashes are waiting than `PASSWORD_HASHING_QUEUE_SIZE`."""
+
+
+class PasswordHasherPool:
+    """
+    Bounded executor for password hashing.
+
+    PBKDF2 hashes are CPU bound and take tens of milliseconds, so during login
+    storms they are run by at most `workers` threads instead of by every request
+    thread at once. Callers beyond `queue_size` waiting hashes are refused with
+    `PasswordHashingBusy` instead of piling up. Sync callers block on the
+    result, async callers await it.
+    """
+
+    def __init__(
+        self, workers=PASSWORD_HASHING_WORKERS, queue_size=PASSWORD_HASHING_QUEUE_SIZE
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected": 0,
+            "queued": 0,
+            "running": 0,
+            "max_queued": 0,
+            "wait_seconds": 0.0,
+            "hash_seconds": 0.0,
+        }
+
+    def _get_executor(self):
+        # one executor per process, worker threads do not survive a fork
+        if self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hashing"
+            )
+            self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, function, *args):
+        """
+        Run `function(*args)` on the pool.
+
+        Returns:
+            Future: The result of the call.
+
+        Raises:
+            PasswordHashingBusy: When the queue is full.
+        """
+        with self._lock:
+            metrics = self._metrics
+            if metrics["queued"] >= self.queue_size:
+                metrics["rejected"] += 1
+                logger.warning(
+                    f"Password hashing queue full ({self.queue_size} waiting), refusing a hash"
+                )
+                raise PasswordHashingBusy("Too many password hashes are waiting.")
+            metrics["submitted"] += 1
+            metrics["queued"] += 1
+            metrics["max_queued"] = max(metrics["max_queued"], metrics["queued"])
+            executor = self._get_executor()
+        return executor.submit(self._run, time.perf_counter(), function, args)
+
+    def _run(self, submitted_at, function, args):
+        started_at = time.perf_counter()
+        with self._lock:
+            self._metrics["queued"] -= 1
+            self._metrics["running"] += 1
+            self._metrics["wait_seconds"] += started_at - submitted_at
+        try:
+            return function(*args)
+        finally:
+            with self._lock:
+                self._metrics["running"] -= 1
+                self._metrics["completed"] += 1
+                self._metrics["hash_seconds"] += time.perf_counter() - started_at
+
+    def check_password(self, user, password):
+        """Check `password` against `user`'s hash, blocking until a worker ran it."""
+        return self.submit(user.check_password, password).result()
+
+    def make_password(self, password):
+        """Hash `password` with the default hasher, blocking until a worker ran it."""
+        return self.submit(hashers.make_password, password).result()
+
+    async def acheck_password(self, user, password):
+        """Async `check_password`, the event loop keeps serving while the hash runs."""
+        return await asyncio.wrap_future(self.submit(user.check_password, password))
+
+    async def amake_password(self, password):
+        """Async `make_password`."""
+        return await asyncio.wrap_future(self.submit(hashers.make_password, password))
+
+    def metrics(self):
+        """
+        Return the pool metrics of this process.
+
+        Returns:
+            dict: Counters (submitted, completed, rejected), gauges (queued,
+                  running, max_queued) and average wait/hash times in ms.
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        completed = metrics["completed"] or 1
+        metrics["avg_wait_ms"] = metrics.pop("wait_seconds") * 1000 / completed
+        metrics["avg_hash_ms"] = metrics.pop("hash_seconds") * 1000 / completed
+        return metrics
+
+
+password_hasher = PasswordHasherPool()
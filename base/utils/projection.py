@@ -0,0 +1,125 @@
+from django.db.models import ForeignKey, OneToOneField
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+# serializer class -> (only_fields, select_related) or None when not projectable
+_projections = {}
+MAX_CACHED_PROJECTIONS = 1024
+
+
+def _resolve_columns(model, serializer_fields, prefix=""):
+    """
+    Map serializer fields onto model columns.
+
+    Args:
+        model: The model the serializer renders.
+        serializer_fields (iterable): Bound serializer fields to resolve.
+        prefix (str): Lookup prefix used for nested relations (e.g. `hospital__`).
+
+    Returns:
+        tuple: (only_fields, select_related) as sets, or None if a field reads
+               something that cannot be traced to a column (`source="*"`,
+               properties, methods).
+    """
+    only_fields = {f"{prefix}{model._meta.pk.name}"}
+    select_related = set()
+
+    for field in serializer_fields:
+        if field.write_only:
+            continue
+        if field.source == "*":
+            return None
+
+        current_model = model
+        path = prefix
+        attrs = field.source.split(".")
+        for index, attr in enumerate(attrs):
+            try:
+                model_field = current_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                return None
+
+            is_last = index == len(attrs) - 1
+            if model_field.many_to_many or model_field.one_to_many:
+                # loaded by its own query, nothing to select on this row
+                break
+            if isinstance(model_field, (ForeignKey, OneToOneField)) and (
+                not is_last or isinstance(field, serializers.BaseSerializer)
+            ):
+                relation = f"{path}{attr}"
+                select_related.add(relation)
+                current_model = model_field.related_model
+                path = f"{relation}__"
+                if is_last:
+                    nested = _resolve_columns(
+                        current_model, field.fields.values(), prefix=path
+                    )
+                    if nested is None:
+                        return None
+                    only_fields |= nested[0]
+                    select_related |= nested[1]
+                continue
+            if model_field.is_relation and not model_field.concrete:
+                # reverse one-to-one, cannot be projected with only()
+                return None
+            only_fields.add(f"{path}{attr}")
+            if not is_last:
+                return None
+    return only_fields, select_related
+
+
+def get_serializer_projection(serializer):
+    """
+    Return the columns a model serializer reads, computed once per serializer class.
+
+    Args:
+        serializer: A `ModelSerializer` subclass.
+
+    Returns:
+        tuple: (only_fields, select_related) or None if it cannot be projected.
+    """
+    if serializer in _projections:
+        return _projections[serializer]
+
+    projection = None
+    meta = getattr(serializer, "Meta", None)
+    if issubclass(serializer, serializers.ModelSerializer) and meta is not None:
+        resolved = _resolve_columns(meta.model, serializer().fields.values())
+        if resolved:
+            only_fields, select_related = resolved
+            projection = tuple(sorted(only_fields)), tuple(sorted(select_related))
+
+    if len(_projections) < MAX_CACHED_PROJECTIONS:
+        _projections[serializer] = projection
+    return projection
+
+
+def project_queryset(queryset, serializer):
+    """
+    Restrict a queryset to the columns its response serializer renders.
+
+    Applies `only()` and the `select_related()` needed by relation lookups so large
+    unused columns (e.g. `TextField`s) are never fetched. The queryset is returned
+    unchanged when the serializer cannot be projected, does not render the
+    queryset's model, or the queryset already carries a projection.
+
+    Args:
+        queryset (QuerySet): Queryset to be paginated and serialized.
+        serializer: Serializer class used for the response.
+
+    Returns:
+        QuerySet: The projected queryset.
+    """
+    if serializer is None or queryset._fields is not None:
+        return queryset
+    if queryset.query.deferred_loading != (frozenset(), True):
+        return queryset
+
+    projection = get_serializer_projection(serializer)
+    if projection is None or serializer.Meta.model is not queryset.model:
+        return queryset
+
+    only_fields, select_related = projection
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    return queryset.only(*only_fields)
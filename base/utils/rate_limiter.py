@@ -0,0 +1,154 @@
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_CACHE_ALIAS = getattr(settings, "RATE_LIMIT_CACHE_ALIAS", "default")
+# Buckets kept by the in-process fallback
+RATE_LIMIT_LOCAL_SIZE = getattr(settings, "RATE_LIMIT_LOCAL_SIZE", 100000)
+
+PERIODS = {
+    "s": 1,
+    "sec": 1,
+    "m": 60,
+    "min": 60,
+    "h": 3600,
+    "hour": 3600,
+    "d": 86400,
+    "day": 86400,
+}
+
+# Checks every bucket, then takes one token from each only if all of them allow
+# it, so a request refused by one limit does not drain the others.
+# KEYS: bucket keys. ARGV: now, then capacity and refill rate (tokens/s) per key.
+# Returns {allowed, seconds until a token is available}.
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local tokens = {}
+local retry_after = 0
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local bucket = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local available = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    available = math.min(capacity, available + math.max(now - ts, 0) * rate)
+    if available < 1 then
+        retry_after = math.max(retry_after, (1 - available) / rate)
+    end
+    tokens[i] = available
+end
+if retry_after > 0 then
+    return {0, tostring(retry_after)}
+end
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    redis.call('HSET', KEYS[i], 'tokens', tostring(tokens[i] - 1), 'ts', ARGV[1])
+    redis.call('EXPIRE', KEYS[i], math.ceil(capacity / rate) + 1)
+end
+return {1, '0'}
+"""
+
+
+def parse_rate(rate):
+    """
+    Parse a rate such as `5/min` or `100/10s`.
+
+    Returns:
+        tuple: (capacity, refill rate in tokens per second)
+    """
+    count, period = rate.split("/")
+    match = re.fullmatch(r"(\d*)\s*([a-z]+)", period.strip())
+    if not match or match.group(2) not in PERIODS:
+        raise ValueError(f"Invalid rate: {rate}")
+    seconds = int(match.group(1) or 1) * PERIODS[match.group(2)]
+    count = int(count)
+    return count, count / seconds
+
+
+class LocalTokenBuckets:
+    """In-process token buckets, used when no redis cache is configured or reachable."""
+
+    def __init__(self, maxsize=RATE_LIMIT_LOCAL_SIZE):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, limits, now):
+        with self._lock:
+            tokens = []
+            retry_after = 0
+            for key, capacity, rate in limits:
+                available, ts = self._buckets.get(key, (capacity, now))
+                available = min(capacity, available + max(now - ts, 0) * rate)
+                if available < 1:
+                    retry_after = max(retry_after, (1 - available) / rate)
+                tokens.append(available)
+            if retry_after:
+                return False, retry_after
+            for (key, _, _), available in zip(limits, tokens):
+                self._buckets[key] = (available - 1, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return True, 0
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter shared by all workers through redis.
+
+    All the buckets of one request are checked and consumed by a single Lua
+    script, so a check costs one round trip. Without redis, or while it is
+    unreachable, buckets are kept in process.
+    """
+
+    def __init__(self, alias=RATE_LIMIT_CACHE_ALIAS):
+        self.alias = alias
+        self.local = LocalTokenBuckets()
+        self._script = None
+
+    def get_script(self):
+        if self._script is None:
+            if not hasattr(caches[self.alias], "iter_keys"):
+                return None
+            from django_redis import get_redis_connection
+
+            self._script = get_redis_connection(self.alias).register_script(
+                TOKEN_BUCKET_SCRIPT
+            )
+        return self._script
+
+    def consume(self, limits):
+        """
+        Take one token from each bucket if all of them have one.
+
+        Args:
+            limits (list): (key, capacity, refill rate) per bucket.
+
+        Returns:
+            tuple: (allowed, retry_after) - retry_after is in seconds.
+        """
+        now = time.time()
+        try:
+            script = self.get_script()
+            if script is not None:
+                args = [now]
+                for _, capacity, rate in limits:
+                    args.extend((capacity, rate))
+                allowed, retry_after = script(
+                    keys=[key for key, _, _ in limits], args=args
+                )
+                return bool(allowed), float(retry_after)
+        except Exception as e:
+            logger.error(f"CacheError: {str(e)}")
+        return self.local.consume(limits, now)
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+
+class SMTPSink:
+    """
+    Minimal local SMTP server accepting and counting every message.
+
+    A stand-in for the real mail server in tests and benchmarks: it speaks
+    enough SMTP for Django's SMTP backend (no TLS, no auth) and keeps the
+    messages it received in `messages`. Runs its event loop in a daemon thread.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, keep_messages=True):
+        self.host = host
+        self.port = port
+        self.keep_messages = keep_messages
+        self.messages = []
+        self.message_count = 0
+        self.connection_count = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Start serving, returns once the server listens on `self.port`."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self.handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    async def _shutdown(self):
+        # drop the connections clients left open
+        self._server.close()
+        tasks = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def handle(self, reader, writer):
+        self.connection_count += 1
+        writer.write(b"220 localhost SMTP sink\r\n")
+        sender, recipients = None, []
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors="replace").strip()
+                verb = command[:4].upper()
+                if verb in ("EHLO", "HELO"):
+                    writer.write(b"250-localhost\r\n250 8BITMIME\r\n")
+                elif verb == "MAIL":
+                    sender, recipients = command[10:].strip(), []
+                    writer.write(b"250 OK\r\n")
+                elif verb == "RCPT":
+                    recipients.append(command[8:].strip())
+                    writer.write(b"250 OK\r\n")
+                elif verb == "DATA":
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    data = []
+                    while True:
+                        line = await reader.readline()
+                        if not line or line in (b".\r\n", b".\n"):
+                            break
+                        data.append(line[1:] if line.startswith(b"..") else line)
+                    self.message_count += 1
+                    if self.keep_messages:
+                        self.messages.append((sender, recipients, b"".join(data)))
+                    writer.write(b"250 OK queued\r\n")
+                elif verb == "RSET":
+                    sender, recipients = None, []
+                    writer.write(b"250 OK\r\n")
+                elif verb == "NOOP":
+                    writer.write(b"250 OK\r\n")
+                elif verb == "QUIT":
+                    writer.write(b"221 Bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(b"502 Command not implemented\r\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,94 @@
+FIELDS_PARAM = "fields"
+EXCLUDE_PARAM = "exclude"
+# Field sets are client controlled, bound the number of trimmed classes kept
+MAX_CACHED_SERIALIZERS = 512
+
+# (serializer class, fields, exclude) -> (trimmed serializer class, unknown fields)
+_sparse_serializers = {}
+
+
+def _parse_names(query_params, param):
+    names = []
+    if hasattr(query_params, "getlist"):
+        values = query_params.getlist(param)
+    else:
+        values = [query_params[param]] if param in query_params else []
+    for value in values:
+        names.extend(name.strip() for name in value.split(",") if name.strip())
+    return tuple(sorted(set(names)))
+
+
+def parse_sparse_fields(query_params):
+    """
+    Read the `fields` and `exclude` query parameters.
+
+    Both take comma separated field names (`?fields=id,status,latitude`) and may be
+    repeated.
+
+    Args:
+        query_params (QueryDict): Request query parameters.
+
+    Returns:
+        tuple: (fields, exclude) as sorted tuples of names, empty when not given.
+    """
+    if not query_params:
+        return (), ()
+    return (
+        _parse_names(query_params, FIELDS_PARAM),
+        _parse_names(query_params, EXCLUDE_PARAM),
+    )
+
+
+def strip_sparse_fields(query_params):
+    """Return a copy of `query_params` without the `fields`/`exclude` parameters."""
+    query_params = query_params.copy()
+    query_params.pop(FIELDS_PARAM, None)
+    query_params.pop(EXCLUDE_PARAM, None)
+    return query_params
+
+
+def get_sparse_serializer(serializer, fields=(), exclude=()):
+    """
+    Return `serializer` trimmed to the requested field set.
+
+    The trimmed class is built once per (serializer, fields, exclude) and reused, so
+    its bound fields and queryset projection are only computed the first time.
+
+    Args:
+        serializer: Response serializer class.
+        fields (tuple): Field names to keep, all fields when empty.
+        exclude (tuple): Field names to drop.
+
+    Returns:
+        tuple: (serializer, unknown) - the trimmed serializer class and the requested
+               names the serializer does not render. The serializer is None when
+               there are unknown names or no field is left to render.
+    """
+    if serializer is None or not (fields or exclude):
+        return serializer, ()
+
+    key = (serializer, fields, exclude)
+    if key in _sparse_serializers:
+        return _sparse_serializers[key]
+
+    available = serializer().fields
+    unknown = tuple(name for name in fields + exclude if name not in available)
+    keep = frozenset(fields or available) - frozenset(exclude)
+    if unknown or not keep:
+        result = None, unknown
+    else:
+
+        def get_fields(self):
+            declared = super(trimmed, self).get_fields()
+            return {name: field for name, field in declared.items() if name in keep}
+
+        trimmed = type(
+            f"Sparse{serializer.__name__}",
+            (serializer,),
+            {"__module__": serializer.__module__, "get_fields": get_fields},
+        )
+        result = trimmed, ()
+
+    if len(_sparse_serializers) < MAX_CACHED_SERIALIZERS:
+        _sparse_serializers[key] = result
+    return result
@@ -0,0 +1,99 @@
+import fnmatch
+from celery import shared_task
+from celery.result import EagerResult
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+
+# Queues by priority: each one is served by its own workers, so a backlog on a
+# lower one never delays a task on a higher one
+QUEUE_DISPATCH = "dispatch"  # crew alerts and dispatch notifications
+QUEUE_OTP = "otp"  # OTP and 2FA codes, password resets
+QUEUE_WELCOME = "welcome"  # welcome emails
+QUEUE_DEFAULT = "default"
+PRIORITY_QUEUES = (QUEUE_DISPATCH, QUEUE_OTP, QUEUE_WELCOME, QUEUE_DEFAULT)
+
+# Task name patterns routed to a queue without declaring it on the task
+TASK_ROUTE_PATTERNS = getattr(
+    settings,
+    "CELERY_TASK_ROUTE_PATTERNS",
+    {"ambulance_mgmt.*": QUEUE_DISPATCH, "hospital_mgmt.*": QUEUE_DISPATCH},
+)
+# Exponential backoff of retried tasks: factor, cap (seconds) and attempts
+TASK_RETRY_BACKOFF = getattr(settings, "CELERY_TASK_RETRY_BACKOFF", 2)
+TASK_RETRY_BACKOFF_MAX = getattr(settings, "CELERY_TASK_RETRY_BACKOFF_MAX", 300)
+TASK_MAX_RETRIES = getattr(settings, "CELERY_TASK_MAX_RETRIES", 5)
+# Without a broker tasks run inside the request, retries would block it
+TASK_ALWAYS_EAGER = getattr(settings, "CELERY_TASK_ALWAYS_EAGER", False)
+
+# task name -> queue
+_task_queues = {}
+
+
+def priority_task(queue, autoretry_for=(OSError,), **options):
+    """
+    `shared_task` routed to `queue` and retried with exponential backoff and jitter.
+
+    Args:
+        queue (str): One of `PRIORITY_QUEUES`.
+        autoretry_for (tuple): Exceptions retrying the task, network errors
+            (SMTP and broker errors included) by default. Eager tasks are not
+            retried, they fail at once.
+        **options: Other `shared_task` options.
+    """
+
+    def decorator(function):
+        task = shared_task(
+            autoretry_for=() if TASK_ALWAYS_EAGER else autoretry_for,
+            retry_backoff=TASK_RETRY_BACKOFF,
+            retry_backoff_max=TASK_RETRY_BACKOFF_MAX,
+            retry_jitter=True,
+            max_retries=TASK_MAX_RETRIES,
+            acks_late=True,
+            **options,
+        )(function)
+        _task_queues[task.name] = queue
+        return task
+
+    return decorator
+
+
+def enqueue(task, *args, **kwargs):
+    """
+    Queue `task`, raising when it cannot be handed over.
+
+    Without a broker tasks run eagerly and their failures are only recorded in
+    the result (`CELERY_TASK_EAGER_PROPAGATES` is off), they are raised here, as
+    a broker error would be, for callers that must keep the work for a retry.
+
+    Returns:
+        AsyncResult: The task's result.
+    """
+    result = task.delay(*args, **kwargs)
+    if isinstance(result, EagerResult):
+        result.maybe_throw()
+    return result
+
+
+def retry_countdown(retries):
+    """Backoff of a manual `task.retry`, the same as the automatic retries use."""
+    return get_exponential_backoff_interval(
+        TASK_RETRY_BACKOFF, retries, TASK_RETRY_BACKOFF_MAX, full_jitter=True
+    )
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Celery router (`task_routes`): the queue declared with `priority_task`, else
+    the first matching `TASK_ROUTE_PATTERNS` entry, else the default queue.
+    """
+    queue = _task_queues.get(name)
+    if queue is None:
+        queue = next(
+            (
+                queue
+                for pattern, queue in TASK_ROUTE_PATTERNS.items()
+                if fnmatch.fnmatchcase(name, pattern)
+            ),
+            None,
+        )
+    return {"queue": queue} if queue else None
@@ -0,0 +1,99 @@
+import re
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Length
+
+# Attempts made by `create_with_unique_value` before giving up
+UNIQUE_VALUE_ATTEMPTS = 5
+
+
+def next_unique_values(queryset, field, prefix, count, width=0, start=1, bare=False):
+    """
+    Return the next `count` free `prefix` + number values of `field`, with one query.
+
+    The highest numbered value in use is found by a single prefix query: values
+    made of the prefix and digits only, ordered by length then value, which is
+    numeric order for both padded and unpadded numbers. Gaps left by deleted
+    rows are not reused.
+
+    Args:
+        queryset: Rows sharing the unique `field`.
+        field (str): Name of the unique field.
+        prefix (str): Start of the value, e.g. "AMB".
+        count (int): Number of values wanted.
+        width (int): Numbers are zero padded to this width, e.g. 3 for AMB001.
+        start (int): First number used.
+        bare (bool): Use `prefix` alone while it is free, then `prefix` + start.
+
+    Returns:
+        list: The values to use, in order.
+    """
+    last = (
+        queryset.filter(**{f"{field}__startswith": prefix})
+        .filter(**{f"{field}__regex": rf"^{re.escape(prefix)}[0-9]*$"})
+        .order_by(Length(field).desc(), f"-{field}")
+        .values_list(field, flat=True)
+        .first()
+    )
+    values = []
+    if last is None:
+        if bare:
+            values.append(prefix)
+        number = start
+    elif last == prefix:
+        number = start
+    else:
+        number = int(last[len(prefix) :]) + 1
+    while len(values) < count:
+        values.append(f"{prefix}{number:0{width}d}")
+        number += 1
+    return values[:count]
+
+
+def next_unique_value(queryset, field, prefix, width=0, start=1, bare=False):
+    """
+    Return the next free `prefix` + number value of `field`, with one query.
+
+    See `next_unique_values` for the arguments.
+
+    Returns:
+        str: The value to use.
+    """
+    return next_unique_values(queryset, field, prefix, 1, width, start, bare)[0]
+
+
+def create_with_unique_value(
+    queryset,
+    field,
+    prefix,
+    create,
+    width=0,
+    start=1,
+    bare=False,
+    attempts=UNIQUE_VALUE_ATTEMPTS,
+):
+    """
+    Create a row whose `field` is the next free `prefix` + number value.
+
+    Two requests can pick the same value at once, the unique constraint then
+    rejects the second insert, which picks the next value and tries again.
+
+    Args:
+        create (callable): Called with the value, creates and returns the row.
+        See `next_unique_value` for the others.
+
+    Returns:
+        The created row.
+
+    Raises:
+        IntegrityError: When the insert fails for another reason than `field`,
+            or after `attempts` conflicts.
+    """
+    for attempt in range(attempts):
+        value = next_unique_value(queryset, field, prefix, width, start, bare)
+        try:
+            with transaction.atomic():
+                return create(value)
+        except IntegrityError:
+            taken = queryset.filter(**{field: value}).exists()
+            if not taken or attempt == attempts - 1:
+                raise
@@ -1,13 +1,86 @@
-from rest_framework import generics
+import logging
+from collections import namedtuple
+from urllib.parse import urlsplit
+from django.db import transaction
+from django.http import HttpRequest, QueryDict, StreamingHttpResponse
+from django.urls import Resolver404, resolve
+from rest_framework import generics, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from base.permissions import NonAuthUserMixin
+from base.response_handler import ResponseHandler
+from base.serializers import BatchSerializer
+from base.service import ServiceFactory
+from base.utils.export import EXPORT_FORMATS
+from base.utils.sparse_fields import get_sparse_serializer, parse_sparse_fields
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMAT_PARAM = "export_format"
+
+# Pre-resolved objects serving one entry of a view's dispatch table
+Dispatch = namedtuple("Dispatch", ("service", "serializer", "response_serializer"))
+EMPTY_DISPATCH = Dispatch(None, None, None)
 
 
 class BaseAPIView(generics.GenericAPIView):
     """
     Base class to handle common patterns in API views.
-    Subclasses should implement the `get_service` and
+    Subclasses declare their `manager` and serializer tables, and
     optionally override `handle_request` for custom logic.
+
+    The tables are resolved once per view class into `dispatch_table`, which maps
+    each HTTP method (or URL name, with `dispatch_on = "url_name"`) to a shared
+    service and its serializers. Services keep no request state.
     """
 
+    manager = None
+    # request serializers and response serializers by HTTP method or URL name
+    serializer_classes = {}
+    serializer_response_classes = {}
+    # response serializer of GET requests for a single resource (`id` given)
+    detail_serializer_class = None
+    # "method" keys the tables by lowercase HTTP method, "url_name" by URL name
+    dispatch_on = "method"
+
+    dispatch_table = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch_table = cls.build_dispatch_table()
+
+    @classmethod
+    def build_dispatch_table(cls):
+        """Resolve the serializer tables and build one service per entry."""
+        # requests without an entry are served without serializers
+        table = {
+            None: Dispatch(
+                ServiceFactory(cls.manager) if cls.manager else None, None, None
+            )
+        }
+        for key in {**cls.serializer_classes, **cls.serializer_response_classes}:
+            serializer = cls.serializer_classes.get(key)
+            service = ServiceFactory(cls.manager, serializer) if cls.manager else None
+            table[key] = Dispatch(
+                service, serializer, cls.serializer_response_classes.get(key)
+            )
+        return table
+
+    def get_dispatch(self, request=None, method=None):
+        """Return the dispatch table entry of a request (the current one by default)."""
+        request = request or getattr(self, "request", None)
+        if request is None:
+            return EMPTY_DISPATCH
+        if self.dispatch_on == "url_name":
+            key = method or request.resolver_match.url_name
+        else:
+            key = "get" if request.method == "HEAD" else request.method.lower()
+        return self.dispatch_table.get(key) or self.dispatch_table.get(
+            None, EMPTY_DISPATCH
+        )
+
     def handle_request(self, request, operation, *args, **kwargs):
         """
         Common handler for API operations.
@@ -28,41 +101,248 @@ class BaseAPIView(generics.GenericAPIView):
 
         service = self.get_service(request=request, method=method)
         id = kwargs.get("id")
+        serializer = self.get_response_serializer_class(
+            request=request, id=id, method=method
+        )
+        if operation == "get":
+            kwargs["response_serializer"] = serializer
         data, error, status_code = getattr(service, operation)(*args, **kwargs)
 
         if error:
             return service.error(error, f"{action.capitalize()} failed", status_code)
+        if operation == "get":
+            # ?fields= / ?exclude= were validated by the service, trim the response
+            serializer, _ = get_sparse_serializer(
+                serializer, *parse_sparse_fields(request.query_params)
+            )
         return service.success(
             data=data,
             message=f"{action.capitalize()} successful",
             status_code=status_code,
-            serializer=self.get_response_serializer_class(
-                request=request, id=id, method=method
-            ),
+            serializer=serializer,
             request=request,
             view=self,
         )
 
+    def handle_export(self, request, *args, **kwargs):
+        """
+        Common handler for streaming exports.
+
+        Lists resources through the service's `export` operation, with the same
+        filters as the list endpoint, and streams them as NDJSON or CSV depending
+        on the `export_format` query parameter (default `ndjson`).
+
+        Args:
+            request: The HTTP request.
+            *args: Additional positional arguments for the service method, starting with the action.
+            **kwargs: Additional keyword arguments for the service method.
+
+        Returns:
+            StreamingHttpResponse: The export, or a DRF Response on error.
+        """
+        action = args[0]
+        service = self.get_service(request=request, method="get")
+        export_format = request.query_params.get(EXPORT_FORMAT_PARAM, "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return service.error(
+                f"Unsupported export format: {export_format}. "
+                f"Use one of {', '.join(EXPORT_FORMATS)}.",
+                f"{action.capitalize()} failed",
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = self.get_response_serializer_class(request=request, method="get")
+        kwargs["response_serializer"] = serializer
+        data, error, status_code = service.export(*args, **kwargs)
+        if error:
+            return service.error(error, f"{action.capitalize()} failed", status_code)
+
+        serializer, _ = get_sparse_serializer(
+            serializer, *parse_sparse_fields(request.query_params)
+        )
+        return service.stream(
+            data,
+            serializer,
+            export_format,
+            filename=request.resolver_match.url_name,
+            request=request,
+        )
+
     def get_service(self, *args, **kwargs):
         """
-        Return the service instance. Must be implemented by subclasses.
+        Return the service of the request, from the dispatch table.
         """
-        raise NotImplementedError("Subclasses must implement the `get_service` method.")
+        service = self.get_dispatch(kwargs.get("request"), kwargs.get("method")).service
+        if service is None:
+            raise NotImplementedError(
+                f"{type(self).__name__} must declare a `manager` or implement `get_service`."
+            )
+        return service
 
     def get_serializer_class(self, *args, **kwargs):
         """
-        Return the serializer class for the success response.
-        Must be implemented by subclasses.
+        Return the serializer class validating the request data.
         """
-        raise NotImplementedError(
-            "Subclasses must implement the `get_serializer_class` method."
-        )
+        return self.get_dispatch(kwargs.get("request"), kwargs.get("method")).serializer
 
     def get_response_serializer_class(self, *args, **kwargs):
         """
         Return the serializer class for the success response.
-        Must be implemented by subclasses.
         """
-        raise NotImplementedError(
-            "Subclasses must implement the `get_serializer_class` method."
+        request = kwargs.get("request")
+        if (
+            request.method == "GET"
+            and kwargs.get("id")
+            and self.detail_serializer_class
+        ):
+            return self.detail_serializer_class
+        return self.get_dispatch(request, kwargs.get("method")).response_serializer
+
+
+class BatchAPIView(APIView):
+    """
+    Run several API operations in one HTTP request.
+
+    Each operation is resolved to its `BaseAPIView` and run through the view's own
+    `initial()` (authentication, permissions and throttles) and handler (and so
+    `handle_request`/`ServiceFactory`). The authentication endpoints
+    (`NonAuthUserMixin` views) cannot be batched. With `atomic`, the operations
+    share one database transaction that is rolled back at the first failing
+    operation.
+
+    Request body:
+        {"atomic": false, "operations": [{"method": "PATCH", "path": "/api/v1/ambulances/1", "body": {...}}]}
+    """
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ResponseHandler.error(serializer.errors, "Batch failed")
+        atomic = serializer.validated_data["atomic"]
+        operations = serializer.validated_data["operations"]
+
+        if not atomic:
+            results = [self.run_operation(request, op) for op in operations]
+            return Response({"atomic": False, "results": results}, status.HTTP_200_OK)
+
+        results = []
+        with transaction.atomic():
+            for op in operations:
+                result = self.run_operation(request, op)
+                results.append(result)
+                if result["status"] >= 400:
+                    transaction.set_rollback(True)
+                    return Response(
+                        {"atomic": True, "committed": False, "results": results},
+                        status.HTTP_400_BAD_REQUEST,
+                    )
+        return Response(
+            {"atomic": True, "committed": True, "results": results},
+            status.HTTP_200_OK,
         )
+
+    def run_operation(self, request, operation):
+        """
+        Run one batch operation and return its `{method, path, status, body}` result.
+        """
+        method, path = operation["method"], operation["path"]
+        url = urlsplit(path)
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            return self.operation_result(
+                operation, status.HTTP_404_NOT_FOUND, "Not found."
+            )
+
+        view_class = getattr(match.func, "view_class", None)
+        if (
+            view_class is None
+            or not issubclass(view_class, BaseAPIView)
+            # login, OTP and password reset views, whose rate limits the
+            # middleware only applies to their own URLs
+            or issubclass(view_class, NonAuthUserMixin)
+        ):
+            return self.operation_result(
+                operation,
+                status.HTTP_400_BAD_REQUEST,
+                f"{url.path} cannot be called in a batch.",
+            )
+
+        view = view_class(**getattr(match.func, "view_initkwargs", {}))
+        handler = getattr(view, method.lower(), None)
+        if handler is None:
+            return self.operation_result(
+                operation,
+                status.HTTP_405_METHOD_NOT_ALLOWED,
+                f'Method "{method}" not allowed.',
+            )
+
+        sub_request = self.build_request(
+            view, request, method, url, match, operation["body"]
+        )
+        view.args, view.kwargs = match.args, match.kwargs
+        view.request = sub_request
+        view.headers = {}
+        try:
+            view.initial(sub_request, *match.args, **match.kwargs)
+            response = handler(sub_request, *match.args, **match.kwargs)
+        except Exception as exc:
+            try:
+                response = view.handle_exception(exc)
+            except Exception:
+                # not an API error, fail this operation only and keep the others
+                logger.exception(f"Batch operation {method} {url.path} failed")
+                return self.operation_result(
+                    operation,
+                    status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    "Internal server error.",
+                )
+
+        if isinstance(response, StreamingHttpResponse):
+            return self.operation_result(
+                operation,
+                status.HTTP_400_BAD_REQUEST,
+                "Streaming responses cannot be returned in a batch.",
+            )
+        return self.operation_result(
+            operation, response.status_code, getattr(response, "data", None)
+        )
+
+    @staticmethod
+    def build_request(view, request, method, url, match, body):
+        """Build the request of an operation, authenticated by `view` from the batch request's headers."""
+        http_request = HttpRequest()
+        http_request.method = method
+        http_request.path = http_request.path_info = url.path
+        # conditional headers are meant for the batch response, not its operations
+        http_request.META = {
+            key: value
+            for key, value in request.META.items()
+            if not key.startswith("HTTP_IF_")
+        }
+        http_request.META.update(REQUEST_METHOD=method, QUERY_STRING=url.query)
+        http_request.GET = QueryDict(url.query)
+        http_request.COOKIES = request.COOKIES
+        # the session user, and the JWT claims the middleware already verified
+        for attr in ("user", "jwt_claims", "jwt_token"):
+            if hasattr(request._request, attr):
+                setattr(http_request, attr, getattr(request._request, attr))
+        http_request.resolver_match = match
+
+        sub_request = Request(
+            http_request,
+            authenticators=view.get_authenticators(),
+            negotiator=view.get_content_negotiator(),
+        )
+        # the body was already parsed with the batch request
+        sub_request._full_data = body
+        return sub_request
+
+    @staticmethod
+    def operation_result(operation, status_code, body):
+        return {
+            "method": operation["method"],
+            "path": operation["path"],
+            "status": status_code,
+            "body": body,
+        }
@@ -0,0 +1,44 @@
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from base.tests.utils.utils import make_user
+from base.utils.rate_limiter import LocalTokenBuckets, rate_limiter
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    """
+    Run the tests on a SQLite file instead of the shared in-memory database, on
+    which concurrent writers fail with "database table is locked" instead of
+    waiting for each other.
+    """
+    database = settings.DATABASES["default"]
+    if database["ENGINE"] == "django.db.backends.sqlite3":
+        database.setdefault("TEST", {})["NAME"] = settings.BASE_DIR / "test_db.sqlite3"
+        database.setdefault("OPTIONS", {}).setdefault("timeout", 20)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start and end every test with an empty cache."""
+    caches["default"].clear()
+    yield
+    caches["default"].clear()
+
+
+@pytest.fixture(autouse=True)
+def buckets(monkeypatch):
+    """Fresh rate limit buckets, so attempts of other tests are not counted."""
+    monkeypatch.setattr(rate_limiter, "local", LocalTokenBuckets())
+
+
+@pytest.fixture
+def admin_client(db):
+    """API client authenticated with the access token of an admin user."""
+    token = RefreshToken.for_user(make_user(0, role="ADMIN")).access_token
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
@@ -2,8 +2,10 @@ from django.db.models import Q
 from django.db import transaction
 from rest_framework import status
 from account.models import User
-from base.send_email import EmailService
+from base.utils.outbox import publish
 from base.utils.password_checker import check_password
+from base.utils.password_hashing import PasswordHashingBusy, password_hasher
+from base.utils.unique_values import create_with_unique_value, next_unique_value
 
 
 class UserBusinessLayer:
@@ -66,35 +68,41 @@ class UserBusinessLayer:
             # if there is an error in the password, return not acceptable status code and the associated error
             return None, error, status.HTTP_406_NOT_ACCEPTABLE
 
-        data["username"] = UserBusinessLayer.generate_username(
-            data.get("first_name"), data.get("last_name")
+        # hash on the bounded hashing pool, then insert the user once
+        try:
+            data["password"] = password_hasher.make_password(password)
+        except PasswordHashingBusy as error:
+            return None, str(error), status.HTTP_503_SERVICE_UNAVAILABLE
+        # the next free username is picked again if another request takes it first
+        instance = create_with_unique_value(
+            User.objects.all(),
+            "username",
+            UserBusinessLayer.base_username(
+                data.get("first_name"), data.get("last_name")
+            ),
+            lambda username: User.objects.create(**{**data, "username": username}),
+            bare=True,
         )
-
-        instance = User.objects.create(**data)
-        if instance:
-            instance.set_password(password)
-            instance.save()
-            EmailService.send_registration_success(instance)
-        else:
-            return None, "User creation failed", status.HTTP_400_BAD_REQUEST
+        # sent by the outbox relay once the user is committed
+        publish("email.registration", {"user_ids": [instance.pk]})
         return instance, None, status.HTTP_201_CREATED
 
+    @staticmethod
+    def base_username(first_name, last_name):
+        """Username of a user before any number is appended: first initial and last name."""
+        return f"{first_name.lower()[0]}{last_name.lower()}"
+
     @staticmethod
     def generate_username(first_name, last_name):
         """
         Generate a username based on first and last name, appending numbers if needed
         """
-        # Create base username from first and last name
-        base_username = f"{first_name.lower()[0]}{last_name.lower()}"
-        username = base_username
-
-        counter = 1
-        # Keep checking and incrementing counter until we find an unused username
-        while User.objects.filter(username=username).exists():
-            username = f"{base_username}{counter}"
-            counter += 1
-
-        return username
+        return next_unique_value(
+            User.objects.all(),
+            "username",
+            UserBusinessLayer.base_username(first_name, last_name),
+            bare=True,
+        )
 
     @staticmethod
     def update_user(id, data):
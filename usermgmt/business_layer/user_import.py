@@ -0,0 +1,254 @@
+import io
+import os
+import csv
+import orjson
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from account.models import User
+from base.cache import bump_model_version_on_commit
+from base.utils.outbox import publish
+from base.utils.password_checker import check_password
+from base.utils.unique_values import create_with_unique_value, next_unique_values
+from usermgmt.business_layer.user import UserBusinessLayer
+from usermgmt.serializers.user import ImportUserSerializer
+
+USER_IMPORT_FORMATS = ("csv", "ndjson")
+# Rows validated, hashed and inserted together
+USER_IMPORT_BATCH_SIZE = getattr(settings, "USER_IMPORT_BATCH_SIZE", 500)
+# Processes hashing the passwords of a batch in `import_users`, web requests
+# always hash in process
+USER_IMPORT_HASH_PROCESSES = getattr(
+    settings, "USER_IMPORT_HASH_PROCESSES", os.cpu_count() or 1
+)
+
+
+def read_rows(stream, import_format):
+    """
+    Read user rows from a binary CSV or NDJSON stream, one at a time.
+
+    Yields:
+        tuple: (row number, row dict or None, parse error or None)
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if import_format == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            # empty cells are missing values, not empty strings
+            yield number, {key: value for key, value in row.items() if value}, None
+        return
+
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield number, None, f"Invalid JSON: {str(e)}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Each line must be a JSON object"
+            continue
+        yield number, row, None
+
+
+class UserImporter:
+    """
+    Create users in bulk from CSV or NDJSON rows.
+
+    Rows are read as a stream and handled in batches of `batch_size`: each batch
+    is validated and password-checked first, so rejected rows are never hashed,
+    then the passwords are hashed (across a process pool when `hash_processes`
+    is more than 1), usernames are allocated with one query per distinct name,
+    and the users are inserted with one `bulk_create`. The welcome emails of each
+    batch are written to the outbox with it, and sent by the relay as one task
+    once the batch is committed. `bulk_create` sends no `post_save`, the cached
+    user lists are invalidated once per batch instead.
+
+    Rejected rows are reported with their row number and do not stop the import.
+    """
+
+    def __init__(
+        self,
+        batch_size=USER_IMPORT_BATCH_SIZE,
+        hash_processes=1,
+        send_emails=True,
+    ):
+        self.batch_size = batch_size
+        self.hash_processes = hash_processes
+        self.send_emails = send_emails
+        self.executor = None
+
+    def run(self, rows):
+        """
+        Import `rows`, as yielded by `read_rows`.
+
+        Returns:
+            dict: Number of users created, and the rejected rows with their errors.
+        """
+        created_ids = []
+        failed = []
+        if self.hash_processes > 1:
+            # spawned, forking a threaded server is unsafe
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.hash_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            )
+        try:
+            batch = []
+            for number, row, error in rows:
+                if error:
+                    failed.append({"row": number, "errors": error})
+                    continue
+                batch.append((number, row))
+                if len(batch) >= self.batch_size:
+                    created_ids += self.import_batch(batch, failed)
+                    batch = []
+            if batch:
+                created_ids += self.import_batch(batch, failed)
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+        return {"created": len(created_ids), "failed": failed}
+
+    def import_batch(self, batch, failed):
+        """Validate, hash and insert one batch, returning the ids of the created users."""
+        valid = self.validate(batch, failed)
+        if not valid:
+            return []
+
+        passwords = self.hash_passwords([data.pop("password") for _, data in valid])
+        for (_, data), password in zip(valid, passwords):
+            data["password"] = password
+
+        self.allocate_usernames([data for _, data in valid])
+        try:
+            with transaction.atomic():
+                users = User.objects.bulk_create(
+                    [User(**data) for _, data in valid], batch_size=self.batch_size
+                )
+                created_ids = [user.pk for user in users]
+                self.publish_emails(created_ids)
+                bump_model_version_on_commit(User)
+            return created_ids
+        except IntegrityError:
+            # a concurrent request took a username or an email, insert one by one
+            with transaction.atomic():
+                created_ids = self.create_one_by_one(valid, failed)
+                self.publish_emails(created_ids)
+            return created_ids
+
+    def publish_emails(self, user_ids):
+        """Queue the welcome emails of a batch in the outbox, in its transaction."""
+        if self.send_emails and user_ids:
+            publish("email.registration", {"user_ids": user_ids})
+
+    def validate(self, batch, failed):
+        """
+        Validate the rows of a batch.
+
+        Field validation and the password rules run per row, then emails and phone
+        numbers are checked for duplicates within the batch and against the
+        database with one query.
+
+        Returns:
+            list: (row number, validated data) of the valid rows.
+        """
+        valid = []
+        for number, row in batch:
+            serializer = ImportUserSerializer(data=row)
+            if not serializer.is_valid():
+                failed.append({"row": number, "errors": serializer.errors})
+                continue
+            data = dict(serializer.validated_data)
+            _, errors = check_password(data["password"])
+            if errors:
+                failed.append({"row": number, "errors": {"password": errors}})
+                continue
+            valid.append((number, data))
+        if not valid:
+            return valid
+
+        emails = {data["email"] for _, data in valid}
+        phone_numbers = {data["phone_number"] for _, data in valid}
+        taken = set()
+        for email, phone_number in User.objects.filter(
+            Q(email__in=emails) | Q(phone_number__in=phone_numbers)
+        ).values_list("email", "phone_number"):
+            taken.update((("email", email), ("phone_number", phone_number)))
+
+        unique = []
+        for number, data in valid:
+            duplicates = [
+                field
+                for field in ("email", "phone_number")
+                if (field, data[field]) in taken
+            ]
+            if duplicates:
+                failed.append(
+                    {
+                        "row": number,
+                        "errors": {
+                            field: ["A user with this value already exists."]
+                            for field in duplicates
+                        },
+                    }
+                )
+                continue
+            taken.update(
+                (("email", data["email"]), ("phone_number", data["phone_number"]))
+            )
+            unique.append((number, data))
+        return unique
+
+    def hash_passwords(self, passwords):
+        if self.executor is None:
+            return [hashers.make_password(password) for password in passwords]
+        chunksize = max(len(passwords) // (self.hash_processes * 4), 1)
+        return list(
+            self.executor.map(hashers.make_password, passwords, chunksize=chunksize)
+        )
+
+    def allocate_usernames(self, rows):
+        """Give each row the next free username of its name, one query per name."""
+        rows_by_base = defaultdict(list)
+        for data in rows:
+            base = UserBusinessLayer.base_username(
+                data["first_name"], data["last_name"]
+            )
+            rows_by_base[base].append(data)
+        for base, base_rows in rows_by_base.items():
+            usernames = next_unique_values(
+                User.objects.all(), "username", base, len(base_rows), bare=True
+            )
+            for data, username in zip(base_rows, usernames):
+                data["username"] = username
+
+    def create_one_by_one(self, valid, failed):
+        created_ids = []
+        for number, data in valid:
+            base = UserBusinessLayer.base_username(
+                data["first_name"], data["last_name"]
+            )
+            try:
+                user = create_with_unique_value(
+                    User.objects.all(),
+                    "username",
+                    base,
+                    lambda username: User.objects.create(
+                        **{**data, "username": username}
+                    ),
+                    bare=True,
+                )
+            except IntegrityError as e:
+                failed.append({"row": number, "errors": str(e)})
+                continue
+            created_ids.append(user.pk)
+        return created_ids
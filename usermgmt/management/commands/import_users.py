@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from usermgmt.business_layer.user_import import (
+    USER_IMPORT_BATCH_SIZE,
+    USER_IMPORT_FORMATS,
+    USER_IMPORT_HASH_PROCESSES,
+    UserImporter,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Creates users in bulk from a CSV or NDJSON file (one user per row/line)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import")
+        parser.add_argument(
+            "--format",
+            choices=USER_IMPORT_FORMATS,
+            default=None,
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=USER_IMPORT_BATCH_SIZE,
+            help=f"Rows inserted per batch (default: {USER_IMPORT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=USER_IMPORT_HASH_PROCESSES,
+            help=f"Password hashing processes (default: {USER_IMPORT_HASH_PROCESSES})",
+        )
+        parser.add_argument(
+            "--no-email",
+            action="store_true",
+            help="Do not send the welcome emails",
+        )
+
+    def handle(self, *args, **options):
+        import_format = options["format"] or (
+            "csv" if options["path"].lower().endswith(".csv") else "ndjson"
+        )
+        importer = UserImporter(
+            batch_size=options["batch_size"],
+            hash_processes=options["processes"],
+            send_emails=not options["no_email"],
+        )
+        try:
+            with open(options["path"], "rb") as file:
+                result = importer.run(read_rows(file, import_format))
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for failure in result["failed"]:
+            self.stderr.write(f"Row {failure['row']}: {failure['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result['created']} users, {len(result['failed'])} rows rejected."
+            )
+        )
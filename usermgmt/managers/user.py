@@ -5,6 +5,7 @@ from django.db.models import Q
 from base.repository import Repository
 from account.models import User
 from usermgmt.business_layer.user import UserBusinessLayer
+from usermgmt.business_layer.user_import import UserImporter, read_rows
 
 
 class UserManager(object):
@@ -28,6 +29,11 @@ class UserManager(object):
         instances, error, status_code = UserBusinessLayer.list(kwargs)
         return instances, error, status_code
 
+    @classmethod
+    def export(cls, *args, **kwargs):
+        # the same rows as the list endpoint for the same query
+        return cls.get(*args, **kwargs)
+
     @classmethod
     def put(cls, *args, **kwargs):
         data = kwargs.get("data")
@@ -66,3 +72,21 @@ class UserManager(object):
             return None, str(error), status.HTTP_400_BAD_REQUEST
         data = {"message": "User deleted successfully"}
         return data, None, status.HTTP_200_OK
+
+
+class UserImportManager(object):
+    repository = Repository(User)
+
+    @classmethod
+    def post(cls, *args, **kwargs):
+        data = kwargs.get("data")
+        upload = data["file"]
+        import_format = data.get("import_format") or (
+            "csv" if upload.name.lower().endswith(".csv") else "ndjson"
+        )
+        try:
+            # hashed in the request's process, spawning a pool per request costs more
+            result = UserImporter().run(read_rows(upload, import_format))
+        except Exception as error:
+            return None, str(error), status.HTTP_400_BAD_REQUEST
+        return result, None, status.HTTP_200_OK
@@ -13,6 +13,28 @@ class AddUserSerializer(serializers.ModelSerializer):
         exclude = ["username", "created", "updated", "is_mfa_enabled"]
 
 
+class ImportUserSerializer(AddUserSerializer):
+    """Rows of a bulk import, emails and phone numbers are checked once per batch."""
+
+    class Meta(AddUserSerializer.Meta):
+        extra_kwargs = {
+            "email": {"validators": []},
+            "phone_number": {"validators": []},
+        }
+
+
+class ImportUsersSerializer(serializers.Serializer):
+    file = serializers.FileField(required=True)
+    import_format = serializers.ChoiceField(
+        required=False, choices=("csv", "ndjson"), default=None
+    )
+
+
+class ImportUsersResponseSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    failed = serializers.ListField(child=serializers.DictField())
+
+
 class UserListSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
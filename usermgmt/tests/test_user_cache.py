@@ -0,0 +1,56 @@
+import pytest
+from django.core.cache import caches
+
+from base.tests.utils.utils import make_user
+
+USERS_URL = "/api/v1/users/"
+
+
+@pytest.fixture
+def rebuild_locked(monkeypatch):
+    """Make every rebuild lock look held by another worker."""
+    cache = caches["default"]
+    add = cache.add
+
+    def locked_add(key, *args, **kwargs):
+        if key.startswith("lock:"):
+            return False
+        return add(key, *args, **kwargs)
+
+    monkeypatch.setattr(cache, "add", locked_add)
+    yield
+    monkeypatch.setattr(cache, "add", add)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUserListValidators:
+    def test_not_modified(self, admin_client):
+        response = admin_client.get(USERS_URL)
+        assert response.status_code == 200
+
+        response = admin_client.get(
+            USERS_URL, HTTP_IF_NONE_MATCH=response.headers["ETag"]
+        )
+        assert response.status_code == 304
+
+    def test_stale_response_has_no_validators(self, admin_client, request):
+        first = admin_client.get(USERS_URL)
+        make_user(1)
+
+        request.getfixturevalue("rebuild_locked")
+        stale = admin_client.get(USERS_URL)
+        assert stale.json()["pagination"]["total_items"] == 1
+        assert "ETag" not in stale.headers
+        assert "Last-Modified" not in stale.headers
+        # the stale body does not match the client's old copy either
+        response = admin_client.get(USERS_URL, HTTP_IF_NONE_MATCH=first.headers["ETag"])
+        assert response.status_code == 200
+
+    def test_rebuilt_response_is_validated(self, admin_client):
+        admin_client.get(USERS_URL)
+        make_user(1)
+
+        fresh = admin_client.get(USERS_URL)
+        assert fresh.json()["pagination"]["total_items"] == 2
+        response = admin_client.get(USERS_URL, HTTP_IF_NONE_MATCH=fresh.headers["ETag"])
+        assert response.status_code == 304
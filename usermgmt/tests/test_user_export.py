@@ -0,0 +1,51 @@
+import csv
+import io
+import orjson
+import pytest
+
+from base.tests.utils.utils import make_user
+
+EXPORT_URL = "/api/v1/users/export"
+
+
+@pytest.fixture
+def users(db):
+    return [make_user(index) for index in range(1, 4)]
+
+
+def content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestUserExport:
+    def test_ndjson(self, admin_client, users):
+        response = admin_client.get(EXPORT_URL)
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert 'filename="users-export.ndjson"' in response["Content-Disposition"]
+        rows = [orjson.loads(line) for line in content(response).splitlines()]
+        assert sorted(row["username"] for row in rows) == [
+            "user0",
+            "user1",
+            "user2",
+            "user3",
+        ]
+        assert "password" not in rows[0]
+
+    def test_csv_with_sparse_fields(self, admin_client, users):
+        response = admin_client.get(
+            EXPORT_URL, {"export_format": "csv", "fields": "id,email"}
+        )
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/csv"
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert len(rows) == 4
+        assert set(rows[0]) == {"id", "email"}
+
+    def test_unsupported_format(self, admin_client, users):
+        response = admin_client.get(EXPORT_URL, {"export_format": "xml"})
+
+        assert response.status_code == 400
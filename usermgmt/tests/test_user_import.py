@@ -0,0 +1,48 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from usermgmt.business_layer import user_import
+
+USERS_URL = "/api/v1/users/"
+IMPORT_URL = "/api/v1/users/import"
+HEADER = (
+    "first_name,last_name,email,phone_number,role,password,"
+    "emergency_first_name,emergency_last_name,emergency_phone_number\n"
+)
+
+
+def csv_rows(*indexes):
+    return HEADER + "".join(
+        f"Jane,Doe,jane{i}@example.com,0700000{i:04d},PATIENT,Kx9#mQv2!zRt{i},"
+        "Next,Kin,08099999999\n"
+        for i in indexes
+    )
+
+
+def import_csv(client, content):
+    upload = SimpleUploadedFile("users.csv", content.encode(), "text/csv")
+    return client.post(IMPORT_URL, {"file": upload}, format="multipart")
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUserImportAPIView:
+    def test_imports_in_process(self, admin_client, monkeypatch):
+        def no_pool(*args, **kwargs):
+            raise AssertionError("the endpoint must not start a process pool")
+
+        monkeypatch.setattr(user_import, "ProcessPoolExecutor", no_pool)
+
+        response = import_csv(admin_client, csv_rows(1, 2, 3))
+
+        assert response.status_code == 200
+        assert response.json()["created"] == 3
+
+    def test_invalidates_cached_user_list(self, admin_client):
+        first = admin_client.get(USERS_URL)
+        assert first.json()["pagination"]["total_items"] == 1
+
+        import_csv(admin_client, csv_rows(1, 2, 3))
+
+        response = admin_client.get(USERS_URL, HTTP_IF_NONE_MATCH=first.headers["ETag"])
+        assert response.status_code == 200
+        assert response.json()["pagination"]["total_items"] == 4
@@ -5,4 +5,6 @@ from usermgmt.views import user
 urlpatterns = [
     path("", user.UserAPIView.as_view(), name="users"),
     path("<int:id>", user.UserAPIView.as_view(), name="user"),
+    path("export", user.UserExportAPIView.as_view(), name="users-export"),
+    path("import", user.UserImportAPIView.as_view(), name="users-import"),
 ]
@@ -5,13 +5,19 @@ from usermgmt.serializers.user import (
     UserDetailSerializer,
     DeleteUserSerializer,
     AddUserSerializer,
+    ImportUsersSerializer,
+    ImportUsersResponseSerializer,
 )
 from account.serializers.auth import RegistrationResponseSerializer
-from base.service import ServiceFactory
-from usermgmt.managers.user import UserManager
+from base.decorators.cache import cache_response
+from base.decorators.conditional import conditional_response
+from usermgmt.managers.user import UserImportManager, UserManager
 
 
 class BaseUserAPIView(BaseAPIView):
+    manager = UserManager
+    detail_serializer_class = UserDetailSerializer
+
     serializer_classes = {
         "get": None,
         "post": AddUserSerializer,
@@ -26,42 +32,10 @@ class BaseUserAPIView(BaseAPIView):
         "delete": DeleteUserSerializer,
     }
 
-    def get_service(self, *args, **kwargs):
-        return ServiceFactory(
-            UserManager, self.get_serializer_class(request=kwargs.get("request"))
-        )
-
-    def get_serializer_class(self, *args, **kwargs):
-        method_to_action = {
-            "GET": "get",
-            "POST": "post",
-            "PUT": "put",
-            "PATCH": "patch",
-            "DELETE": "delete",
-        }
-        request = kwargs.get("request")
-        action = method_to_action.get(request.method, "get")
-        return self.serializer_classes.get(action, None)
-
-    def get_response_serializer_class(self, *args, **kwargs):
-        id = kwargs.get("id")
-        request = kwargs.get("request")
-        if request.method == "GET" and id:
-            return UserDetailSerializer
-
-        method_to_action = {
-            "GET": "get",
-            "POST": "post",
-            "PUT": "put",
-            "PATCH": "patch",
-            "DELETE": "delete",
-        }
-
-        action = method_to_action.get(request.method)
-        return self.serializer_response_classes.get(action, None)
-
 
 class UserAPIView(BaseUserAPIView):
+    @conditional_response()
+    @cache_response()
     def get(self, request, id=None):
         action = "List Users" if id is None else "Get User"
         return self.handle_request(
@@ -92,3 +66,26 @@ class UserAPIView(BaseUserAPIView):
     def delete(self, request, id):
         action = "Delete User"
         return self.handle_request(request, "delete", action, id=id)
+
+
+class UserExportAPIView(BaseUserAPIView):
+    def get(self, request):
+        action = "Export Users"
+        return self.handle_export(request, action, query_params=request.query_params)
+
+
+class UserImportAPIView(BaseAPIView):
+    manager = UserImportManager
+
+    serializer_classes = {"post": ImportUsersSerializer}
+    serializer_response_classes = {"post": ImportUsersResponseSerializer}
+
+    def post(self, request):
+        action = "Import Users"
+        return self.handle_request(
+            request,
+            "post",
+            action,
+            data=request.data,
+            query_params=request.query_params,
+        )